@@ -1,1322 +1,6062 @@
-"""
-File Router - Professional File Management Application
-
-A desktop GUI tool to route files and folders into predefined destinations
-using configurable tabs with multiple operation modes.
-"""
-
-import sys
-import os
-import json
-import uuid
-import shutil
-import platform
-from datetime import datetime
-from pathlib import Path
-from typing import Dict, List, Optional, Any
-
-from PySide6.QtCore import Qt, QSize
-from PySide6.QtWidgets import (
-    QApplication,
-    QMainWindow,
-    QTabWidget,
-    QWidget,
-    QVBoxLayout,
-    QHBoxLayout,
-    QLabel,
-    QPushButton,
-    QFileDialog,
-    QStatusBar,
-    QMessageBox,
-    QMenuBar,
-    QMenu,
-    QInputDialog,
-    QRadioButton,
-    QButtonGroup,
-    QToolBar,
-    QFrame,
-    QDialog,
-    QTextEdit,
-)
-from PySide6.QtGui import QAction
-
-# Operation mode constants
-OP_COPY_REPLACE = "copy_replace"
-OP_COPY_NEW = "copy_new"
-OP_MOVE_REPLACE = "move_replace"
-OP_MOVE_NEW = "move_new"
-
-
-def get_config_path() -> str:
-    """
-    Return OS-appropriate path for config.json.
-    
-    Returns:
-        str: Full path to the configuration file
-    """
-    system = platform.system()
-    
-    if system == "Windows":
-        base = os.getenv("APPDATA") or str(Path.home() / "AppData" / "Roaming")
-        base_dir = Path(base) / "FileRouter"
-    elif system == "Darwin":  # macOS
-        base_dir = Path.home() / "Library" / "Application Support" / "FileRouter"
-    else:  # Linux and others
-        base_dir = Path.home() / ".config" / "file_router"
-    
-    base_dir.mkdir(parents=True, exist_ok=True)
-    return str(base_dir / "config.json")
-
-
-CONFIG_FILENAME = get_config_path()
-
-
-def generate_default_config() -> Dict[str, Any]:
-    """Generate default configuration with L1–L5 tabs and no paths."""
-    return {
-        "tabs": [
-            {
-                "id": str(uuid.uuid4()),
-                "name": f"L{i}",
-                "path": "",
-                "operation": OP_COPY_REPLACE,
-                "history": [],
-            }
-            for i in range(1, 6)
-        ]
-    }
-
-
-class ConfigManager:
-    """Manages loading and saving of application configuration."""
-    
-    def __init__(self, config_path: str):
-        self.config_path = config_path
-
-    def load(self) -> Dict[str, Any]:
-        """Load configuration from file or return default config."""
-        if not os.path.exists(self.config_path):
-            return generate_default_config()
-
-        try:
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            if "tabs" not in data or not isinstance(data["tabs"], list):
-                return generate_default_config()
-
-            for t in data["tabs"]:
-                t.setdefault("id", str(uuid.uuid4()))
-                t.setdefault("name", "Unnamed")
-                t.setdefault("path", "")
-
-                # Map old operation values to new ones
-                op = t.get("operation", OP_COPY_REPLACE)
-                if op == "copy":
-                    op = OP_COPY_REPLACE
-                elif op == "move":
-                    op = OP_MOVE_REPLACE
-                elif op not in {
-                    OP_COPY_REPLACE,
-                    OP_COPY_NEW,
-                    OP_MOVE_REPLACE,
-                    OP_MOVE_NEW,
-                }:
-                    op = OP_COPY_REPLACE
-                t["operation"] = op
-
-                # Ensure history list exists
-                t.setdefault("history", [])
-
-            return data
-        except Exception as e:
-            print(f"Error loading config: {e}")
-            return generate_default_config()
-
-    def save(self, data: Dict[str, Any]) -> None:
-        """Save configuration to file."""
-        try:
-            with open(self.config_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            print(f"Error saving config: {e}")
-
-
-class HistoryDialog(QDialog):
-    """Custom resizable dialog for displaying history with proper visibility."""
-
-    def __init__(self, tab_name: str, history_entries: List[Dict], parent=None):
-        super().__init__(parent)
-        self.setWindowTitle(f"History - {tab_name}")
-        self.resize(800, 600)
-        self.setMinimumSize(600, 400)
-
-        layout = QVBoxLayout(self)
-        layout.setSpacing(10)
-        layout.setContentsMargins(15, 15, 15, 15)
-
-        # Title
-        title = QLabel(f"📜 History for Tab: {tab_name}")
-        title.setStyleSheet(
-            "font-size: 16px; font-weight: bold; color: #212529; padding: 5px;"
-        )
-        layout.addWidget(title)
-
-        # Text area with scrolling
-        text_edit = QTextEdit()
-        text_edit.setReadOnly(True)
-        text_edit.setStyleSheet(
-            """
-            QTextEdit {
-                background-color: #FFFFFF;
-                color: #212529;
-                border: 2px solid #DEE2E6;
-                border-radius: 6px;
-                padding: 10px;
-                font-family: 'Consolas', 'Monaco', monospace;
-                font-size: 12px;
-                line-height: 1.5;
-            }
-        """
-        )
-
-        if not history_entries:
-            text_edit.setPlainText("No history entries yet for this tab.")
-        else:
-            lines = []
-            for idx, h in enumerate(history_entries, 1):
-                timestamp = h.get("timestamp", "N/A")
-                operation = h.get("operation", "N/A")
-                source = h.get("source", "N/A")
-                destination = h.get("destination", "N/A")
-                result = h.get("result", "N/A")
-
-                lines.append(f"{'=' * 80}")
-                lines.append(f"Entry #{idx}")
-                lines.append(f"{'=' * 80}")
-                lines.append(f"⏰ Time:      {timestamp}")
-                lines.append(f"⚙️  Operation: {operation}")
-                lines.append(f"📂 Source:    {source}")
-                lines.append(f"📁 Dest:      {destination}")
-                lines.append(f"✅ Result:    {result}")
-                lines.append("")
-
-            text_edit.setPlainText("\n".join(lines))
-
-        layout.addWidget(text_edit)
-
-        # Close button
-        close_btn = QPushButton("Close")
-        close_btn.setStyleSheet(
-            """
-            QPushButton {
-                background-color: #0078D7;
-                color: #FFFFFF;
-                border: none;
-                border-radius: 5px;
-                padding: 10px 20px;
-                font-weight: 600;
-                font-size: 13px;
-            }
-            QPushButton:hover {
-                background-color: #005A9E;
-            }
-        """
-        )
-        close_btn.clicked.connect(self.accept)
-        layout.addWidget(close_btn, alignment=Qt.AlignRight)
-
-
-class DropArea(QLabel):
-    """Central drop zone, tied to a specific tab (via tab_id)."""
-
-    def __init__(self, main_window: 'MainWindow', tab_id: str, parent=None):
-        super().__init__(parent)
-        self.main_window = main_window
-        self.tab_id = tab_id
-        self.dest_path = ""
-        self.setAcceptDrops(True)
-        self.setAlignment(Qt.AlignCenter)
-        self.setMinimumHeight(180)
-        self.setWordWrap(True)
-        self.setText("📁 Drag files or folders here")
-
-        self.base_style = (
-            "QLabel {"
-            "  border: 3px dashed #0078d7;"
-            "  border-radius: 8px;"
-            "  background-color: #f8f9fa;"
-            "  color: #212529;"
-            "  font-size: 15px;"
-            "  font-weight: 500;"
-            "  padding: 20px;"
-            "}"
-        )
-        self.highlight_style = (
-            "QLabel {"
-            "  border: 3px solid #0078d7;"
-            "  border-radius: 8px;"
-            "  background-color: #cfe2ff;"
-            "  color: #084298;"
-            "  font-size: 15px;"
-            "  font-weight: 600;"
-            "  padding: 20px;"
-            "}"
-        )
-        self.disabled_style = (
-            "QLabel {"
-            "  border: 3px dashed #dee2e6;"
-            "  border-radius: 8px;"
-            "  background-color: #f8f9fa;"
-            "  color: #6c757d;"
-            "  font-size: 14px;"
-            "  padding: 20px;"
-            "}"
-        )
-        self.update_style()
-
-    def set_destination(self, path: str) -> None:
-        """Set the destination path for this drop area."""
-        self.dest_path = path or ""
-        self.update_style()
-
-    def has_valid_destination(self) -> bool:
-        """Check if the destination path is valid."""
-        return bool(self.dest_path) and os.path.isdir(self.dest_path)
-
-    def update_style(self, highlight: bool = False) -> None:
-        """Update the visual style of the drop area."""
-        if not self.has_valid_destination():
-            self.setStyleSheet(self.disabled_style)
-            if not self.dest_path:
-                self.setText(
-                    "⚠️ No folder assigned\n\nClick 'Set Destination Folder' above to get started"
-                )
-            else:
-                self.setText(
-                    "❌ Destination folder is invalid or missing\n\n"
-                    "Please reassign a valid folder"
-                )
-        else:
-            self.setStyleSheet(self.highlight_style if highlight else self.base_style)
-            self.setText(
-                "✅ Drop files here!"
-                if highlight
-                else "📁 Drag files or folders here"
-            )
-
-    def dragEnterEvent(self, event):
-        """Handle drag enter events."""
-        if event.mimeData().hasUrls() and self.has_valid_destination():
-            event.acceptProposedAction()
-            self.update_style(highlight=True)
-        else:
-            event.ignore()
-
-    def dragLeaveEvent(self, event):
-        """Handle drag leave events."""
-        self.update_style(highlight=False)
-        event.accept()
-
-    def dropEvent(self, event):
-        """Handle drop events."""
-        self.update_style(highlight=False)
-        if not self.has_valid_destination():
-            event.ignore()
-            self.main_window.show_status(
-                "Cannot drop: no valid destination folder for this tab.", error=True
-            )
-            return
-
-        urls = event.mimeData().urls()
-        if not urls:
-            event.ignore()
-            return
-
-        paths = [url.toLocalFile() for url in urls if url.isLocalFile()]
-        if not paths:
-            event.ignore()
-            return
-
-        event.acceptProposedAction()
-        self.main_window.handle_drop(self.tab_id, paths)
-
-
-class MainWindow(QMainWindow):
-    """Main application window for File Router."""
-    
-    def __init__(self):
-        super().__init__()
-        self.setWindowTitle("File Router - Professional File Management")
-
-        # Free manual resize: just give a reasonable starting size and minimum
-        self.resize(1000, 600)
-        self.setMinimumSize(800, 500)
-
-        self.config_manager = ConfigManager(CONFIG_FILENAME)
-        self.config = self.config_manager.load()
-
-        self.tab_widget = QTabWidget()
-        self.tab_widget.setTabsClosable(False)
-        self.tab_widget.setMovable(True)
-        self.setCentralWidget(self.tab_widget)
-
-        self.status_bar = QStatusBar()
-        self.setStatusBar(self.status_bar)
-
-        self.tab_ui: Dict[str, Dict] = {}
-
-        self._apply_platform_styles()
-        self._build_menu()
-        self._build_toolbar()
-        self._rebuild_tabs()
-
-        self.show_status("✔ Application ready. Configure your routing tabs to get started.")
-
-    # ---------- Styling ----------
-
-    def _apply_platform_styles(self) -> None:
-        """Apply platform-specific styling for Windows, macOS, and Linux."""
-        system = platform.system()
-
-        if system == "Windows":
-            self.setStyleSheet(
-                """
-                QMainWindow {
-                    background-color: #FFFFFF;
-                }
-                QMenuBar {
-                    background-color: #F3F3F3;
-                    color: #212529;
-                    border-bottom: 1px solid #E0E0E0;
-                    padding: 4px;
-                    font-size: 13px;
-                }
-                QMenuBar::item {
-                    padding: 6px 12px;
-                    background-color: transparent;
-                }
-                QMenuBar::item:selected {
-                    background-color: #E5E5E5;
-                    border-radius: 4px;
-                }
-                QToolBar {
-                    background-color: #F8F9FA;
-                    border-bottom: 2px solid #DEE2E6;
-                    spacing: 8px;
-                    padding: 8px;
-                }
-                QToolButton {
-                    background-color: #FFFFFF;
-                    border: 2px solid #0078D7;
-                    border-radius: 6px;
-                    padding: 8px 16px;
-                    color: #0078D7;
-                    font-weight: 600;
-                    font-size: 13px;
-                    min-width: 90px;
-                }
-                QToolButton:hover {
-                    background-color: #0078D7;
-                    color: #FFFFFF;
-                }
-                QToolButton:pressed {
-                    background-color: #005A9E;
-                }
-                QTabWidget::pane {
-                    border: 2px solid #DEE2E6;
-                    border-radius: 6px;
-                    background-color: #FFFFFF;
-                    top: -1px;
-                }
-                QTabBar::tab {
-                    background-color: #E9ECEF;
-                    color: #495057;
-                    border: 2px solid #DEE2E6;
-                    border-bottom: none;
-                    padding: 10px 20px;
-                    margin-right: 2px;
-                    border-top-left-radius: 6px;
-                    border-top-right-radius: 6px;
-                    font-weight: 600;
-                    font-size: 13px;
-                }
-                QTabBar::tab:selected {
-                    background-color: #FFFFFF;
-                    color: #0078D7;
-                    border-bottom: 3px solid #0078D7;
-                }
-                QTabBar::tab:hover {
-                    background-color: #F8F9FA;
-                }
-                QPushButton {
-                    background-color: #0078D7;
-                    color: #FFFFFF;
-                    border: none;
-                    border-radius: 5px;
-                    padding: 8px 16px;
-                    font-weight: 600;
-                    font-size: 13px;
-                }
-                QPushButton:hover {
-                    background-color: #005A9E;
-                }
-                QPushButton:pressed {
-                    background-color: #004578;
-                }
-                QPushButton#secondaryButton {
-                    background-color: #FFFFFF;
-                    color: #495057;
-                    border: 2px solid #ADB5BD;
-                }
-                QPushButton#secondaryButton:hover {
-                    background-color: #F8F9FA;
-                    border-color: #6C757D;
-                }
-                QRadioButton {
-                    color: #212529;
-                    font-size: 13px;
-                    font-weight: 500;
-                    spacing: 8px;
-                }
-                QRadioButton::indicator {
-                    width: 18px;
-                    height: 18px;
-                }
-                QLabel {
-                    color: #212529;
-                    font-size: 13px;
-                }
-                QStatusBar {
-                    background-color: #F8F9FA;
-                    color: #495057;
-                    border-top: 2px solid #DEE2E6;
-                    font-size: 12px;
-                }
-            """
-            )
-
-        elif system == "Darwin":  # macOS
-            self.setStyleSheet(
-                """
-                QMainWindow {
-                    background-color: #FFFFFF;
-                }
-                QMenuBar {
-                    background-color: transparent;
-                    color: #1D1D1F;
-                }
-                QToolBar {
-                    background-color: #F5F5F7;
-                    border-bottom: 1px solid #D2D2D7;
-                    spacing: 10px;
-                    padding: 10px;
-                }
-                QToolButton {
-                    background-color: #007AFF;
-                    border: none;
-                    border-radius: 8px;
-                    padding: 8px 18px;
-                    color: #FFFFFF;
-                    font-weight: 600;
-                    font-size: 13px;
-                    min-width: 90px;
-                }
-                QToolButton:hover {
-                    background-color: #0051D5;
-                }
-                QTabWidget::pane {
-                    border: 1px solid #D2D2D7;
-                    border-radius: 8px;
-                    background-color: #FFFFFF;
-                }
-                QTabBar::tab {
-                    background-color: #F5F5F7;
-                    color: #1D1D1F;
-                    border: 1px solid #D2D2D7;
-                    padding: 10px 22px;
-                    margin-right: 4px;
-                    border-top-left-radius: 8px;
-                    border-top-right-radius: 8px;
-                    font-size: 13px;
-                }
-                QTabBar::tab:selected {
-                    background-color: #FFFFFF;
-                    color: #007AFF;
-                    font-weight: 600;
-                }
-                QPushButton {
-                    background-color: #007AFF;
-                    color: #FFFFFF;
-                    border: none;
-                    border-radius: 6px;
-                    padding: 8px 16px;
-                    font-weight: 500;
-                    font-size: 13px;
-                }
-                QPushButton:hover {
-                    background-color: #0051D5;
-                }
-                QPushButton#secondaryButton {
-                    background-color: #F5F5F7;
-                    color: #1D1D1F;
-                    border: 1px solid #D2D2D7;
-                }
-                QRadioButton {
-                    color: #1D1D1F;
-                    font-size: 13px;
-                    spacing: 8px;
-                }
-                QLabel {
-                    color: #1D1D1F;
-                    font-size: 13px;
-                }
-                QStatusBar {
-                    background-color: #F5F5F7;
-                    color: #86868B;
-                    border-top: 1px solid #D2D2D7;
-                }
-            """
-            )
-
-        else:  # Linux
-            self.setStyleSheet(
-                """
-                QMainWindow {
-                    background-color: #FFFFFF;
-                }
-                QMenuBar {
-                    background-color: #F6F6F6;
-                    color: #2C2C2C;
-                    border-bottom: 1px solid #DADADA;
-                    padding: 4px;
-                }
-                QToolBar {
-                    background-color: #FAFAFA;
-                    border-bottom: 2px solid #E0E0E0;
-                    spacing: 8px;
-                    padding: 8px;
-                }
-                QToolButton {
-                    background-color: #FFFFFF;
-                    border: 2px solid #1976D2;
-                    border-radius: 4px;
-                    padding: 8px 16px;
-                    color: #1976D2;
-                    font-weight: 600;
-                    font-size: 13px;
-                    min-width: 90px;
-                }
-                QToolButton:hover {
-                    background-color: #1976D2;
-                    color: #FFFFFF;
-                }
-                QTabWidget::pane {
-                    border: 2px solid #E0E0E0;
-                    border-radius: 4px;
-                    background-color: #FFFFFF;
-                }
-                QTabBar::tab {
-                    background-color: #F0F0F0;
-                    color: #424242;
-                    border: 2px solid #E0E0E0;
-                    padding: 10px 20px;
-                    margin-right: 2px;
-                    border-top-left-radius: 4px;
-                    border-top-right-radius: 4px;
-                    font-weight: 600;
-                    font-size: 13px;
-                }
-                QTabBar::tab:selected {
-                    background-color: #FFFFFF;
-                    color: #1976D2;
-                    border-bottom: 3px solid #1976D2;
-                }
-                QPushButton {
-                    background-color: #1976D2;
-                    color: #FFFFFF;
-                    border: none;
-                    border-radius: 4px;
-                    padding: 8px 16px;
-                    font-weight: 600;
-                    font-size: 13px;
-                }
-                QPushButton:hover {
-                    background-color: #1565C0;
-                }
-                QPushButton#secondaryButton {
-                    background-color: #FFFFFF;
-                    color: #424242;
-                    border: 2px solid #BDBDBD;
-                }
-                QRadioButton {
-                    color: #2C2C2C;
-                    font-size: 13px;
-                    font-weight: 500;
-                    spacing: 8px;
-                }
-                QLabel {
-                    color: #2C2C2C;
-                    font-size: 13px;
-                }
-                QStatusBar {
-                    background-color: #FAFAFA;
-                    color: #616161;
-                    border-top: 2px solid #E0E0E0;
-                }
-            """
-            )
-
-    # ---------- Menu & Toolbar ----------
-
-    def _build_menu(self) -> None:
-        """Build the application menu bar."""
-        menu_bar = QMenuBar(self)
-        self.setMenuBar(menu_bar)
-
-        # File menu
-        file_menu = QMenu("📄 File", self)
-        menu_bar.addMenu(file_menu)
-
-        import_action = file_menu.addAction("📥 Import Configuration…")
-        import_action.triggered.connect(self.import_config)
-
-        export_action = file_menu.addAction("📤 Export Configuration…")
-        export_action.triggered.connect(self.export_config)
-
-        file_menu.addSeparator()
-        exit_action = file_menu.addAction("🚪 Exit")
-        exit_action.triggered.connect(self.close)
-
-        # Tabs menu
-        tabs_menu = QMenu("📑 Tabs", self)
-        menu_bar.addMenu(tabs_menu)
-
-        add_tab_action = tabs_menu.addAction("➕ Add Tab…")
-        add_tab_action.triggered.connect(self.add_tab)
-
-        rename_tab_action = tabs_menu.addAction("✏️ Rename Current Tab…")
-        rename_tab_action.triggered.connect(self.rename_current_tab)
-
-        delete_tab_action = tabs_menu.addAction("🗑️ Delete Current Tab…")
-        delete_tab_action.triggered.connect(self.delete_current_tab)
-
-        # Help menu
-        help_menu = QMenu("❓ Help", self)
-        menu_bar.addMenu(help_menu)
-
-        about_action = help_menu.addAction("ℹ️ About")
-        about_action.triggered.connect(self.show_about)
-
-    def _build_toolbar(self) -> None:
-        """Build the application toolbar."""
-        toolbar = QToolBar("Main Toolbar")
-        toolbar.setMovable(False)
-        toolbar.setIconSize(QSize(24, 24))
-        self.addToolBar(toolbar)
-
-        add_action = QAction("➕ Add Tab", self)
-        add_action.triggered.connect(self.add_tab)
-        toolbar.addAction(add_action)
-
-        toolbar.addSeparator()
-
-        rename_action = QAction("✏️ Rename", self)
-        rename_action.triggered.connect(self.rename_current_tab)
-        toolbar.addAction(rename_action)
-
-        delete_action = QAction("🗑️ Delete", self)
-        delete_action.triggered.connect(self.delete_current_tab)
-        toolbar.addAction(delete_action)
-
-        toolbar.addSeparator()
-
-        import_action = QAction("📥 Import", self)
-        import_action.triggered.connect(self.import_config)
-        toolbar.addAction(import_action)
-
-        export_action = QAction("📤 Export", self)
-        export_action.triggered.connect(self.export_config)
-        toolbar.addAction(export_action)
-
-    # ---------- Tab Management ----------
-
-    def _rebuild_tabs(self) -> None:
-        """Rebuild all tabs from configuration."""
-        self.tab_widget.clear()
-        self.tab_ui.clear()
-        for tab in self.config["tabs"]:
-            self._create_tab(tab)
-
-    def _create_tab(self, tab: Dict[str, Any]) -> int:
-        """Create a new tab widget from configuration."""
-        page = QWidget()
-        page.setProperty("tab_id", tab["id"])
-
-        vbox = QVBoxLayout(page)
-        vbox.setSpacing(15)
-        vbox.setContentsMargins(20, 20, 20, 20)
-
-        # Title
-        title_label = QLabel(f"📂 Destination for tab: {tab['name']}")
-        title_label.setStyleSheet(
-            "font-weight: bold; font-size: 15px; color: #212529;"
-        )
-        vbox.addWidget(title_label)
-
-        # Separator
-        line = QFrame()
-        line.setFrameShape(QFrame.HLine)
-        line.setFrameShadow(QFrame.Sunken)
-        vbox.addWidget(line)
-
-        # Path row
-        path_row = QHBoxLayout()
-        path_label_caption = QLabel("📁 Folder:")
-        path_label_caption.setMinimumWidth(70)
-        path_label_caption.setStyleSheet("font-weight: 600;")
-        path_row.addWidget(path_label_caption)
-
-        path_label = QLabel()
-        path_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
-        path_label.setStyleSheet(
-            "padding: 5px; background-color: #F8F9FA; border-radius: 4px;"
-        )
-        path_row.addWidget(path_label, stretch=1)
-
-        assign_btn = QPushButton("Set Destination Folder")
-        assign_btn.clicked.connect(lambda _, tid=tab["id"]: self.assign_folder(tid))
-        path_row.addWidget(assign_btn)
-
-        clear_btn = QPushButton("Clear")
-        clear_btn.setObjectName("secondaryButton")
-        clear_btn.clicked.connect(lambda _, tid=tab["id"]: self.clear_folder(tid))
-        path_row.addWidget(clear_btn)
-
-        history_btn = QPushButton("History")
-        history_btn.setObjectName("secondaryButton")
-        history_btn.clicked.connect(lambda _, tid=tab["id"]: self.show_history(tid))
-        path_row.addWidget(history_btn)
-
-        vbox.addLayout(path_row)
-
-        # Operation row: 4 modes
-        operation_row = QHBoxLayout()
-        operation_label = QLabel("⚙️ Operation:")
-        operation_label.setMinimumWidth(70)
-        operation_label.setStyleSheet("font-weight: 600;")
-        operation_row.addWidget(operation_label)
-
-        copy_replace_radio = QRadioButton("Copy (Replace existing)")
-        copy_new_radio = QRadioButton("Copy (New only)")
-        move_replace_radio = QRadioButton("Move (Replace existing)")
-        move_new_radio = QRadioButton("Move (New only)")
-
-        button_group = QButtonGroup(page)
-        button_group.addButton(copy_replace_radio)
-        button_group.addButton(copy_new_radio)
-        button_group.addButton(move_replace_radio)
-        button_group.addButton(move_new_radio)
-
-        op = tab.get("operation", OP_COPY_REPLACE)
-        if op == OP_COPY_REPLACE:
-            copy_replace_radio.setChecked(True)
-        elif op == OP_COPY_NEW:
-            copy_new_radio.setChecked(True)
-        elif op == OP_MOVE_REPLACE:
-            move_replace_radio.setChecked(True)
-        else:
-            move_new_radio.setChecked(True)
-
-        copy_replace_radio.toggled.connect(
-            lambda checked, tid=tab["id"]: self.set_operation(
-                tid, OP_COPY_REPLACE
-            )
-            if checked
-            else None
-        )
-        copy_new_radio.toggled.connect(
-            lambda checked, tid=tab["id"]: self.set_operation(
-                tid, OP_COPY_NEW
-            )
-            if checked
-            else None
-        )
-        move_replace_radio.toggled.connect(
-            lambda checked, tid=tab["id"]: self.set_operation(
-                tid, OP_MOVE_REPLACE
-            )
-            if checked
-            else None
-        )
-        move_new_radio.toggled.connect(
-            lambda checked, tid=tab["id"]: self.set_operation(
-                tid, OP_MOVE_NEW
-            )
-            if checked
-            else None
-        )
-
-        for rb in (
-            copy_replace_radio,
-            copy_new_radio,
-            move_replace_radio,
-            move_new_radio,
-        ):
-            operation_row.addWidget(rb)
-
-        operation_row.addStretch(1)
-        vbox.addLayout(operation_row)
-
-        vbox.addSpacing(10)
-
-        # Drop area
-        drop_area = DropArea(self, tab["id"])
-        vbox.addWidget(drop_area)
-
-        vbox.addStretch(1)
-
-        index = self.tab_widget.addTab(page, tab["name"])
-
-        self.tab_ui[tab["id"]] = {
-            "page": page,
-            "title_label": title_label,
-            "path_label": path_label,
-            "drop_area": drop_area,
-        }
-
-        self._update_tab_path_ui(tab["id"], tab.get("path", ""))
-
-        return index
-
-    def _get_tab_config_by_id(self, tab_id: str) -> Optional[Dict[str, Any]]:
-        """Get tab configuration by ID."""
-        for t in self.config["tabs"]:
-            if t["id"] == tab_id:
-                return t
-        return None
-
-    def _update_tab_path_ui(self, tab_id: str, path: str) -> None:
-        """Update the UI elements for a tab's path."""
-        ui = self.tab_ui.get(tab_id)
-        if not ui:
-            return
-
-        path_label = ui["path_label"]
-        drop_area = ui["drop_area"]
-
-        path = path or ""
-        if not path:
-            path_label.setText("⚠️ No folder assigned")
-            path_label.setStyleSheet(
-                "color: #6C757D; padding: 5px; background-color: #F8F9FA; border-radius: 4px;"
-            )
-        elif not os.path.isdir(path):
-            path_label.setText(f"❌ {path}  (invalid)")
-            path_label.setStyleSheet(
-                "color: #DC3545; padding: 5px; background-color: #F8D7DA; border-radius: 4px;"
-            )
-        else:
-            path_label.setText(f"✅ {path}")
-            path_label.setStyleSheet(
-                "color: #198754; padding: 5px; background-color: #D1E7DD; border-radius: 4px;"
-            )
-
-        drop_area.set_destination(path)
-
-    # ---------- History ----------
-
-    def _add_history_entry(
-        self, tab_id: str, operation: str, src: str, dest: str, result: str
-    ) -> None:
-        """Add a history entry to a tab (with timestamp)."""
-        tab = self._get_tab_config_by_id(tab_id)
-        if not tab:
-            return
-
-        history = tab.setdefault("history", [])
-        entry = {
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "operation": operation,
-            "source": src,
-            "destination": dest,
-            "result": result,
-        }
-        history.append(entry)
-
-        # Keep last 200 entries per tab
-        if len(history) > 200:
-            history[:] = history[-200:]
-
-        self.config_manager.save(self.config)
-
-    def show_history(self, tab_id: str) -> None:
-        """Show history for a tab using custom dialog."""
-        tab = self._get_tab_config_by_id(tab_id)
-        if not tab:
-            return
-
-        history = tab.get("history", [])
-        dialog = HistoryDialog(tab["name"], history, self)
-        dialog.exec()
-
-    # ---------- Folder & Operation Settings ----------
-
-    def assign_folder(self, tab_id: str) -> None:
-        """Assign a destination folder to a tab."""
-        folder = QFileDialog.getExistingDirectory(
-            self, "Select Destination Folder", os.path.expanduser("~")
-        )
-        if not folder:
-            return
-
-        tab = self._get_tab_config_by_id(tab_id)
-        if not tab:
-            return
-
-        tab["path"] = folder
-        self._update_tab_path_ui(tab_id, folder)
-        self.config_manager.save(self.config)
-        self.show_status(f"✔ Assigned folder for tab '{tab['name']}': {folder}")
-
-    def clear_folder(self, tab_id: str) -> None:
-        """Clear the destination folder for a tab."""
-        tab = self._get_tab_config_by_id(tab_id)
-        if not tab:
-            return
-        tab["path"] = ""
-        self._update_tab_path_ui(tab_id, "")
-        self.config_manager.save(self.config)
-        self.show_status(f"✔ Cleared folder for tab '{tab['name']}'")
-
-    def set_operation(self, tab_id: str, operation: str) -> None:
-        """Set the operation mode for a tab."""
-        tab = self._get_tab_config_by_id(tab_id)
-        if not tab:
-            return
-        tab["operation"] = operation
-        self.config_manager.save(self.config)
-        self.show_status(
-            f"✔ Set operation for tab '{tab['name']}' to '{operation.upper()}'"
-        )
-
-    # ---------- Tab Actions ----------
-
-    def add_tab(self) -> None:
-        """Add a new tab."""
-        default_name = f"L{len(self.config['tabs']) + 1}"
-        name, ok = QInputDialog.getText(
-            self, "Add Tab", "Enter tab name:", text=default_name
-        )
-        if not ok or not name.strip():
-            return
-
-        name = name.strip()
-        new_tab = {
-            "id": str(uuid.uuid4()),
-            "name": name,
-            "path": "",
-            "operation": OP_COPY_REPLACE,
-            "history": [],
-        }
-        self.config["tabs"].append(new_tab)
-        self._create_tab(new_tab)
-        self.config_manager.save(self.config)
-        self.show_status(f"✔ Added tab '{name}'")
-
-    def rename_current_tab(self) -> None:
-        """Rename the currently selected tab."""
-        index = self.tab_widget.currentIndex()
-        if index < 0:
-            return
-
-        page = self.tab_widget.widget(index)
-        tab_id = page.property("tab_id")
-        tab = self._get_tab_config_by_id(tab_id)
-        if not tab:
-            return
-
-        current_name = tab["name"]
-        new_name, ok = QInputDialog.getText(
-            self, "Rename Tab", "Enter new tab name:", text=current_name
-        )
-        if not ok or not new_name.strip():
-            return
-
-        new_name = new_name.strip()
-        tab["name"] = new_name
-
-        self.tab_widget.setTabText(index, new_name)
-        ui = self.tab_ui.get(tab_id)
-        if ui:
-            ui["title_label"].setText(f"📂 Destination for tab: {new_name}")
-
-        self.config_manager.save(self.config)
-        self.show_status(f"✔ Renamed tab to '{new_name}'")
-
-    def delete_current_tab(self) -> None:
-        """Delete the currently selected tab."""
-        index = self.tab_widget.currentIndex()
-        if index < 0:
-            return
-
-        page = self.tab_widget.widget(index)
-        tab_id = page.property("tab_id")
-        tab = self._get_tab_config_by_id(tab_id)
-        if not tab:
-            return
-
-        reply = QMessageBox.question(
-            self,
-            "Delete Tab",
-            f"Are you sure you want to delete tab '{tab['name']}'?",
-            QMessageBox.Yes | QMessageBox.No,
-        )
-        if reply != QMessageBox.Yes:
-            return
-
-        self.config["tabs"] = [t for t in self.config["tabs"] if t["id"] != tab_id]
-        self.tab_widget.removeTab(index)
-        self.tab_ui.pop(tab_id, None)
-
-        self.config_manager.save(self.config)
-        self.show_status(f"✔ Deleted tab '{tab['name']}'")
-
-    # ---------- Drag & Drop / File Operations ----------
-
-    def handle_drop(self, tab_id: str, src_paths: List[str]) -> None:
-        """Handle dropped files/folders."""
-        tab = self._get_tab_config_by_id(tab_id)
-        if not tab:
-            self.show_status("❌ Internal error: tab not found.", error=True)
-            return
-
-        dest_root = tab.get("path") or ""
-        if not dest_root or not os.path.isdir(dest_root):
-            self.show_status(
-                f"❌ No valid destination folder for tab '{tab['name']}'", error=True
-            )
-            return
-
-        mode = tab.get("operation", OP_COPY_REPLACE)
-        successes = 0
-        failures = 0
-        failure_messages = []
-
-        for src in src_paths:
-            if not os.path.exists(src):
-                failures += 1
-                msg = f"Source does not exist: {src}"
-                failure_messages.append(msg)
-                self._add_history_entry(
-                    tab_id, mode, src, "", f"failed: {msg}"
-                )
-                continue
-
-            name = os.path.basename(src.rstrip(os.sep))
-            target = os.path.join(dest_root, name)
-            exists = os.path.exists(target)
-
-            try:
-                # Decide if we should skip existing targets
-                if mode in (OP_COPY_NEW, OP_MOVE_NEW) and exists:
-                    # skip existing
-                    self._add_history_entry(
-                        tab_id,
-                        mode,
-                        src,
-                        target,
-                        "skipped (target exists, NEW only)",
-                    )
-                    continue
-
-                # Perform copy / replace
-                if os.path.isdir(src):
-                    # Replace directory if needed
-                    if exists and mode in (OP_COPY_REPLACE, OP_MOVE_REPLACE):
-                        shutil.rmtree(target)
-                    shutil.copytree(src, target)
-                else:
-                    # File copy; copy2 overwrites
-                    shutil.copy2(src, target)
-
-                # Handle move (delete source)
-                if mode in (OP_MOVE_REPLACE, OP_MOVE_NEW):
-                    if os.path.isdir(src):
-                        shutil.rmtree(src)
-                    else:
-                        os.remove(src)
-
-                successes += 1
-                self._add_history_entry(
-                    tab_id, mode, src, target, "success"
-                )
-
-            except Exception as e:
-                failures += 1
-                msg = f"Failed to {mode} '{src}': {e}"
-                failure_messages.append(msg)
-                self._add_history_entry(
-                    tab_id, mode, src, target, f"failed: {e}"
-                )
-
-        op_label = {
-            OP_COPY_REPLACE: "Copy & Replace",
-            OP_COPY_NEW: "Copy New Only",
-            OP_MOVE_REPLACE: "Move & Replace",
-            OP_MOVE_NEW: "Move New Only",
-        }.get(mode, mode)
-
-        if failures == 0:
-            self.show_status(
-                f"✔ {op_label}: {successes} item(s) to '{dest_root}' for tab '{tab['name']}'"
-            )
-        else:
-            self.show_status(
-                f"⚠️ {op_label}: {successes} item(s) OK, {failures} failure(s). See details.",
-                error=True,
-            )
-            QMessageBox.warning(
-                self,
-                f"{op_label} - Errors",
-                "Some items failed:\n\n" + "\n".join(failure_messages),
-            )
-
-    # ---------- Import / Export ----------
-
-    def export_config(self) -> None:
-        """Export configuration to a JSON file."""
-        filename, _ = QFileDialog.getSaveFileName(
-            self,
-            "Export Configuration",
-            "tabs_config.json",
-            "JSON Files (*.json);;All Files (*)",
-        )
-        if not filename:
-            return
-
-        try:
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(self.config, f, indent=2)
-            self.show_status(f"✔ Exported configuration to '{filename}'")
-        except Exception as e:
-            QMessageBox.critical(
-                self, "Export Error", f"Failed to export configuration:\n{e}"
-            )
-
-    def import_config(self) -> None:
-        """Import configuration from a JSON file."""
-        filename, _ = QFileDialog.getOpenFileName(
-            self,
-            "Import Configuration",
-            "",
-            "JSON Files (*.json);;All Files (*)",
-        )
-        if not filename:
-            return
-
-        try:
-            with open(filename, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except Exception as e:
-            QMessageBox.critical(
-                self, "Import Error", f"Failed to read configuration file:\n{e}"
-            )
-            return
-
-        if "tabs" not in data or not isinstance(data["tabs"], list):
-            QMessageBox.critical(
-                self,
-                "Import Error",
-                "Invalid configuration format (no 'tabs' array).",
-            )
-            return
-
-        for t in data["tabs"]:
-            t.setdefault("id", str(uuid.uuid4()))
-            t.setdefault("name", "Unnamed")
-            t.setdefault("path", "")
-            # Normalize operations
-            op = t.get("operation", OP_COPY_REPLACE)
-            if op == "copy":
-                op = OP_COPY_REPLACE
-            elif op == "move":
-                op = OP_MOVE_REPLACE
-            elif op not in {
-                OP_COPY_REPLACE,
-                OP_COPY_NEW,
-                OP_MOVE_REPLACE,
-                OP_MOVE_NEW,
-            }:
-                op = OP_COPY_REPLACE
-            t["operation"] = op
-            t.setdefault("history", [])
-
-        msg_box = QMessageBox(self)
-        msg_box.setWindowTitle("Import Configuration")
-        msg_box.setText(
-            "How would you like to apply the imported configuration?\n\n"
-            "Yes: Replace existing tabs\n"
-            "No: Merge with existing tabs\n"
-            "Cancel: Abort"
-        )
-        msg_box.setStandardButtons(
-            QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel
-        )
-        choice = msg_box.exec()
-
-        if choice == QMessageBox.Cancel:
-            return
-        elif choice == QMessageBox.Yes:
-            self.config = {"tabs": data["tabs"]}
-        elif choice == QMessageBox.No:
-            self.config["tabs"].extend(data["tabs"])
-
-        self.config_manager.save(self.config)
-        self._rebuild_tabs()
-        self.show_status("✔ Imported configuration successfully")
-
-    # ---------- Misc ----------
-
-    def show_status(self, message: str, error: bool = False) -> None:
-        """Show a status message."""
-        self.status_bar.showMessage(message, 8000)
-        if error:
-            print("ERROR:", message)
-
-    def show_about(self) -> None:
-        """Show the About dialog."""
-        QMessageBox.information(
-            self,
-            "About File Router",
-            (
-                "📁 File Router - Professional File Management\n\n"
-                "A utility to route files and folders into\n"
-                "predefined destinations using configurable tabs.\n\n"
-                "Features:\n"
-                "• 4 operation modes per tab:\n"
-                "  - Copy & Replace\n"
-                "  - Copy New Only\n"
-                "  - Move & Replace\n"
-                "  - Move New Only\n"
-                "• Per-tab history with date & time\n"
-                "• Persistent configuration\n"
-                "• Import/Export settings\n"
-                "• Drag & drop support\n"
-                "• Platform-specific styling (Windows, macOS, Linux)\n\n"
-                f"Running on: {platform.system()}\n"
-                f"Config location: {CONFIG_FILENAME}"
-            ),
-        )
-
-
-def main():
-    """Main entry point for the application."""
-    app = QApplication(sys.argv)
-    window = MainWindow()
-    window.show()
-    sys.exit(app.exec())
-
-
-if __name__ == "__main__":
-    main()
+"""
+File Router - Professional File Management Application
+
+A desktop GUI tool to route files and folders into predefined destinations
+using configurable tabs with multiple operation modes.
+"""
+
+import sys
+import os
+import json
+import uuid
+import errno
+import shutil
+import platform
+import re
+import threading
+import time
+import bisect
+import hashlib
+import ctypes
+import itertools
+import math
+import tempfile
+from collections import Counter, OrderedDict
+from datetime import datetime
+from pathlib import Path
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Tuple, BinaryIO, Callable, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import sqlite3
+except ImportError:  # Python built without SQLite
+    sqlite3 = None
+
+# Optional faster hash functions for content comparison
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+from PySide6.QtCore import (
+    Qt,
+    QSize,
+    QThread,
+    QTimer,
+    Signal,
+    QAbstractTableModel,
+    QModelIndex,
+)
+from PySide6.QtWidgets import (
+    QApplication,
+    QMainWindow,
+    QTabWidget,
+    QWidget,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QFileDialog,
+    QStatusBar,
+    QMessageBox,
+    QMenuBar,
+    QMenu,
+    QInputDialog,
+    QRadioButton,
+    QButtonGroup,
+    QToolBar,
+    QFrame,
+    QDialog,
+    QProgressBar,
+    QSpinBox,
+    QFormLayout,
+    QDialogButtonBox,
+    QTableView,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView,
+    QAbstractItemView,
+    QLineEdit,
+    QCheckBox,
+    QComboBox,
+)
+from PySide6.QtGui import QAction, QActionGroup, QColor
+
+# Operation mode constants
+OP_COPY_REPLACE = "copy_replace"
+OP_COPY_NEW = "copy_new"
+OP_MOVE_REPLACE = "move_replace"
+OP_MOVE_NEW = "move_new"
+
+# Number of items of one drop that are transferred at the same time
+DEFAULT_CONCURRENCY = 1
+MAX_CONCURRENCY = 16
+
+# Read/write buffer used for chunked copies, in MiB
+DEFAULT_BUFFER_MIB = 1
+MAX_BUFFER_MIB = 16
+
+# Drops run side by side when they target different disks, up to this many
+MAX_PARALLEL_JOBS = 4
+
+# Drops allowed to run at once on the same destination disk
+DEFAULT_JOBS_PER_DEVICE = 1
+MAX_JOBS_PER_DEVICE = 4
+
+# Queue priority of a tab's drops; higher runs first
+PRIORITY_LOW = 0
+PRIORITY_NORMAL = 1
+PRIORITY_HIGH = 2
+PRIORITY_LABELS = {
+    PRIORITY_LOW: "Low",
+    PRIORITY_NORMAL: "Normal",
+    PRIORITY_HIGH: "High",
+}
+
+# Per-tab bandwidth limit in MB/s; 0 means unlimited
+MAX_BANDWIDTH_MBPS = 10000
+
+# Threads listing directories concurrently while a folder is copied
+WALK_WORKERS = 8
+
+# Discovered files that may wait for a copy thread before the walk pauses
+MAX_QUEUED_COPIES = 4096
+
+# Files below this size are copied in batches by one thread each, read in one
+# go and written in one go, with their metadata applied after the batch
+SMALL_FILE_THRESHOLD = 64 * 1024
+SMALL_BATCH_FILES = 256
+SMALL_BATCH_BYTES = 8 * 1024 * 1024
+
+# Files at least this large get their destination space reserved up front
+PREALLOCATE_THRESHOLD = 16 * 1024 * 1024
+
+# Linux I/O scheduling class of the copy threads
+IO_PRIORITY_NORMAL = "normal"
+IO_PRIORITY_LOW = "best_effort"  # lowest best-effort level
+IO_PRIORITY_IDLE = "idle"  # only when nothing else uses the disk
+
+# How a drop makes sure its data has reached the disk
+DURABILITY_NONE = "none"  # leave writeback to the OS
+DURABILITY_FSYNC = "fsync"  # fsync each file before it counts as copied
+DURABILITY_SYNCFS = "syncfs"  # one syncfs of the destination per drop
+
+# What "Replace existing" does with a folder that already exists
+REPLACE_WIPE = "wipe"  # delete the old folder, then copy the new one
+REPLACE_MERGE = "merge"  # copy only changed files into the old folder
+
+# Modification times closer than this are treated as equal (FAT, SMB)
+MTIME_WINDOW = 2.0
+
+# How an existing destination file is judged to be the same as the source
+COMPARE_NAME = "name"  # it exists
+COMPARE_SIZE_MTIME = "size_mtime"  # same size and modification time
+COMPARE_HASH = "hash"  # same size and sampled content hash
+
+# Files above this size are hashed from sampled blocks only
+HASH_SAMPLE_THRESHOLD = 4 * 1024 * 1024
+HASH_SAMPLE_BLOCK = 256 * 1024
+
+# Minimum delay between two progress updates sent to the GUI, in seconds
+PROGRESS_INTERVAL = 0.1
+
+# Time constant in seconds of the smoothed copy rate behind the ETA
+ETA_SMOOTHING = 5.0
+
+# What the planning pass expects to do with a dropped path
+PLAN_COPY = "copy"  # nothing there yet
+PLAN_REPLACE = "replace"  # overwrite what is there
+PLAN_MERGE = "merge"  # write only the files that are not current
+PLAN_SKIP = "skip"  # already present (New only)
+PLAN_RENAME = "rename"  # move within the disk, no data copied
+PLAN_MISSING = "missing"  # the dropped path is gone
+
+# Delay before coalesced configuration changes are written, in milliseconds
+CONFIG_SAVE_DELAY_MS = 2000
+
+
+def get_config_path() -> str:
+    """
+    Return OS-appropriate path for config.json.
+    
+    Returns:
+        str: Full path to the configuration file
+    """
+    system = platform.system()
+    
+    if system == "Windows":
+        base = os.getenv("APPDATA") or str(Path.home() / "AppData" / "Roaming")
+        base_dir = Path(base) / "FileRouter"
+    elif system == "Darwin":  # macOS
+        base_dir = Path.home() / "Library" / "Application Support" / "FileRouter"
+    else:  # Linux and others
+        base_dir = Path.home() / ".config" / "file_router"
+    
+    base_dir.mkdir(parents=True, exist_ok=True)
+    return str(base_dir / "config.json")
+
+
+CONFIG_FILENAME = get_config_path()
+
+# Per-tab append-only history journals live next to config.json
+HISTORY_DIR = os.path.join(os.path.dirname(CONFIG_FILENAME), "history")
+HISTORY_DB_FILENAME = os.path.join(
+    os.path.dirname(CONFIG_FILENAME), "history.sqlite3"
+)
+
+# Copies are written under a hidden temporary name and renamed into place;
+# a replaced target is parked under a second name until the swap is done
+STAGING_SUFFIX = ".teleporting"
+REPLACED_SUFFIX = ".teleport-old"
+
+# Drops in flight are journaled here so they can be resumed after a crash
+TRANSFER_JOURNAL_DIR = os.path.join(os.path.dirname(CONFIG_FILENAME), "transfers")
+
+# Large files record their progress in the journal every this many bytes
+JOURNAL_CHECKPOINT_BYTES = 64 * 1024 * 1024
+
+# Per-destination file fingerprint caches live next to config.json
+FINGERPRINT_DIR = os.path.join(os.path.dirname(CONFIG_FILENAME), "fingerprints")
+
+# History storage backends
+HISTORY_BACKEND_JSONL = "jsonl"
+HISTORY_BACKEND_SQLITE = "sqlite"
+
+
+def normalize_concurrency(value: Any) -> int:
+    """Clamp a stored per-tab concurrency value to 1..MAX_CONCURRENCY."""
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_CONCURRENCY
+    return max(1, min(MAX_CONCURRENCY, value))
+
+
+def normalize_buffer_mib(value: Any) -> int:
+    """Clamp a stored per-tab copy buffer size to 1..MAX_BUFFER_MIB."""
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_BUFFER_MIB
+    return max(1, min(MAX_BUFFER_MIB, value))
+
+
+def default_transfer_settings() -> Dict[str, Any]:
+    """Return the default per-tab transfer tuning options."""
+    return {
+        "concurrency": DEFAULT_CONCURRENCY,
+        "buffer_size_mib": DEFAULT_BUFFER_MIB,
+        "replace_strategy": REPLACE_WIPE,
+        "prune_extras": False,
+        "compare": COMPARE_NAME,
+        "verify": False,
+        "bandwidth_limit_mbps": 0,
+        "io_priority": IO_PRIORITY_NORMAL,
+        "priority": PRIORITY_NORMAL,
+        "durability": DURABILITY_NONE,
+        "preview": False,
+    }
+
+
+def normalize_transfer_settings(tab: Dict[str, Any]) -> None:
+    """Fill in missing transfer options of a tab and clamp invalid ones."""
+    for key, value in default_transfer_settings().items():
+        tab.setdefault(key, value)
+
+    tab["concurrency"] = normalize_concurrency(tab["concurrency"])
+    tab["buffer_size_mib"] = normalize_buffer_mib(tab["buffer_size_mib"])
+    if tab["replace_strategy"] not in {REPLACE_WIPE, REPLACE_MERGE}:
+        tab["replace_strategy"] = REPLACE_WIPE
+    tab["prune_extras"] = bool(tab["prune_extras"])
+    if tab["compare"] not in {COMPARE_NAME, COMPARE_SIZE_MTIME, COMPARE_HASH}:
+        tab["compare"] = COMPARE_NAME
+    tab["verify"] = bool(tab["verify"])
+    try:
+        limit = int(tab["bandwidth_limit_mbps"])
+    except (TypeError, ValueError):
+        limit = 0
+    tab["bandwidth_limit_mbps"] = max(0, min(MAX_BANDWIDTH_MBPS, limit))
+    if tab["io_priority"] not in {
+        IO_PRIORITY_NORMAL,
+        IO_PRIORITY_LOW,
+        IO_PRIORITY_IDLE,
+    }:
+        tab["io_priority"] = IO_PRIORITY_NORMAL
+    if tab["priority"] not in PRIORITY_LABELS:
+        tab["priority"] = PRIORITY_NORMAL
+    if tab["durability"] not in {DURABILITY_NONE, DURABILITY_FSYNC, DURABILITY_SYNCFS}:
+        tab["durability"] = DURABILITY_NONE
+    tab["preview"] = bool(tab["preview"])
+
+
+def format_size(num_bytes: float) -> str:
+    """Format a byte count for display, e.g. '1.5 GB'."""
+    size = float(num_bytes)
+    unit = "B"
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if abs(size) < 1024 or unit == "TB":
+            break
+        size /= 1024
+    return f"{int(size)} B" if unit == "B" else f"{size:.1f} {unit}"
+
+
+def format_duration(seconds: float) -> str:
+    """Format a time span for display, e.g. '40 s', '3 min' or '1 h 5 min'."""
+    seconds = int(seconds + 0.5)
+    if seconds < 60:
+        return f"{seconds} s"
+    minutes = (seconds + 30) // 60
+    if minutes < 60:
+        return f"{minutes} min"
+    return f"{minutes // 60} h {minutes % 60} min"
+
+
+def normalize_jobs_per_device(value: Any) -> int:
+    """Clamp the stored per-disk drop limit to 1..MAX_JOBS_PER_DEVICE."""
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_JOBS_PER_DEVICE
+    return max(1, min(MAX_JOBS_PER_DEVICE, value))
+
+
+def generate_default_config() -> Dict[str, Any]:
+    """Generate default configuration with L1–L5 tabs and no paths."""
+    return {
+        "history_backend": HISTORY_BACKEND_JSONL,
+        "jobs_per_device": DEFAULT_JOBS_PER_DEVICE,
+        "tabs": [
+            {
+                "id": str(uuid.uuid4()),
+                "name": f"L{i}",
+                "path": "",
+                "operation": OP_COPY_REPLACE,
+                **default_transfer_settings(),
+            }
+            for i in range(1, 6)
+        ]
+    }
+
+
+class ConfigManager:
+    """Manages loading and saving of application configuration."""
+    
+    def __init__(self, config_path: str):
+        self.config_path = config_path
+
+    def load(self) -> Dict[str, Any]:
+        """Load configuration from file or return default config."""
+        if not os.path.exists(self.config_path):
+            return generate_default_config()
+
+        try:
+            with open(self.config_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+
+            if "tabs" not in data or not isinstance(data["tabs"], list):
+                return generate_default_config()
+
+            if data.get("history_backend") not in {
+                HISTORY_BACKEND_JSONL,
+                HISTORY_BACKEND_SQLITE,
+            }:
+                data["history_backend"] = HISTORY_BACKEND_JSONL
+            data["jobs_per_device"] = normalize_jobs_per_device(
+                data.get("jobs_per_device", DEFAULT_JOBS_PER_DEVICE)
+            )
+
+            for t in data["tabs"]:
+                t.setdefault("id", str(uuid.uuid4()))
+                t.setdefault("name", "Unnamed")
+                t.setdefault("path", "")
+
+                # Map old operation values to new ones
+                op = t.get("operation", OP_COPY_REPLACE)
+                if op == "copy":
+                    op = OP_COPY_REPLACE
+                elif op == "move":
+                    op = OP_MOVE_REPLACE
+                elif op not in {
+                    OP_COPY_REPLACE,
+                    OP_COPY_NEW,
+                    OP_MOVE_REPLACE,
+                    OP_MOVE_NEW,
+                }:
+                    op = OP_COPY_REPLACE
+                t["operation"] = op
+                normalize_transfer_settings(t)
+
+            return data
+        except Exception as e:
+            print(f"Error loading config: {e}")
+            return generate_default_config()
+
+    def save(self, data: Dict[str, Any]) -> None:
+        """Save configuration to file."""
+        try:
+            with open(self.config_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+        except Exception as e:
+            print(f"Error saving config: {e}")
+
+
+class HistoryStore:
+    """
+    Base class for the history backends.
+
+    Entries are plain dicts with timestamp, operation, source, destination
+    and result keys. append() only queues them; flush() writes everything
+    queued since the last flush in one batch.
+    """
+
+    def __init__(self):
+        self._pending: Dict[str, List[Dict[str, Any]]] = {}
+
+    def append(self, tab_id: str, entry: Dict[str, Any]) -> None:
+        """Queue an entry for a tab."""
+        self._pending.setdefault(tab_id, []).append(entry)
+
+    def flush(self) -> None:
+        """Write all queued entries."""
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+        try:
+            self._write(pending)
+        except Exception as e:
+            print(f"Error writing history: {e}")
+
+    def entries(self, tab_id: str) -> List[Dict[str, Any]]:
+        """Return all entries of a tab, oldest first."""
+        return self.query(tab_id)
+
+    def query(
+        self,
+        tab_id: str,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        source: Optional[str] = None,
+        result: Optional[str] = None,
+        operation: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Return the entries of a tab matching all given filters, oldest first.
+
+        Args:
+            tab_id: Tab whose history is queried
+            since: Earliest timestamp (inclusive, "YYYY-MM-DD HH:MM:SS")
+            until: Latest timestamp (inclusive)
+            source: Source path prefix, e.g. a folder
+            result: Result prefix, e.g. "failed" or "success"
+            operation: Exact operation mode
+        """
+        raise NotImplementedError
+
+    def count(self, tab_id: str) -> int:
+        """Return the number of entries of a tab."""
+        return len(self.query(tab_id))
+
+    def fetch(
+        self,
+        tab_id: str,
+        offset: int,
+        limit: int,
+        sort_key: str = "timestamp",
+        descending: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Return one page of a tab's entries in the given order.
+
+        Backends override this to avoid loading the whole history for
+        every page; the default sorts the full query() result.
+        """
+        entries = self.query(tab_id)
+        entries.sort(key=lambda e: str(e.get(sort_key, "")), reverse=descending)
+        return entries[offset : offset + limit]
+
+    def search_rows(self, tab_id: str) -> Iterator[Tuple[int, str]]:
+        """
+        Yield (row id, searchable text) for every entry, oldest first.
+
+        The text joins source, destination and result with tabs. Row ids
+        can be passed back to fetch_rows().
+        """
+        for row, e in enumerate(self.query(tab_id)):
+            yield row, self._search_text(e)
+
+    def fetch_rows(self, tab_id: str, row_ids: List[int]) -> List[Dict[str, Any]]:
+        """Return the entries with the given row ids, in that order."""
+        entries = self.query(tab_id)
+        return [entries[row] for row in row_ids]
+
+    def delete(self, tab_id: str) -> None:
+        """Remove all history of a deleted tab."""
+        raise NotImplementedError
+
+    def reader(self) -> "HistoryStore":
+        """
+        Open another store on the same data, for use on another thread.
+
+        It does not see entries still queued here; flush() first.
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Flush and release resources."""
+        self.flush()
+
+    def migrate(self, config: Dict[str, Any]) -> bool:
+        """
+        Move legacy 'history' lists out of tab configs into the store.
+
+        Each tab's list is only taken out of the config once its entries
+        are written, so a failed write leaves it to be migrated next time.
+
+        Returns:
+            True if the config was changed and should be saved
+
+        Raises:
+            Exception: Whatever the backend raises if the write fails
+        """
+        legacy = [tab for tab in config.get("tabs", []) if "history" in tab]
+        if not legacy:
+            return False
+
+        self.flush()
+        for tab in legacy:
+            entries = [e for e in tab["history"] or [] if isinstance(e, dict)]
+            if entries:
+                self._write({tab["id"]: entries})
+            del tab["history"]
+        return True
+
+    def _write(self, pending: Dict[str, List[Dict[str, Any]]]) -> None:
+        raise NotImplementedError
+
+    @staticmethod
+    def _search_text(entry: Dict[str, Any]) -> str:
+        return "\t".join(
+            str(entry.get(key, "")) for key in ("source", "destination", "result")
+        )
+
+    @staticmethod
+    def _matches(
+        entry: Dict[str, Any],
+        since: Optional[str],
+        until: Optional[str],
+        source: Optional[str],
+        result: Optional[str],
+        operation: Optional[str],
+    ) -> bool:
+        timestamp = entry.get("timestamp", "")
+        return (
+            (since is None or timestamp >= since)
+            and (until is None or timestamp <= until)
+            and (source is None or entry.get("source", "").startswith(source))
+            and (result is None or entry.get("result", "").startswith(result))
+            and (operation is None or entry.get("operation") == operation)
+        )
+
+
+class HistoryJournal(HistoryStore):
+    """
+    Append-only per-tab history stored as JSON Lines files.
+
+    Each tab gets its own <tab_id>.jsonl file with one entry per line, so
+    recording an operation is an O(1) append instead of a rewrite of
+    config.json.
+    """
+
+    def __init__(self, history_dir: str):
+        super().__init__()
+        self.history_dir = history_dir
+        # Byte offset of every complete line, and how far each file is indexed
+        self._offsets: Dict[str, List[int]] = {}
+        self._indexed_size: Dict[str, int] = {}
+        # Row order per (tab_id, sort key), with the row count it was built for
+        self._sort_orders: Dict[Tuple[str, str], Tuple[int, List[int]]] = {}
+
+    def _path(self, tab_id: str) -> str:
+        return os.path.join(self.history_dir, f"{tab_id}.jsonl")
+
+    def _line_offsets(self, tab_id: str) -> List[int]:
+        """Return the start offsets of all lines, indexing only new data."""
+        self.flush()
+        path = self._path(tab_id)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+
+        offsets = self._offsets.setdefault(tab_id, [])
+        pos = self._indexed_size.get(tab_id, 0)
+        if size < pos:
+            # File was replaced or truncated: start over
+            offsets.clear()
+            pos = 0
+        if size > pos:
+            with open(path, "rb") as f:
+                f.seek(pos)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # incomplete last line
+                    offsets.append(pos)
+                    pos += len(line)
+        self._indexed_size[tab_id] = pos
+        return offsets
+
+    def _read_rows(
+        self, tab_id: str, offsets: List[int], rows: List[int]
+    ) -> List[Dict[str, Any]]:
+        """Read the given line numbers; unreadable lines yield empty dicts."""
+        entries = []
+        with open(self._path(tab_id), "rb") as f:
+            for row in rows:
+                f.seek(offsets[row])
+                try:
+                    entries.append(json.loads(f.readline()))
+                except ValueError:
+                    entries.append({})
+        return entries
+
+    def _sort_order(
+        self, tab_id: str, sort_key: str, offsets: List[int]
+    ) -> List[int]:
+        """Return line numbers sorted by an entry key, cached per row count."""
+        cached = self._sort_orders.get((tab_id, sort_key))
+        if cached and cached[0] == len(offsets):
+            return cached[1]
+
+        keys = [
+            str(e.get(sort_key, ""))
+            for e in self._read_rows(tab_id, offsets, list(range(len(offsets))))
+        ]
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self._sort_orders[(tab_id, sort_key)] = (len(offsets), order)
+        return order
+
+    def count(self, tab_id: str) -> int:
+        return len(self._line_offsets(tab_id))
+
+    def search_rows(self, tab_id: str) -> Iterator[Tuple[int, str]]:
+        # Row ids are line numbers, matching _line_offsets()
+        n = len(self._line_offsets(tab_id))
+        if not n:
+            return
+        with open(self._path(tab_id), "rb") as f:
+            for row in range(n):
+                try:
+                    entry = json.loads(f.readline())
+                except ValueError:
+                    entry = {}
+                yield row, self._search_text(entry)
+
+    def fetch_rows(self, tab_id: str, row_ids: List[int]) -> List[Dict[str, Any]]:
+        return self._read_rows(tab_id, self._line_offsets(tab_id), row_ids)
+
+    def reader(self) -> "HistoryJournal":
+        return HistoryJournal(self.history_dir)
+
+    def fetch(
+        self,
+        tab_id,
+        offset,
+        limit,
+        sort_key="timestamp",
+        descending=False,
+    ) -> List[Dict[str, Any]]:
+        offsets = self._line_offsets(tab_id)
+        n = len(offsets)
+        stop = min(n, offset + limit)
+        if offset >= stop:
+            return []
+
+        # Lines are appended in time order, so the file order is time order
+        if sort_key == "timestamp":
+            order: Any = range(n)
+        else:
+            order = self._sort_order(tab_id, sort_key, offsets)
+
+        if descending:
+            rows = [order[n - 1 - i] for i in range(offset, stop)]
+        else:
+            rows = [order[i] for i in range(offset, stop)]
+        return self._read_rows(tab_id, offsets, rows)
+
+    def _write(self, pending: Dict[str, List[Dict[str, Any]]]) -> None:
+        os.makedirs(self.history_dir, exist_ok=True)
+        for tab_id, entries in pending.items():
+            lines = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries)
+            with open(self._path(tab_id), "a", encoding="utf-8") as f:
+                f.write(lines)
+
+    def query(
+        self,
+        tab_id,
+        since=None,
+        until=None,
+        source=None,
+        result=None,
+        operation=None,
+    ) -> List[Dict[str, Any]]:
+        self.flush()
+        path = self._path(tab_id)
+        if not os.path.exists(path):
+            return []
+
+        entries = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # e.g. a line cut short by a crash
+                    continue
+                if self._matches(entry, since, until, source, result, operation):
+                    entries.append(entry)
+        return entries
+
+    def delete(self, tab_id: str) -> None:
+        self._pending.pop(tab_id, None)
+        self._offsets.pop(tab_id, None)
+        self._indexed_size.pop(tab_id, None)
+        try:
+            os.remove(self._path(tab_id))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error deleting history: {e}")
+
+
+class SqliteHistoryStore(HistoryStore):
+    """
+    History stored in an SQLite database for large, queryable audit logs.
+
+    The database runs in WAL mode so reads never wait for a writer, and
+    each flush inserts the queued entries in a single transaction.
+    """
+
+    # Columns of the history table, in entry-key order
+    COLUMNS = ("timestamp", "operation", "source", "destination", "result")
+
+    def __init__(self, db_path: str):
+        super().__init__()
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS history (
+                    id INTEGER PRIMARY KEY,
+                    tab_id TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    operation TEXT NOT NULL DEFAULT '',
+                    source TEXT NOT NULL DEFAULT '',
+                    destination TEXT NOT NULL DEFAULT '',
+                    result TEXT NOT NULL DEFAULT '',
+                    extra TEXT
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_history_tab_time "
+                "ON history (tab_id, timestamp)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_history_tab_result "
+                "ON history (tab_id, result)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_history_tab_source "
+                "ON history (tab_id, source)"
+            )
+            # Let the history viewer sort by any column without a full sort
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_history_tab_operation "
+                "ON history (tab_id, operation)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_history_tab_destination "
+                "ON history (tab_id, destination)"
+            )
+
+    def _write(self, pending: Dict[str, List[Dict[str, Any]]]) -> None:
+        rows = []
+        for tab_id, entries in pending.items():
+            for e in entries:
+                # Keys without a column of their own are kept as JSON
+                extra = {k: v for k, v in e.items() if k not in self.COLUMNS}
+                rows.append(
+                    (tab_id,)
+                    + tuple(str(e.get(c, "")) for c in self.COLUMNS)
+                    + (json.dumps(extra) if extra else None,)
+                )
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO history (tab_id, timestamp, operation, source, "
+                "destination, result, extra) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def query(
+        self,
+        tab_id,
+        since=None,
+        until=None,
+        source=None,
+        result=None,
+        operation=None,
+    ) -> List[Dict[str, Any]]:
+        self.flush()
+        sql = "SELECT " + ", ".join(self.COLUMNS) + ", extra FROM history"
+        clauses = ["tab_id = ?"]
+        params: List[Any] = [tab_id]
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("timestamp <= ?")
+            params.append(until)
+        # Prefix matches as ranges so the (tab_id, column) indexes apply
+        for column, prefix in (("source", source), ("result", result)):
+            if prefix is not None:
+                clauses.append(f"{column} >= ? AND {column} < ?")
+                params.extend([prefix, prefix + "\U0010ffff"])
+        if operation is not None:
+            clauses.append("operation = ?")
+            params.append(operation)
+        sql += " WHERE " + " AND ".join(clauses) + " ORDER BY timestamp, id"
+
+        return [self._row_to_entry(row) for row in self._conn.execute(sql, params)]
+
+    def count(self, tab_id: str) -> int:
+        self.flush()
+        row = self._conn.execute(
+            "SELECT COUNT(*) FROM history WHERE tab_id = ?", (tab_id,)
+        ).fetchone()
+        return row[0]
+
+    def fetch(
+        self,
+        tab_id,
+        offset,
+        limit,
+        sort_key="timestamp",
+        descending=False,
+    ) -> List[Dict[str, Any]]:
+        self.flush()
+        if sort_key not in self.COLUMNS:
+            sort_key = "timestamp"
+        direction = "DESC" if descending else "ASC"
+        rows = self._conn.execute(
+            "SELECT " + ", ".join(self.COLUMNS) + ", extra FROM history "
+            f"WHERE tab_id = ? ORDER BY {sort_key} {direction}, id {direction} "
+            "LIMIT ? OFFSET ?",
+            (tab_id, limit, offset),
+        )
+        return [self._row_to_entry(row) for row in rows]
+
+    def search_rows(self, tab_id: str) -> Iterator[Tuple[int, str]]:
+        self.flush()
+        rows = self._conn.execute(
+            "SELECT id, source, destination, result FROM history "
+            "WHERE tab_id = ? ORDER BY timestamp, id",
+            (tab_id,),
+        )
+        for row_id, source, destination, result in rows:
+            yield row_id, f"{source}\t{destination}\t{result}"
+
+    def fetch_rows(self, tab_id: str, row_ids: List[int]) -> List[Dict[str, Any]]:
+        self.flush()
+        by_id: Dict[int, Dict[str, Any]] = {}
+        # Stay below SQLite's limit on bound parameters
+        for start in range(0, len(row_ids), 500):
+            chunk = row_ids[start : start + 500]
+            rows = self._conn.execute(
+                "SELECT id, " + ", ".join(self.COLUMNS) + ", extra FROM history "
+                f"WHERE id IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            for row in rows:
+                by_id[row[0]] = self._row_to_entry(row[1:])
+        return [by_id.get(row_id, {}) for row_id in row_ids]
+
+    def _row_to_entry(self, row: Tuple) -> Dict[str, Any]:
+        entry = dict(zip(self.COLUMNS, row[:-1]))
+        if row[-1]:
+            entry.update(json.loads(row[-1]))
+        return entry
+
+    def delete(self, tab_id: str) -> None:
+        self._pending.pop(tab_id, None)
+        with self._conn:
+            self._conn.execute("DELETE FROM history WHERE tab_id = ?", (tab_id,))
+
+    def reader(self) -> "SqliteHistoryStore":
+        # Connections cannot be shared between threads
+        return SqliteHistoryStore(self.db_path)
+
+    def close(self) -> None:
+        super().close()
+        self._conn.close()
+
+
+def open_history_store(backend: str) -> HistoryStore:
+    """
+    Open the history store for a backend name.
+
+    Raises:
+        RuntimeError: If SQLite is requested but not available
+        sqlite3.Error: If the database cannot be opened
+    """
+    if backend != HISTORY_BACKEND_SQLITE:
+        return HistoryJournal(HISTORY_DIR)
+    if sqlite3 is None:
+        raise RuntimeError("SQLite is not available")
+    return SqliteHistoryStore(HISTORY_DB_FILENAME)
+
+
+def create_history_store(backend: str) -> HistoryStore:
+    """Create the history store for a backend name, defaulting to JSON Lines."""
+    try:
+        return open_history_store(backend)
+    except Exception as e:
+        print(f"Error opening history database: {e}")
+    return HistoryJournal(HISTORY_DIR)
+
+
+class FingerprintCache:
+    """
+    Remembers content digests of destination files between drops.
+
+    Entries are kept per destination root as relative path -> (size,
+    mtime, inode, ctime, digests) and are only trusted while the file's
+    current stat still matches, so any change to a file invalidates its
+    entry. Each root is stored as one JSON file in the cache directory,
+    loaded on first use and rewritten by flush() when it changed.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._roots: Dict[str, Dict[str, list]] = {}
+        self._dirty: set = set()
+        self._lock = threading.Lock()
+
+    def _cache_path(self, root: str) -> str:
+        key = hashlib.sha1(root.encode("utf-8", "surrogatepass")).hexdigest()
+        return os.path.join(self.directory, f"{key[:16]}.json")
+
+    def _entries(self, root: str) -> Dict[str, list]:
+        """Return the entries of a root, loading them on first use."""
+        entries = self._roots.get(root)
+        if entries is None:
+            entries = {}
+            try:
+                with open(self._cache_path(root), "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("root") == root:
+                    entries = data.get("files", {})
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"Error loading fingerprint cache: {e}")
+            self._roots[root] = entries
+        return entries
+
+    @staticmethod
+    def _signature(st: os.stat_result) -> list:
+        return [st.st_size, st.st_mtime_ns, st.st_ino, st.st_ctime_ns]
+
+    def digest(
+        self,
+        root: str,
+        path: str,
+        st: os.stat_result,
+        kind: str,
+        compute: Callable[[str], str],
+    ) -> str:
+        """
+        Return the digest of a file under root, computing it only on a miss.
+
+        Args:
+            root: Destination root the cache is kept for
+            path: File below root
+            st: Current os.stat() of the file
+            kind: Name of the digest (different hashes are cached apart)
+            compute: Called with path to hash the file on a cache miss
+        """
+        rel = os.path.relpath(path, root)
+        signature = self._signature(st)
+        with self._lock:
+            entry = self._entries(root).get(rel)
+            if entry and entry[:4] == signature and kind in entry[4]:
+                return entry[4][kind]
+
+        value = compute(path)
+        with self._lock:
+            entries = self._entries(root)
+            entry = entries.get(rel)
+            if not entry or entry[:4] != signature:
+                entry = entries[rel] = signature + [{}]
+            entry[4][kind] = value
+            self._dirty.add(root)
+        return value
+
+    def forget(self, root: str, path: str) -> None:
+        """Drop the entry of a file that is about to be rewritten."""
+        rel = os.path.relpath(path, root)
+        with self._lock:
+            if self._entries(root).pop(rel, None) is not None:
+                self._dirty.add(root)
+
+    def flush(self) -> None:
+        """Write the caches of all roots that changed."""
+        with self._lock:
+            snapshot = {root: dict(self._roots[root]) for root in self._dirty}
+            self._dirty.clear()
+
+        for root, entries in snapshot.items():
+            path = self._cache_path(root)
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                tmp = path + ".tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump({"root": root, "files": entries}, f)
+                os.replace(tmp, path)
+            except Exception as e:
+                print(f"Error saving fingerprint cache: {e}")
+
+
+# ---------- File operations ----------
+
+
+def destination_device(path: str) -> str:
+    """Return a key identifying the disk a destination folder lives on."""
+    try:
+        return f"dev:{os.stat(path).st_dev}"
+    except OSError:
+        return f"path:{path}"
+
+
+def same_device(path_a: str, path_b: str) -> bool:
+    """Return True if both paths live on the same filesystem (st_dev)."""
+    try:
+        return os.stat(path_a).st_dev == os.stat(path_b).st_dev
+    except OSError:
+        return False
+
+
+def _new_hasher():
+    """Return the fastest available incremental hash object."""
+    if xxhash is not None:
+        return xxhash.xxh3_128()
+    if blake3 is not None:
+        return blake3.blake3()
+    return hashlib.blake2b(digest_size=16)
+
+
+# Name of the hash _new_hasher() uses, recorded with every checksum
+if xxhash is not None:
+    CHECKSUM_ALGORITHM = "xxh3_128"
+elif blake3 is not None:
+    CHECKSUM_ALGORITHM = "blake3"
+else:
+    CHECKSUM_ALGORITHM = "blake2b-128"
+
+
+class ChecksumMismatch(OSError):
+    """Raised when a copied file does not read back identical to its source."""
+
+
+# errno values of a disk that went away mid-transfer (unplugged, unmounted)
+_DEVICE_GONE_ERRNOS = {errno.EIO, errno.ENODEV, errno.ENXIO, errno.ESTALE}
+
+
+def is_device_gone(e: BaseException) -> bool:
+    """Return True if e means a source or destination disk disappeared."""
+    return (
+        isinstance(e, OSError)
+        and not isinstance(e, ChecksumMismatch)
+        and e.errno in _DEVICE_GONE_ERRNOS
+    )
+
+
+def file_checksum(path: str, buffer_size: int = 1024 * 1024) -> str:
+    """
+    Return the full content checksum of a file, read from storage.
+
+    Written data is flushed and, where supported, dropped from the page
+    cache first, so a freshly copied file is read back from the device
+    rather than from memory.
+    """
+    hasher = _new_hasher()
+    with open(path, "rb") as f:
+        fd = f.fileno()
+        try:
+            os.fsync(fd)
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass  # best effort; e.g. not supported by the filesystem
+        buf = bytearray(buffer_size)
+        view = memoryview(buf)
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            hasher.update(view[:n])
+    return hasher.hexdigest()
+
+
+def fast_file_hash(path: str) -> str:
+    """
+    Return a quick content fingerprint of a file.
+
+    Small files are hashed completely. Larger ones are sampled: the size
+    plus blocks from the start, the middle and the end, so comparing two
+    multi-GB files reads under a megabyte of each.
+    """
+    hasher = _new_hasher()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        hasher.update(size.to_bytes(8, "little"))
+        if size <= HASH_SAMPLE_THRESHOLD:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                hasher.update(chunk)
+        else:
+            for offset in (
+                0,
+                size // 2 - HASH_SAMPLE_BLOCK // 2,
+                size - HASH_SAMPLE_BLOCK,
+            ):
+                f.seek(offset)
+                hasher.update(f.read(HASH_SAMPLE_BLOCK))
+    return hasher.hexdigest()
+
+
+def file_is_current(
+    src_path: str,
+    src_stat: os.stat_result,
+    dst_path: str,
+    strength: str,
+    dst_hash: Optional[Callable[[str, os.stat_result], str]] = None,
+    src_hash: Optional[Callable[[str, os.stat_result], str]] = None,
+) -> bool:
+    """
+    Return True if dst_path already holds src_path by the given strength.
+
+    Args:
+        src_path: Source file
+        src_stat: os.stat() of the source, usually already at hand
+        dst_path: Candidate destination file
+        strength: COMPARE_NAME, COMPARE_SIZE_MTIME or COMPARE_HASH
+        dst_hash: Returns the hash of the destination given its path and
+            stat, e.g. from a FingerprintCache; defaults to hashing it
+        src_hash: The same for the source, e.g. remembered by the job
+    """
+    try:
+        dst_stat = os.stat(dst_path)
+    except OSError:
+        return False
+    if strength == COMPARE_NAME:
+        return True
+    if dst_stat.st_size != src_stat.st_size:
+        return False
+    if strength == COMPARE_SIZE_MTIME:
+        return abs(dst_stat.st_mtime - src_stat.st_mtime) < MTIME_WINDOW
+    src_digest = (
+        fast_file_hash(src_path) if src_hash is None else src_hash(src_path, src_stat)
+    )
+    if dst_hash is None:
+        return src_digest == fast_file_hash(dst_path)
+    return src_digest == dst_hash(dst_path, dst_stat)
+
+
+def kind_conflict(path: str, is_dir: bool) -> bool:
+    """Return True if path exists as a file where a folder goes, or vice versa."""
+    return os.path.exists(path) and os.path.isdir(path) != is_dir
+
+
+def remove_path(path: str) -> None:
+    """Delete a file, symlink or directory tree."""
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    else:
+        os.remove(path)
+
+
+def staging_path(target: str, suffix: str = STAGING_SUFFIX) -> str:
+    """Return a unique hidden temporary name next to target."""
+    directory, name = os.path.split(target.rstrip(os.sep))
+    return os.path.join(directory, f".{name}.{uuid.uuid4().hex[:8]}{suffix}")
+
+
+def swap_into_place(staged: str, target: str) -> None:
+    """
+    Rename a completely written file or folder over target.
+
+    A file replacing a file is a single atomic os.replace(). Otherwise the
+    old target is first renamed aside and only deleted once the new one is
+    in place, so at no point is the old data destroyed before the new copy
+    is complete; after a crash in between, remove_stale_staging puts the
+    parked target back.
+
+    Raises:
+        OSError: With errno EXDEV if staged is on another filesystem
+    """
+    if not os.path.lexists(target) or (
+        not os.path.isdir(staged) and not os.path.isdir(target)
+    ):
+        os.replace(staged, target)
+        return
+
+    parked = staging_path(target, REPLACED_SUFFIX)
+    os.rename(target, parked)
+    try:
+        os.replace(staged, target)
+    except OSError:
+        os.rename(parked, target)
+        raise
+    remove_path(parked)
+
+
+def staged_target_name(name: str) -> Optional[str]:
+    """
+    Return the target name of a staging_path() name, or None for other names.
+
+    E.g. '.photos.1a2b3c4d.teleport-old' belongs to 'photos'.
+    """
+    for suffix in (STAGING_SUFFIX, REPLACED_SUFFIX):
+        if name.startswith(".") and name.endswith(suffix):
+            target, _, tag = name[1 : -len(suffix)].rpartition(".")
+            if target and len(tag) == 8 and all(c in "0123456789abcdef" for c in tag):
+                return target
+    return None
+
+
+def paths_overlap(a: str, b: str) -> bool:
+    """Return True if one of two paths is, or lies inside, the other."""
+    a, b = os.path.realpath(a), os.path.realpath(b)
+    try:
+        return os.path.commonpath([a, b]) in (a, b)
+    except ValueError:  # different drives
+        return False
+
+
+def remove_stale_staging(directory: str, keep: Optional[set] = None) -> None:
+    """
+    Clean up temporary copies left in directory by an interrupted transfer.
+
+    A target parked by swap_into_place that is missing, because the
+    transfer died before the new copy was renamed in, is renamed back
+    first, unless the target is kept for a resume that will put the new
+    copy there; every other leftover is deleted.
+
+    Args:
+        directory: Destination folder to clean
+        keep: Paths still needed to resume a journaled transfer; for a
+            target path, all its staging copies are kept
+    """
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return
+    present = set(names)
+    leftovers = [name for name in sorted(names) if staged_target_name(name)]
+
+    keep = keep or set()
+    for name in leftovers:
+        target = staged_target_name(name)
+        if (
+            name.endswith(REPLACED_SUFFIX)
+            and target not in present
+            and os.path.join(directory, target) not in keep
+        ):
+            parked = os.path.join(directory, name)
+            try:
+                os.rename(parked, os.path.join(directory, target))
+            except OSError as e:
+                print(f"Error restoring parked copy: {e}")
+                continue
+            present.add(target)
+            present.discard(name)
+
+    for name in leftovers:
+        path = os.path.join(directory, name)
+        target = os.path.join(directory, staged_target_name(name))
+        if name not in present or path in keep or target in keep:
+            continue
+        try:
+            remove_path(path)
+        except OSError as e:
+            print(f"Error removing stale staging copy: {e}")
+
+
+def remove_empty_dirs(root: str) -> None:
+    """Delete empty directories below and including root, deepest first."""
+    for current, _dirs, _files in os.walk(root, topdown=False):
+        try:
+            os.rmdir(current)
+        except OSError:
+            pass  # not empty
+
+
+# Callback receiving the number of bytes copied since the previous call
+ProgressCallback = Callable[[int], None]
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting a byte rate.
+
+    Tokens accrue at rate bytes per second up to a quarter second's worth;
+    consume() takes tokens for data already transferred and sleeps off any
+    debt, so all threads sharing a bucket together stay under the rate.
+    """
+
+    BURST_SECONDS = 0.25
+
+    def __init__(self, rate: float):
+        self.rate = float(rate)
+        self.capacity = self.rate * self.BURST_SECONDS
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, n: int) -> None:
+        """Account for n bytes, sleeping as long as needed to honour the rate."""
+        if n <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._last) * self.rate
+            )
+            self._last = now
+            self._tokens -= n
+            debt = -self._tokens
+        if debt > 0:
+            time.sleep(debt / self.rate)
+
+
+# ioprio_set(2) syscall numbers and constants (Linux)
+_SYS_IOPRIO_SET = {
+    "x86_64": 251,
+    "i386": 289,
+    "i686": 289,
+    "aarch64": 30,
+    "armv7l": 314,
+}
+_IOPRIO_WHO_PROCESS = 1
+_IOPRIO_CLASS_SHIFT = 13
+_IOPRIO_CLASS_BE = 2
+_IOPRIO_CLASS_IDLE = 3
+
+
+def set_thread_io_priority(priority: str) -> bool:
+    """
+    Set the Linux I/O scheduling class of the calling thread, like ionice.
+
+    IO_PRIORITY_NORMAL restores the default (derived from the CPU nice
+    value). Other platforms are left alone.
+
+    Returns:
+        True if the priority was applied
+    """
+    syscall_nr = _SYS_IOPRIO_SET.get(platform.machine())
+    if platform.system() != "Linux" or syscall_nr is None:
+        return False
+
+    if priority == IO_PRIORITY_IDLE:
+        value = _IOPRIO_CLASS_IDLE << _IOPRIO_CLASS_SHIFT
+    elif priority == IO_PRIORITY_LOW:
+        value = (_IOPRIO_CLASS_BE << _IOPRIO_CLASS_SHIFT) | 7
+    else:
+        value = 0
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        # who=0 with IOPRIO_WHO_PROCESS means the calling thread
+        if libc.syscall(syscall_nr, _IOPRIO_WHO_PROCESS, 0, value) != 0:
+            err = ctypes.get_errno()
+            print(f"Error setting I/O priority: {os.strerror(err)}")
+            return False
+    except (OSError, AttributeError) as e:
+        print(f"Error setting I/O priority: {e}")
+        return False
+    return True
+
+
+def sync_filesystem(path: str) -> None:
+    """
+    Flush the dirty data of the filesystem holding path, like sync -f.
+
+    Uses syncfs on Linux and falls back to a system-wide os.sync elsewhere.
+    """
+    if platform.system() == "Linux":
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                if libc.syncfs(fd) == 0:
+                    return
+                err = ctypes.get_errno()
+            finally:
+                os.close(fd)
+            print(f"Error syncing filesystem: {os.strerror(err)}")
+        except (OSError, AttributeError) as e:
+            print(f"Error syncing filesystem: {e}")
+    if hasattr(os, "sync"):
+        os.sync()
+
+
+def fsync_directory(path: str) -> None:
+    """
+    Flush a directory's entries to disk, making renames into it durable.
+
+    A no-op where directories cannot be opened, e.g. on Windows.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass  # not supported for directories by this filesystem
+    finally:
+        os.close(fd)
+
+
+# ioctl request number of FICLONE (_IOW(0x94, 9, int)) on Linux
+FICLONE = 0x40049409
+
+# errno values meaning "this backend can't handle these two files"
+_BACKEND_FALLBACK_ERRNOS = {
+    errno.ENOSYS,
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.EBADF,
+    errno.ENOTTY,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+}
+
+
+class CopyBackendUnsupported(Exception):
+    """Raised by a copy backend that cannot copy the given pair of files."""
+
+
+class CopyBackend:
+    """
+    Strategy that copies the data of one open file into another.
+
+    Backends are tried in the order of COPY_BACKENDS. A backend that raises
+    CopyBackendUnsupported is skipped and the next one is used; the base
+    class copies through userspace buffers and always works.
+    """
+
+    name = "userspace"
+
+    # Whether copying can continue from the current file positions
+    resumable = True
+
+    # Whether the data really crosses the disk/network (not a clone)
+    moves_data = True
+
+    def __init__(self):
+        self.disabled = False
+
+    def available(self) -> bool:
+        """Return True if the backend can be used on this platform."""
+        return not self.disabled
+
+    def copy(
+        self,
+        fsrc: BinaryIO,
+        fdst: BinaryIO,
+        size: int,
+        buffer_size: int,
+        progress: ProgressCallback,
+    ) -> None:
+        """
+        Copy size bytes of fsrc into fdst, both from their current position.
+
+        Stops early at the end of fsrc. Data is moved in chunks of
+        buffer_size bytes and progress is called with the size of every
+        chunk written.
+        """
+        buf = bytearray(buffer_size)
+        view = memoryview(buf)
+        remaining = size
+        while remaining > 0:
+            n = fsrc.readinto(view[: min(buffer_size, remaining)])
+            if not n:
+                break
+            fdst.write(view[:n])
+            remaining -= n
+            progress(n)
+
+    def _unsupported(self, e: OSError) -> CopyBackendUnsupported:
+        """Translate an OSError into a fallback request, or re-raise it."""
+        if e.errno not in _BACKEND_FALLBACK_ERRNOS:
+            raise e
+        if e.errno == errno.ENOSYS:
+            # Not implemented by this kernel: stop trying it at all
+            self.disabled = True
+        return CopyBackendUnsupported(f"{self.name}: {e}")
+
+
+class ReflinkBackend(CopyBackend):
+    """Copy-on-write clone via the FICLONE ioctl (btrfs, XFS, ...)."""
+
+    name = "reflink"
+    resumable = False  # clones whole files only
+    moves_data = False  # shares extents, no data is written
+
+    def available(self) -> bool:
+        return (
+            super().available()
+            and fcntl is not None
+            and platform.system() == "Linux"
+        )
+
+    def copy(self, fsrc, fdst, size, buffer_size, progress) -> None:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        except OSError as e:
+            raise self._unsupported(e)
+        progress(size)
+
+
+class CopyFileRangeBackend(CopyBackend):
+    """In-kernel copy via copy_file_range(2) (Linux, Python 3.8+)."""
+
+    name = "copy_file_range"
+
+    def available(self) -> bool:
+        return super().available() and hasattr(os, "copy_file_range")
+
+    def copy(self, fsrc, fdst, size, buffer_size, progress) -> None:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        copied = 0
+        try:
+            while copied < size:
+                n = os.copy_file_range(
+                    src_fd, dst_fd, min(buffer_size, size - copied)
+                )
+                if n == 0:
+                    break
+                copied += n
+                progress(n)
+        except OSError as e:
+            raise self._unsupported(e)
+        if copied == 0 and size > 0:
+            # Some pseudo filesystems report data but copy nothing
+            raise CopyBackendUnsupported(f"{self.name}: nothing copied")
+
+
+class SendfileBackend(CopyBackend):
+    """In-kernel copy via sendfile(2) into a regular file (Linux)."""
+
+    name = "sendfile"
+
+    def available(self) -> bool:
+        return (
+            super().available()
+            and hasattr(os, "sendfile")
+            and platform.system() == "Linux"
+        )
+
+    def copy(self, fsrc, fdst, size, buffer_size, progress) -> None:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        start = offset = fsrc.tell()
+        end = start + size
+        try:
+            while offset < end:
+                n = os.sendfile(dst_fd, src_fd, offset, min(buffer_size, end - offset))
+                if n == 0:
+                    break
+                offset += n
+                progress(n)
+        except OSError as e:
+            raise self._unsupported(e)
+        if offset == start and size > 0:
+            raise CopyBackendUnsupported(f"{self.name}: nothing copied")
+
+
+# Tried in order; the cheapest strategy (a CoW clone) comes first
+COPY_BACKENDS: List[CopyBackend] = [
+    ReflinkBackend(),
+    CopyFileRangeBackend(),
+    SendfileBackend(),
+    CopyBackend(),
+]
+
+# Results of supports_reflink, by st_dev
+_reflink_support: Dict[int, bool] = {}
+
+
+def supports_reflink(path: str) -> bool:
+    """
+    Tell if files can be cloned within the filesystem path lives on.
+
+    Probed once per filesystem by cloning a one-byte unnamed temporary
+    file in path with ReflinkBackend.
+    """
+    backend = COPY_BACKENDS[0]
+    if not isinstance(backend, ReflinkBackend) or not backend.available():
+        return False
+    try:
+        dev = os.stat(path).st_dev
+    except OSError:
+        return False
+    if dev not in _reflink_support:
+        try:
+            with tempfile.TemporaryFile(dir=path) as fsrc, tempfile.TemporaryFile(
+                dir=path
+            ) as fdst:
+                fsrc.write(b"\0")
+                fsrc.flush()
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            _reflink_support[dev] = True
+        except OSError:
+            _reflink_support[dev] = False
+    return _reflink_support[dev]
+
+
+class _HashingReader:
+    """Wraps a source file so every chunk read is also fed to a hasher."""
+
+    def __init__(self, f: BinaryIO, hasher):
+        self._f = f
+        self._hasher = hasher
+
+    def readinto(self, buf) -> int:
+        n = self._f.readinto(buf)
+        if n:
+            self._hasher.update(memoryview(buf)[:n])
+        return n
+
+
+def is_sparse(st: os.stat_result) -> bool:
+    """Tell if a file has fewer blocks allocated than its size needs."""
+    blocks = getattr(st, "st_blocks", None)
+    return (
+        hasattr(os, "SEEK_DATA")
+        and blocks is not None
+        and blocks * 512 < st.st_size
+    )
+
+
+def allocated_size(st: os.stat_result) -> int:
+    """Return the disk space a copy of a file takes, leaving out holes."""
+    if is_sparse(st):
+        return st.st_blocks * 512
+    return st.st_size
+
+
+# fallocate(2) mode that reserves blocks without changing the file size
+_FALLOC_FL_KEEP_SIZE = 1
+
+# errno values meaning "this filesystem can't preallocate"
+_PREALLOCATE_UNSUPPORTED_ERRNOS = {errno.EOPNOTSUPP, errno.ENOSYS, errno.EINVAL}
+
+
+def preallocate(fd: int, offset: int, length: int) -> bool:
+    """
+    Reserve disk space for length bytes of fd from offset, ahead of writing.
+
+    On Linux fallocate(2) reserves the blocks without changing the file
+    size, so an interrupted copy still looks partial; elsewhere
+    os.posix_fallocate is used where available. Filesystems that can't
+    preallocate are left alone.
+
+    Returns:
+        True if the space was reserved
+
+    Raises:
+        OSError: If the filesystem has not enough free space (ENOSPC)
+    """
+    err = 0
+    if platform.system() == "Linux":
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            fallocate = getattr(libc, "fallocate64", None) or libc.fallocate
+            fallocate.argtypes = [
+                ctypes.c_int,
+                ctypes.c_int,
+                ctypes.c_int64,
+                ctypes.c_int64,
+            ]
+            if fallocate(fd, _FALLOC_FL_KEEP_SIZE, offset, length) == 0:
+                return True
+            err = ctypes.get_errno()
+        except (OSError, AttributeError):
+            return False
+    elif hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, offset, length)
+            return True
+        except OSError as e:
+            err = e.errno
+    else:
+        return False
+
+    if err not in _PREALLOCATE_UNSUPPORTED_ERRNOS:
+        raise OSError(err, os.strerror(err))
+    return False
+
+
+def data_extents(fd: int, start: int, end: int) -> Iterator[Tuple[int, int]]:
+    """
+    Yield the (start, end) ranges of fd between start and end holding data.
+
+    The gaps between them are holes. Filesystems without SEEK_DATA and
+    SEEK_HOLE support report the whole range as data.
+    """
+    pos = start
+    while pos < end:
+        try:
+            data = os.lseek(fd, pos, os.SEEK_DATA)
+            if data >= end:
+                return
+            hole = min(os.lseek(fd, data, os.SEEK_HOLE), end)
+        except OSError as e:
+            if e.errno == errno.ENXIO:
+                return  # only a hole is left
+            if e.errno != errno.EINVAL:
+                raise
+            data, hole = pos, end
+        yield data, hole
+        pos = hole
+
+
+def _copy_sparse(
+    backend: CopyBackend,
+    fsrc: BinaryIO,
+    fdst: BinaryIO,
+    reader: BinaryIO,
+    start: int,
+    size: int,
+    buffer_size: int,
+    progress: ProgressCallback,
+    skipped: ProgressCallback,
+) -> None:
+    """
+    Copy fsrc from start on with backend, leaving its holes unwritten.
+
+    Only the data ranges are read (through reader) and written; the
+    destination is seeked past holes and finally extended to size, so the
+    filesystem keeps them as holes. skipped is called with each hole size.
+    """
+    # Probe through a separate descriptor so the copy's file offset stays put
+    probe = os.open(fsrc.name, os.O_RDONLY)
+    try:
+        pos = start
+        for data_start, data_end in data_extents(probe, start, size):
+            if data_start > pos:
+                skipped(data_start - pos)
+            fsrc.seek(data_start)
+            fdst.seek(data_start)
+            backend.copy(reader, fdst, data_end - data_start, buffer_size, progress)
+            pos = data_end
+    finally:
+        os.close(probe)
+    if pos < size:
+        skipped(size - pos)
+    fdst.truncate(size)
+
+
+def copy_file(
+    src: str,
+    dst: str,
+    buffer_size: int = DEFAULT_BUFFER_MIB * 1024 * 1024,
+    progress: Optional[ProgressCallback] = None,
+    hasher=None,
+    offset: int = 0,
+    throttle: Optional[Callable[[int], None]] = None,
+    copy_metadata: bool = True,
+    fsync: bool = False,
+) -> str:
+    """
+    Copy file data and metadata like shutil.copy2, via COPY_BACKENDS.
+
+    Holes of sparse files are recreated as holes instead of written out,
+    unless a reflink clone shares them anyway. Files of at least
+    PREALLOCATE_THRESHOLD bytes have their space reserved before the data
+    is written. Usable as copy_function for shutil.copytree.
+
+    Args:
+        src: Source file
+        dst: Destination file or directory
+        buffer_size: Chunk size in bytes for chunked backends
+        progress: Called with the number of bytes copied by each chunk
+        hasher: If given, updated with the source data as it is copied;
+            only the userspace backend sees the data, so it is used alone
+        offset: Continue a partial copy: the first offset bytes of dst are
+            kept and only the rest of src is copied
+        throttle: Called with the size of every chunk of data actually
+            transferred (not for clones), e.g. TokenBucket.consume
+        copy_metadata: Copy times and permissions too; off when the caller
+            applies them later in bulk
+        fsync: Flush the destination to disk before returning
+
+    Returns:
+        The destination path
+    """
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+
+    backends = COPY_BACKENDS if hasher is None else COPY_BACKENDS[-1:]
+    with open(src, "rb") as fsrc, open(dst, "r+b" if offset else "wb") as fdst:
+        st = os.fstat(fsrc.fileno())
+        size = st.st_size
+        sparse = is_sparse(st)
+        offset = min(offset, size)
+        if offset and hasher is not None:
+            # The kept part of the copy still belongs in the checksum
+            remaining = offset
+            while remaining:
+                chunk = fsrc.read(min(buffer_size, remaining))
+                if not chunk:
+                    break
+                hasher.update(chunk)
+                remaining -= len(chunk)
+        fsrc.seek(offset)
+        fdst.seek(offset)
+        fdst.truncate()
+
+        reader = fsrc if hasher is None else _HashingReader(fsrc, hasher)
+        for backend in backends:
+            if not backend.available() or (offset and not backend.resumable):
+                continue
+            copied = 0
+
+            def report(n: int, backend: CopyBackend = backend) -> None:
+                nonlocal copied
+                copied += n
+                if throttle is not None and backend.moves_data:
+                    throttle(n)
+                if progress is not None:
+                    progress(n)
+
+            def skip_hole(n: int) -> None:
+                nonlocal copied
+                copied += n
+                if hasher is not None:
+                    # A hole reads back as zeros
+                    zeros = bytes(min(n, buffer_size))
+                    left = n
+                    while left > 0:
+                        hasher.update(zeros[: min(left, len(zeros))])
+                        left -= len(zeros)
+                if progress is not None:
+                    progress(n)
+
+            try:
+                if (
+                    backend.moves_data
+                    and not sparse
+                    and size - offset >= PREALLOCATE_THRESHOLD
+                ):
+                    # One contiguous reservation instead of growing per chunk
+                    fdst.flush()
+                    preallocate(fdst.fileno(), offset, size - offset)
+                if sparse and backend.resumable:
+                    _copy_sparse(
+                        backend,
+                        fsrc,
+                        fdst,
+                        reader,
+                        offset,
+                        size,
+                        buffer_size,
+                        report,
+                        skip_hole,
+                    )
+                else:
+                    backend.copy(reader, fdst, size - offset, buffer_size, report)
+                break
+            except CopyBackendUnsupported:
+                # Start over cleanly with the next backend
+                if copied and progress is not None:
+                    progress(-copied)
+                fsrc.seek(offset)
+                fdst.seek(offset)
+                fdst.truncate()
+        if fsync:
+            fdst.flush()
+            os.fsync(fdst.fileno())
+
+    if copy_metadata:
+        shutil.copystat(src, dst)
+    return dst
+
+
+def copy_small_files(
+    pairs: List[Tuple[str, str]],
+    progress: Optional[ProgressCallback] = None,
+    throttle: Optional[Callable[[int], None]] = None,
+    checksums: Optional[Dict[str, str]] = None,
+    checkpoint: Optional[Callable[[], None]] = None,
+    copy_metadata: bool = True,
+    fsync: bool = False,
+) -> None:
+    """
+    Copy a batch of small files with one read and one write per file.
+
+    All sources are read before any destination is written, so the reads
+    and writes of consecutive batches on different threads overlap, and
+    metadata is applied in a final pass once all data is written.
+
+    Args:
+        pairs: (source file, destination file) tuples
+        progress: Called with the size of each file once it is written
+        throttle: Called with the size of each file before it is written
+        checksums: If given, filled with the checksum of each source's data,
+            keyed by source path
+        checkpoint: Called before each file; an exception it raises (e.g.
+            TransferCancelled) aborts the batch
+        copy_metadata: Finish with the metadata pass; off when the caller
+            applies metadata later in bulk
+        fsync: Flush each destination to disk after writing it
+
+    Raises:
+        shutil.Error: With (src, dst, reason) tuples for files that failed,
+            after the rest of the batch has been copied
+        OSError: If a device went away; the batch is abandoned
+    """
+    errors: List[Tuple[str, str, str]] = []
+    contents: List[Tuple[str, str, bytes]] = []
+    for src, dst in pairs:
+        if checkpoint is not None:
+            checkpoint()
+        try:
+            with open(src, "rb") as f:
+                contents.append((src, dst, f.read()))
+        except OSError as e:
+            if is_device_gone(e):
+                raise
+            errors.append((src, dst, str(e)))
+
+    written = []
+    for src, dst, data in contents:
+        if checkpoint is not None:
+            checkpoint()
+        if throttle is not None:
+            throttle(len(data))
+        try:
+            with open(dst, "wb") as f:
+                f.write(data)
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+        except OSError as e:
+            if is_device_gone(e):
+                raise
+            errors.append((src, dst, str(e)))
+            continue
+        if checksums is not None:
+            hasher = _new_hasher()
+            hasher.update(data)
+            checksums[src] = hasher.hexdigest()
+        written.append((src, dst))
+        if progress is not None:
+            progress(len(data))
+    del contents
+
+    for src, dst in written if copy_metadata else ():
+        try:
+            shutil.copystat(src, dst)
+        except OSError as e:
+            errors.append((src, dst, str(e)))
+    if errors:
+        raise shutil.Error(errors)
+
+
+def parallel_copytree(
+    src: str,
+    dst: str,
+    copy_function: Callable[[str, str], Any],
+    workers: int = 1,
+    dirs_exist_ok: bool = False,
+    checkpoint: Optional[Callable[[], None]] = None,
+    batch_function: Optional[Callable[[List[Tuple[str, str]]], Any]] = None,
+    io_priority: str = IO_PRIORITY_NORMAL,
+) -> str:
+    """
+    Copy a folder tree like shutil.copytree, walking it in parallel.
+
+    Subdirectories are listed concurrently with os.scandir on WALK_WORKERS
+    threads, and every file found is handed straight to a pool of workers
+    copy threads, so copying starts before the walk is finished. Symlinks
+    are followed, as with copytree's default. Directory metadata is copied
+    last, deepest first.
+
+    With a batch_function, files below SMALL_FILE_THRESHOLD are collected
+    across directories into batches of up to SMALL_BATCH_FILES files or
+    SMALL_BATCH_BYTES bytes, each passed whole to one copy thread.
+
+    Args:
+        src: Folder to copy
+        dst: Folder to create
+        copy_function: Called with (source file, destination file)
+        workers: Number of files copied at the same time
+        dirs_exist_ok: Allow dst and its subfolders to exist already
+        checkpoint: Called before each directory, file and batch; an
+            exception it raises (e.g. TransferCancelled) aborts the copy and
+            is re-raised
+        batch_function: Called with a list of (source, destination) pairs
+            of small files; may raise shutil.Error for the files that failed
+        io_priority: I/O priority of the copy threads (IO_PRIORITY_*)
+
+    Returns:
+        dst
+
+    Raises:
+        shutil.Error: With (src, dst, reason) tuples for files and folders
+            that failed, after everything else has been copied
+    """
+    os.makedirs(dst, exist_ok=dirs_exist_ok)
+
+    errors: List[Tuple[str, str, str]] = []
+    dir_pairs: List[Tuple[str, str]] = [(src, dst)]
+    abort: List[BaseException] = []
+    lock = threading.Lock()
+    idle = threading.Condition(lock)
+    outstanding = 0  # directories, files and batches not finished yet
+    copy_slots = threading.BoundedSemaphore(MAX_QUEUED_COPIES)
+    batch: List[Tuple[str, str]] = []  # small files not submitted yet
+    batch_bytes = 0
+
+    def task(func: Callable[..., None], *args: Any) -> None:
+        """Run a scan or copy unless aborted, then mark it finished."""
+        nonlocal outstanding
+        try:
+            if not abort:
+                if checkpoint is not None:
+                    checkpoint()
+                func(*args)
+        except BaseException as e:
+            with lock:
+                abort.append(e)
+        finally:
+            if func is not scan:
+                copy_slots.release()
+            with idle:
+                outstanding -= 1
+                if outstanding == 0:
+                    idle.notify_all()
+
+    def copy_one(src_file: str, dst_file: str) -> None:
+        try:
+            copy_function(src_file, dst_file)
+        except OSError as e:
+            with lock:
+                errors.append((src_file, dst_file, str(e)))
+
+    def copy_batch(pairs: List[Tuple[str, str]]) -> None:
+        try:
+            batch_function(pairs)
+        except shutil.Error as e:
+            with lock:
+                errors.extend(e.args[0])
+        except OSError as e:
+            with lock:
+                errors.extend((s, d, str(e)) for s, d in pairs)
+
+    def submit_copy(func: Callable[..., None], *args: Any) -> None:
+        nonlocal outstanding
+        # Blocks while too many copies wait, so the walk can't run away
+        copy_slots.acquire()
+        with lock:
+            outstanding += 1
+        copy_pool.submit(task, func, *args)
+
+    def scan(src_dir: str, dst_dir: str) -> None:
+        nonlocal outstanding, batch, batch_bytes
+        try:
+            with os.scandir(src_dir) as it:
+                entries = list(it)
+        except OSError as e:
+            with lock:
+                errors.append((src_dir, dst_dir, str(e)))
+            return
+
+        # Create all subfolders before any of this folder's files are queued
+        files = []
+        for entry in entries:
+            dst_path = os.path.join(dst_dir, entry.name)
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if not is_dir:
+                files.append((entry, dst_path))
+                continue
+            try:
+                os.makedirs(dst_path, exist_ok=dirs_exist_ok)
+            except OSError as e:
+                with lock:
+                    errors.append((entry.path, dst_path, str(e)))
+                continue
+            with lock:
+                dir_pairs.append((entry.path, dst_path))
+                outstanding += 1
+            walk_pool.submit(task, scan, entry.path, dst_path)
+
+        for entry, dst_path in files:
+            if abort:
+                return
+            size = SMALL_FILE_THRESHOLD
+            if batch_function is not None:
+                try:
+                    size = entry.stat().st_size
+                except OSError:
+                    pass  # copy_function reports the error
+            if size >= SMALL_FILE_THRESHOLD:
+                submit_copy(copy_one, entry.path, dst_path)
+                continue
+            with lock:
+                batch.append((entry.path, dst_path))
+                batch_bytes += size
+                if len(batch) < SMALL_BATCH_FILES and batch_bytes < SMALL_BATCH_BYTES:
+                    continue
+                full, batch, batch_bytes = batch, [], 0
+            submit_copy(copy_batch, full)
+
+    with ThreadPoolExecutor(max_workers=WALK_WORKERS) as walk_pool:
+        with ThreadPoolExecutor(
+            max_workers=max(1, workers),
+            initializer=set_thread_io_priority,
+            initargs=(io_priority,),
+        ) as copy_pool:
+            with lock:
+                outstanding += 1
+            walk_pool.submit(task, scan, src, dst)
+            with idle:
+                while True:
+                    while outstanding:
+                        idle.wait()
+                    if abort or not batch:
+                        break
+                    # The walk is done; copy the last, partly filled batch
+                    copy_slots.acquire()
+                    outstanding += 1
+                    copy_pool.submit(task, copy_batch, batch)
+                    batch = []
+
+    if abort:
+        raise abort[0]
+
+    for src_dir, dst_dir in sorted(dir_pairs, key=lambda p: -p[1].count(os.sep)):
+        try:
+            shutil.copystat(src_dir, dst_dir)
+        except OSError as e:
+            errors.append((src_dir, dst_dir, str(e)))
+    if errors:
+        raise shutil.Error(errors)
+    return dst
+
+
+# ---------- Transfer engine ----------
+
+
+class TransferCancelled(Exception):
+    """Raised inside a transfer once its job has been cancelled."""
+
+    # Files a merge had already written in place, which cannot be rolled back
+    files_written = 0
+
+
+class TransferJournal:
+    """
+    Append-only JSON Lines record of one drop, used to resume it after a crash.
+
+    The first line describes the job. Every later line is an event: a
+    folder copy being staged, a checkpoint of a large file's progress, an
+    item whose data is completely copied (only deleting its move source is
+    left) and an item that is done. The file is removed once the drop has
+    finished; load() replays the events of an interrupted one.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.staged: Dict[str, str] = {}  # dropped folder -> staging folder
+        self.partial: Dict[str, Tuple[str, int]] = {}  # src file -> (copy, offset)
+        self.copied: Dict[str, str] = {}  # dropped path -> target
+        self.done: Dict[str, Tuple[str, str]] = {}  # dropped path -> (target, result)
+        self._file = None
+        self._lock = threading.Lock()
+
+    def open(self, header: Dict[str, Any]) -> None:
+        """Start recording; the header is only written to a new journal."""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            is_new = not os.path.exists(self.path)
+            self._file = open(self.path, "a", encoding="utf-8")
+            if is_new:
+                self._file.write(json.dumps(header) + "\n")
+                self._file.flush()
+        except OSError as e:
+            print(f"Error opening transfer journal: {e}")
+
+    def record(self, event: str, **fields: Any) -> None:
+        """Append an event and hand it to the OS right away."""
+        with self._lock:
+            if self._file is None:
+                return
+            try:
+                self._file.write(json.dumps({"event": event, **fields}) + "\n")
+                self._file.flush()
+            except (OSError, ValueError) as e:
+                print(f"Error writing transfer journal: {e}")
+                self._file = None
+
+    def close(self, remove: bool) -> None:
+        """Stop recording; remove the journal if the drop has finished."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        if remove:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Error removing transfer journal: {e}")
+
+    def kept_paths(self) -> set:
+        """
+        Return the staging paths this journal needs to resume.
+
+        Targets of copied items are included too: until their rename is on
+        disk, a crash can leave the finished copy under its staging name.
+        """
+        return (
+            set(self.staged.values())
+            | {p for p, _ in self.partial.values()}
+            | set(self.copied.values())
+        )
+
+    @classmethod
+    def load(cls, path: str) -> Tuple[Dict[str, Any], "TransferJournal"]:
+        """
+        Read a journal back.
+
+        Returns:
+            Tuple of (header, journal with the replayed state)
+
+        Raises:
+            OSError, ValueError: If the journal cannot be read
+        """
+        journal = cls(path)
+        with open(path, "r", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # torn final line
+                event = record.get("event")
+                if event == "staged":
+                    journal.staged[record["item"]] = record["path"]
+                elif event == "progress":
+                    journal.partial[record["file"]] = (
+                        record["path"],
+                        record["offset"],
+                    )
+                elif event == "copied":
+                    journal.copied[record["item"]] = record["target"]
+                elif event == "done":
+                    journal.done[record["item"]] = (record["target"], record["result"])
+        return header, journal
+
+
+class TransferJob:
+    """A single drop queued for the transfer engine."""
+
+    def __init__(
+        self,
+        tab_id: str,
+        tab_name: str,
+        mode: str,
+        src_paths: List[str],
+        dest_root: str,
+        settings: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Args:
+            settings: Transfer options as stored in the tab config; a
+                snapshot is taken so later edits don't affect this job
+        """
+        settings = dict(settings or {})
+        normalize_transfer_settings(settings)
+
+        self.id = str(uuid.uuid4())
+        self.settings = settings
+        self.tab_id = tab_id
+        self.tab_name = tab_name
+        self.mode = mode
+        self.src_paths = list(src_paths)
+        self.dest_root = dest_root
+        self.concurrency = settings["concurrency"]
+        self.buffer_size = settings["buffer_size_mib"] * 1024 * 1024
+        self.replace_strategy = settings["replace_strategy"]
+        self.prune_extras = settings["prune_extras"]
+        self.compare = settings["compare"]
+        self.verify = settings["verify"]
+        self.io_priority = settings["io_priority"]
+        self.priority = settings["priority"]
+        self.durability = settings["durability"]
+        self.device = ""  # set by the engine when queued
+        self.seq = 0
+        self.started = False
+        # One bucket per drop, shared by its parallel copies
+        limit = settings["bandwidth_limit_mbps"]
+        self.throttle = TokenBucket(limit * 1000 * 1000).consume if limit else None
+        self.successes = 0
+        self.failures = 0
+        self.failure_messages: List[str] = []
+        self.items_done = 0
+        # Files left updated by a merge that was cancelled halfway
+        self.merged_on_cancel = 0
+
+        # Byte progress, updated from worker threads under self.lock
+        self.lock = threading.Lock()
+        self.total_bytes = 0
+        self.bytes_done = 0
+        # Of bytes_done, those really written rather than skipped or failed
+        self.bytes_written = 0
+        self.current_file = ""
+        self.current_file_size = 0
+        self.current_file_done = 0
+
+        # Set by the preview or the engine's planning pass before anything
+        # is copied
+        self.plan: Optional["TransferPlan"] = None
+
+        # Smoothed copy rate in bytes/s for the ETA, updated under self.lock
+        self.rate = 0.0
+        self._rate_sample: Optional[Tuple[float, int]] = None
+
+        # Verified source file -> checksum, and dropped path -> checksum
+        self.file_checksums: Dict[str, str] = {}
+        self.checksums: Dict[str, str] = {}
+
+        # Source file -> (stat signature, fast_file_hash) for COMPARE_HASH, so
+        # the copy reuses what planning hashed
+        self.source_hashes: Dict[str, Tuple[Tuple[int, int, int], str]] = {}
+
+        self.journal = TransferJournal(
+            os.path.join(TRANSFER_JOURNAL_DIR, f"{self.id}.jsonl")
+        )
+        self.interrupted = False
+
+        # Pause/cancel requests from the GUI, honoured between chunks
+        self._running = threading.Event()
+        self._running.set()
+        self._cancelled = threading.Event()
+        self.keep_partial = False
+
+    @property
+    def paused(self) -> bool:
+        return not self._running.is_set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def pause(self) -> None:
+        """Hold the transfer at its next chunk boundary."""
+        if not self.cancelled:
+            self._running.clear()
+            self._rate_sample = None
+
+    def resume(self) -> None:
+        """Continue a paused transfer."""
+        self._rate_sample = None  # the pause says nothing about the rate
+        self._running.set()
+
+    def cancel(self, keep_partial: bool = False) -> None:
+        """
+        Stop the transfer at its next chunk boundary.
+
+        Args:
+            keep_partial: Keep the partly copied item and the journal so the
+                drop can be resumed later, instead of rolling the item back
+        """
+        self.keep_partial = keep_partial
+        self._cancelled.set()
+        self._running.set()
+
+    def checkpoint(self) -> None:
+        """
+        Block while the job is paused.
+
+        Raises:
+            TransferCancelled: If the job has been cancelled
+        """
+        if not self._running.is_set():
+            self._running.wait()
+        if self._cancelled.is_set():
+            raise TransferCancelled()
+
+    def update_rate(self, now: float) -> None:
+        """Fold the bytes written since the last call into the smoothed rate."""
+        sample = self._rate_sample
+        self._rate_sample = (now, self.bytes_written)
+        if sample is None or now <= sample[0]:
+            return
+        elapsed = now - sample[0]
+        current = (self.bytes_written - sample[1]) / elapsed
+        if not self.rate:
+            self.rate = current
+        else:
+            weight = 1 - math.exp(-elapsed / ETA_SMOOTHING)
+            self.rate += weight * (current - self.rate)
+
+    def eta(self) -> Optional[float]:
+        """Return the estimated seconds left, or None while no rate is known."""
+        with self.lock:
+            remaining = self.total_bytes - self.bytes_done
+            rate = self.rate
+        if rate <= 0:
+            return None
+        return max(0.0, remaining / rate)
+
+    def header(self) -> Dict[str, Any]:
+        """Return the description of this job stored atop its journal."""
+        return {
+            "id": self.id,
+            "tab_id": self.tab_id,
+            "tab_name": self.tab_name,
+            "mode": self.mode,
+            "src_paths": self.src_paths,
+            "dest_root": self.dest_root,
+            "settings": {
+                key: self.settings[key] for key in default_transfer_settings()
+            },
+        }
+
+    @classmethod
+    def from_journal(cls, path: str) -> "TransferJob":
+        """
+        Recreate an interrupted job from its journal, ready to resume.
+
+        Raises:
+            OSError, ValueError, KeyError: If the journal is unusable
+        """
+        header, journal = TransferJournal.load(path)
+        job = cls(
+            header["tab_id"],
+            header["tab_name"],
+            header["mode"],
+            header["src_paths"],
+            header["dest_root"],
+            settings=header.get("settings"),
+        )
+        job.id = header["id"]
+        job.journal = journal
+        return job
+
+
+class TransferPlan:
+    """
+    What a drop is going to do, worked out before anything is written.
+
+    items holds one dict per dropped path with its source, target, PLAN_*
+    action, the number of files and bytes to write, the disk space they
+    take (none when they are reflink clones), and the number of files left
+    as they are.
+    """
+
+    def __init__(self, dest_root: str):
+        self.dest_root = dest_root
+        self.items: List[Dict[str, Any]] = []
+        self.free_space: Optional[int] = None
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(item["bytes"] for item in self.items)
+
+    @property
+    def file_count(self) -> int:
+        return sum(item["files"] for item in self.items)
+
+    @property
+    def space_needed(self) -> int:
+        return sum(item["space"] for item in self.items)
+
+    def shortage(self) -> str:
+        """Return an error message if the drop does not fit, otherwise ""."""
+        if self.free_space is None or self.space_needed <= self.free_space:
+            return ""
+        return (
+            f"Not enough free space on '{self.dest_root}': the drop needs "
+            f"{format_size(self.space_needed)}, "
+            f"{format_size(self.free_space)} available"
+        )
+
+    def summary(self) -> str:
+        """Describe the plan in one line, e.g. for the status bar."""
+        counts = Counter(item["action"] for item in self.items)
+        unchanged = sum(item["unchanged"] for item in self.items)
+        text = f"{self.file_count} file(s), {format_size(self.total_bytes)} to copy"
+        if counts[PLAN_RENAME]:
+            text += f", {counts[PLAN_RENAME]} item(s) moved by rename"
+        if counts[PLAN_SKIP] or unchanged:
+            text += f", {counts[PLAN_SKIP] + unchanged} already present"
+        if counts[PLAN_MISSING]:
+            text += f", {counts[PLAN_MISSING]} missing"
+        return text
+
+
+def plan_transfer(
+    job: TransferJob,
+    src_paths: Optional[List[str]] = None,
+    dst_hash: Optional[Callable[[str, os.stat_result], str]] = None,
+    src_hash: Optional[Callable[[str, os.stat_result], str]] = None,
+) -> TransferPlan:
+    """
+    Work out what a drop will do, without writing anything.
+
+    Each dropped path gets the action TransferEngine._transfer_item will
+    take. Folders are scanned with os.scandir on WALK_WORKERS threads, their
+    subfolders in parallel, counting the files and bytes to write; for a
+    merge, files already current by the job's comparison are left out.
+
+    Args:
+        job: The drop to plan
+        src_paths: Dropped paths to plan, by default all of the job's
+        dst_hash: Destination hash function for COMPARE_HASH
+        src_hash: Source hash function for COMPARE_HASH
+
+    Raises:
+        TransferCancelled: If the job is cancelled while planning
+    """
+    is_move = job.mode in (OP_MOVE_REPLACE, OP_MOVE_NEW)
+    new_only = job.mode in (OP_COPY_NEW, OP_MOVE_NEW)
+    plan = TransferPlan(job.dest_root)
+    lock = threading.Lock()
+    pending: List[Future] = []
+
+    def count(item: Dict[str, Any], st: os.stat_result, rename: bool) -> None:
+        with lock:
+            item["files"] += 1
+            if not rename:
+                item["bytes"] += st.st_size
+                if not item["clone"]:
+                    item["space"] += allocated_size(st)
+
+    def scan(
+        item: Dict[str, Any],
+        src_dir: str,
+        dst_dir: Optional[str],
+        strength: str,
+        rename: bool,
+    ) -> None:
+        job.checkpoint()
+        try:
+            with os.scandir(src_dir) as it:
+                entries = list(it)
+        except OSError:
+            return  # reported when the folder is copied
+        for entry in entries:
+            dst_path = None if dst_dir is None else os.path.join(dst_dir, entry.name)
+            try:
+                if entry.is_dir():
+                    if new_only and dst_path and kind_conflict(dst_path, True):
+                        with lock:
+                            item["unchanged"] += 1
+                    else:
+                        submit(scan, item, entry.path, dst_path, strength, rename)
+                    continue
+                st = entry.stat()
+            except OSError:
+                continue
+            if dst_path is None:
+                current = False
+            elif os.path.isdir(dst_path):
+                current = new_only  # as _merge_tree treats a folder in the way
+            else:
+                current = file_is_current(
+                    entry.path, st, dst_path, strength, dst_hash, src_hash
+                )
+            if current:
+                with lock:
+                    item["unchanged"] += 1
+            else:
+                count(item, st, rename)
+
+    def submit(func: Callable[..., None], *args: Any) -> None:
+        with lock:
+            pending.append(pool.submit(func, *args))
+
+    with ThreadPoolExecutor(max_workers=WALK_WORKERS) as pool:
+        for src in job.src_paths if src_paths is None else src_paths:
+            name = os.path.basename(src.rstrip(os.sep))
+            target = os.path.join(job.dest_root, name)
+            item = {
+                "src": src,
+                "target": target,
+                "action": PLAN_COPY,
+                "files": 0,
+                "bytes": 0,
+                "space": 0,
+                "unchanged": 0,
+                "clone": False,
+            }
+            plan.items.append(item)
+            if not os.path.exists(src):
+                item["action"] = PLAN_MISSING
+                continue
+
+            # Same-filesystem copies are reflink clones taking no space, unless
+            # verify hashes the data through userspace
+            item["clone"] = (
+                not job.verify
+                and same_device(src, job.dest_root)
+                and supports_reflink(job.dest_root)
+            )
+
+            exists = os.path.exists(target)
+            is_tree = os.path.isdir(src) and os.path.isdir(target)
+            rename = is_move and same_device(src, job.dest_root)
+            merging = is_tree and (new_only or job.replace_strategy == REPLACE_MERGE)
+            if merging:
+                strength = job.compare
+                if not new_only and strength == COMPARE_NAME:
+                    strength = COMPARE_SIZE_MTIME  # as _transfer_item merges
+                item["action"] = PLAN_MERGE
+                submit(scan, item, src, target, strength, rename)
+                continue
+            if new_only and kind_conflict(target, os.path.isdir(src)):
+                item["action"] = PLAN_SKIP
+                item["unchanged"] = 1
+                continue
+            if rename:
+                item["action"] = PLAN_RENAME
+                continue
+            if exists:
+                item["action"] = PLAN_REPLACE
+            if os.path.isdir(src):
+                submit(scan, item, src, None, job.compare, False)
+                continue
+            st = os.stat(src)
+            if new_only and exists and file_is_current(
+                src, st, target, job.compare, dst_hash, src_hash
+            ):
+                item["action"] = PLAN_SKIP
+                item["unchanged"] = 1
+            else:
+                count(item, st, False)
+
+        # Scans add their subfolders before they finish, so this sees them all
+        try:
+            while True:
+                with lock:
+                    if not pending:
+                        break
+                    future = pending.pop()
+                future.result()
+        except BaseException:
+            with lock:
+                for future in pending:
+                    future.cancel()
+            raise
+
+    try:
+        plan.free_space = shutil.disk_usage(job.dest_root).free
+    except OSError:
+        pass  # the items report the problem themselves
+    return plan
+
+
+class TransferEngine(QThread):
+    """
+    Scheduler that runs queued drops off the GUI thread.
+
+    Every drop goes through one shared queue. The scheduler thread starts
+    the highest-priority waiting drop whose destination disk has a free
+    slot, so drops onto different disks run side by side while drops onto
+    the same disk are limited to jobs_per_device at a time. Among equal
+    priorities the tab that started a drop least recently goes first.
+    Each started drop runs on its own worker thread. Results are reported
+    through signals, so slots connected from the GUI thread run there and
+    may touch widgets and the configuration freely.
+    """
+
+    job_started = Signal(object)  # job
+    item_finished = Signal(object, str, str, str)  # job, src, target, result
+    job_progress = Signal(object, int, int)  # job, done, total
+    bytes_progress = Signal(object)  # job (read its byte counters)
+    job_finished = Signal(object)  # job
+    queue_changed = Signal()
+
+    def __init__(self, parent=None, fingerprints: Optional[FingerprintCache] = None):
+        super().__init__(parent)
+        self.fingerprints = fingerprints
+        self.jobs_per_device = DEFAULT_JOBS_PER_DEVICE
+        self.max_parallel_jobs = MAX_PARALLEL_JOBS
+        # Staging paths of queued resumed jobs, spared by the stale cleanup
+        self._kept_staging: Dict[str, set] = {}
+        self._queue: List[TransferJob] = []
+        self._running: Dict[str, TransferJob] = {}
+        self._workers: Dict[str, threading.Thread] = {}
+        self._last_started: Dict[str, float] = {}
+        # Last smoothed copy rate per destination disk, to seed new ETAs
+        self._measured_rates: Dict[str, float] = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._stop_requested = threading.Event()
+
+    def submit(self, job: TransferJob) -> None:
+        """Queue a job and start the scheduler thread if needed."""
+        job.journal.open(job.header())
+        job.device = destination_device(job.dest_root)
+        with self._wakeup:
+            job.seq = next(self._seq)
+            self._queue.append(job)
+            self._kept_staging[job.id] = job.journal.kept_paths()
+            self._wakeup.notify()
+        if not self.isRunning():
+            self.start()
+        self.queue_changed.emit()
+
+    def jobs(self) -> List[TransferJob]:
+        """Return running jobs, then waiting ones in the order they would start."""
+        with self._lock:
+            waiting = sorted(self._queue, key=self._schedule_key)
+            return list(self._running.values()) + waiting
+
+    def set_priority(self, job: TransferJob, priority: int) -> None:
+        """Change the priority of a waiting job."""
+        with self._wakeup:
+            job.priority = priority
+            self._wakeup.notify()
+        self.queue_changed.emit()
+
+    def reschedule(self) -> None:
+        """Re-check the queue, e.g. after a waiting job was paused or resumed."""
+        with self._wakeup:
+            self._wakeup.notify()
+        self.queue_changed.emit()
+
+    def is_stopping(self) -> bool:
+        """Return True once stop() has been called."""
+        return self._stop_requested.is_set()
+
+    def pending_count(self) -> int:
+        """Return the number of queued or running jobs."""
+        with self._lock:
+            return len(self._queue) + len(self._running)
+
+    def plan(
+        self, job: TransferJob, src_paths: Optional[List[str]] = None
+    ) -> TransferPlan:
+        """Plan a drop, comparing with the fingerprint cache as its copy will."""
+        return plan_transfer(
+            job, src_paths, self._dest_hasher(job), self._source_hasher(job)
+        )
+
+    def measured_rate(self, dest_root: str) -> float:
+        """Return the copy rate last measured onto dest_root's disk, or 0."""
+        with self._lock:
+            return self._measured_rates.get(destination_device(dest_root), 0.0)
+
+    def stop(self) -> None:
+        """
+        Discard queued jobs and stop the running ones at their next chunk.
+
+        Journals and partial copies of unfinished jobs are kept so they can
+        be resumed.
+        """
+        self._stop_requested.set()
+        with self._wakeup:
+            waiting, self._queue = self._queue, []
+            running = list(self._running.values())
+            self._wakeup.notify()
+        for job in waiting:
+            job.journal.close(remove=False)
+        for job in running:
+            job.cancel(keep_partial=True)
+        if self.isRunning():
+            self.wait()
+        for worker in list(self._workers.values()):
+            worker.join()
+
+    def _schedule_key(self, job: TransferJob) -> Tuple[int, float, int]:
+        return (-job.priority, self._last_started.get(job.tab_id, 0.0), job.seq)
+
+    def _next_job(self) -> Optional[TransferJob]:
+        """Pick the job to start now, if any; called with the lock held."""
+        if len(self._running) >= self.max_parallel_jobs:
+            return None
+        busy = Counter(job.device for job in self._running.values())
+        ready = [
+            job
+            for job in self._queue
+            if not job.paused and busy[job.device] < self.jobs_per_device
+        ]
+        return min(ready, key=self._schedule_key) if ready else None
+
+    def run(self) -> None:
+        """Scheduler loop: start jobs as slots free up, until stopped."""
+        while True:
+            with self._wakeup:
+                while True:
+                    if self._stop_requested.is_set():
+                        if not self._running:
+                            return
+                        job = None
+                    else:
+                        job = self._next_job()
+                    if job is not None:
+                        break
+                    self._wakeup.wait()
+                self._queue.remove(job)
+                self._running[job.id] = job
+                self._last_started[job.tab_id] = time.monotonic()
+                job.started = True
+
+            worker = threading.Thread(
+                target=self._run_worker,
+                args=(job,),
+                name=f"transfer-{job.tab_name}",
+                daemon=True,
+            )
+            self._workers[job.id] = worker
+            worker.start()
+            self.queue_changed.emit()
+
+    def _run_worker(self, job: TransferJob) -> None:
+        """Run one job on its own thread and release its slot afterwards."""
+        if self._stop_requested.is_set():
+            job.cancel(keep_partial=True)
+        self.job_started.emit(job)
+        set_thread_io_priority(job.io_priority)
+        try:
+            self._run_job(job)
+            if job.durability == DURABILITY_SYNCFS:
+                # One flush for the whole drop instead of one per file
+                sync_filesystem(job.dest_root)
+        finally:
+            job.journal.close(remove=not job.interrupted)
+            with job.lock:
+                job.source_hashes.clear()
+            with self._wakeup:
+                if job.rate > 0:
+                    self._measured_rates[job.device] = job.rate
+                self._running.pop(job.id, None)
+                self._kept_staging.pop(job.id, None)
+                self._wakeup.notify()
+            self.job_finished.emit(job)
+            self.queue_changed.emit()
+            self._workers.pop(job.id, None)
+
+    def _run_job(self, job: TransferJob) -> None:
+        """
+        Transfer every dropped path of a job and report each result.
+
+        With a concurrency above one the items are spread over a bounded
+        thread pool; results are reported in completion order.
+        """
+        # Items finished before an interruption are not redone
+        src_paths = [src for src in job.src_paths if src not in job.journal.done]
+        total = len(src_paths)
+        done = 0
+        last_emit = 0.0
+
+        self._clean_staging(job, job.dest_root)
+
+        # Size the progress bar by what will really be written; a plan
+        # confirmed in the preview still holds unless this is a resume
+        if job.plan is None or job.journal.done or job.journal.copied:
+            try:
+                job.plan = self.plan(
+                    job, [src for src in src_paths if src not in job.journal.copied]
+                )
+            except TransferCancelled:
+                # Nothing started: left for a resume, or dropped with the job
+                if job.keep_partial:
+                    job.interrupted = True
+                return
+        item_sizes = {item["src"]: item["bytes"] for item in job.plan.items}
+        with job.lock:
+            job.total_bytes = job.plan.total_bytes
+            # Start the ETA from the last drop onto this disk
+            job.rate = self._measured_rates.get(job.device, 0.0)
+        self.bytes_progress.emit(job)
+
+        # Fail up front rather than halfway with a full disk
+        shortage = job.plan.shortage()
+        if shortage:
+            with job.lock:
+                job.failures = total
+                job.failure_messages.append(shortage)
+                job.items_done = total
+            for src in src_paths:
+                self.item_finished.emit(job, src, "", f"failed: {shortage}")
+            self.job_progress.emit(job, total, total)
+            return
+
+        def add_bytes(n: int, written: bool = True) -> None:
+            nonlocal last_emit
+            with job.lock:
+                job.bytes_done += n
+                if written:
+                    job.bytes_written += n
+                now = time.monotonic()
+                if now - last_emit < PROGRESS_INTERVAL:
+                    return
+                last_emit = now
+                job.update_rate(now)
+            self.bytes_progress.emit(job)
+
+        def run_item(src: str) -> None:
+            nonlocal done
+            try:
+                job.checkpoint()
+            except TransferCancelled:
+                # Not started: left for a resume, or dropped with the job
+                if job.keep_partial:
+                    job.interrupted = True
+                return
+
+            target = ""
+            failure = None
+            copied = 0
+
+            def on_bytes(n: int) -> None:
+                nonlocal copied
+                copied += n
+                add_bytes(n)
+
+            if src in job.journal.copied:
+                # Copied before an interruption; only removing the source was left
+                target, result = job.journal.copied[src], "success"
+                staged = job.journal.staged.get(src)
+                try:
+                    if staged and os.path.isdir(staged) and not os.path.lexists(target):
+                        # The rename into place did not reach the disk
+                        swap_into_place(staged, target)
+                    if os.path.lexists(src):
+                        remove_path(src)
+                except OSError as e:
+                    failure = f"Failed to finish moving '{src}': {e}"
+                    result = f"failed: {e}"
+            elif not os.path.exists(src):
+                failure = f"Source does not exist: {src}"
+                result = f"failed: {failure}"
+            else:
+                try:
+                    target, result = self._transfer_item(job, src, on_bytes)
+                    if job.verify:
+                        self._record_item_checksum(job, src)
+                except TransferCancelled as e:
+                    if e.files_written:
+                        # Merged files are written in place, not staged
+                        result = f"cancelled ({e.files_written} file(s) already merged)"
+                        with job.lock:
+                            job.merged_on_cancel += e.files_written
+                    elif job.keep_partial:
+                        result = "cancelled (kept for resume)"
+                    else:
+                        result = "cancelled (rolled back)"
+                except Exception as e:
+                    failure = f"Failed to {job.mode} '{src}': {e}"
+                    result = f"failed: {e}"
+
+            # Failures count as done for the progress bar, but not for the rate
+            add_bytes(max(0, item_sizes.get(src, 0) - copied), written=False)
+
+            if failure is None and not result.startswith("cancelled"):
+                job.journal.record("done", item=src, target=target, result=result)
+
+            with job.lock:
+                if failure is not None:
+                    job.failures += 1
+                    job.failure_messages.append(failure)
+                elif result.startswith("success"):
+                    job.successes += 1
+                done += 1
+                finished = job.items_done = done
+
+            self.item_finished.emit(job, src, target, result)
+            self.job_progress.emit(job, finished, total)
+
+        if job.concurrency <= 1 or total <= 1:
+            for src in src_paths:
+                run_item(src)
+            return
+
+        workers = min(job.concurrency, total)
+        with ThreadPoolExecutor(
+            max_workers=workers,
+            initializer=set_thread_io_priority,
+            initargs=(job.io_priority,),
+        ) as pool:
+            # Drain the iterator so worker exceptions are not swallowed
+            list(pool.map(run_item, src_paths))
+
+    def _copy_file(
+        self,
+        job: TransferJob,
+        src: str,
+        dst: str,
+        on_bytes: ProgressCallback,
+        stage: bool = True,
+        resume: bool = False,
+        deferred: Optional[List[Tuple[str, str, Optional[str]]]] = None,
+    ) -> str:
+        """
+        Copy one file for a job, tracking it as the job's current file.
+
+        With stage the data is written to a temporary name next to dst and
+        renamed over it once complete (and verified); without, dst is
+        written directly, for files inside an already staged folder.
+        Partial copies recorded in the job's journal are continued from
+        their last checkpoint. With resume, a dst that is already complete
+        from an interrupted run is kept. With a deferred list, metadata is
+        not copied; (src, dst, checksum) is appended for _apply_metadata.
+
+        Raises:
+            TransferCancelled: If the job is cancelled; the partial copy is
+                removed, or kept and journaled when the job keeps partials
+        """
+        job.checkpoint()
+        size = os.path.getsize(src)
+        if resume and self._already_copied(job, src, dst, on_bytes):
+            return dst
+
+        if self.fingerprints is not None:
+            self.fingerprints.forget(job.dest_root, dst)
+        with job.lock:
+            job.current_file = src
+            job.current_file_size = size
+            job.current_file_done = 0
+
+        written = staging_path(dst) if stage else dst
+        offset = 0
+        partial = job.journal.partial.get(src)
+        if partial and os.path.isfile(partial[0]):
+            if partial[0] == dst or (
+                stage and os.path.dirname(partial[0]) == os.path.dirname(dst)
+            ):
+                written = partial[0]
+                offset = min(partial[1], os.path.getsize(written))
+
+        copied = offset
+        checkpoint = offset + JOURNAL_CHECKPOINT_BYTES
+
+        def progress(n: int) -> None:
+            nonlocal copied, checkpoint
+            if job.current_file == src:
+                job.current_file_done += n
+            on_bytes(n)
+            copied += n
+            job.checkpoint()
+            if copied >= checkpoint:
+                job.journal.record("progress", file=src, path=written, offset=copied)
+                checkpoint = copied + JOURNAL_CHECKPOINT_BYTES
+
+        if offset:
+            with job.lock:
+                job.current_file_done = offset
+            on_bytes(offset)
+        try:
+            # With verify, hash the source during the copy and read it back
+            hasher = _new_hasher() if job.verify else None
+            copy_file(
+                src,
+                written,
+                job.buffer_size,
+                progress,
+                hasher,
+                offset,
+                job.throttle,
+                copy_metadata=deferred is None,
+                fsync=job.durability == DURABILITY_FSYNC,
+            )
+            if hasher is not None:
+                expected = hasher.hexdigest()
+                actual = file_checksum(written, job.buffer_size)
+                if actual != expected:
+                    raise ChecksumMismatch(
+                        errno.EIO,
+                        f"checksum mismatch after copy ({CHECKSUM_ALGORITHM})",
+                        dst,
+                    )
+            if stage:
+                swap_into_place(written, dst)
+                if job.durability == DURABILITY_FSYNC:
+                    fsync_directory(os.path.dirname(dst))
+        except BaseException as e:
+            cancelled = isinstance(e, TransferCancelled)
+            if is_device_gone(e) or (cancelled and job.keep_partial):
+                # Keep the partial copy and the journal to resume later
+                job.interrupted = True
+                if copied > offset:
+                    job.journal.record(
+                        "progress", file=src, path=written, offset=copied
+                    )
+            elif stage and os.path.lexists(written):
+                os.remove(written)
+            raise
+
+        checksum = None
+        if job.verify:
+            checksum = actual
+            with job.lock:
+                job.file_checksums[src] = actual
+        if deferred is not None:
+            deferred.append((src, dst, checksum))
+        elif checksum is not None:
+            self._record_fingerprint(job, dst, checksum)
+        return dst
+
+    def _record_fingerprint(self, job: TransferJob, dst: str, checksum: str) -> None:
+        """Remember the verified checksum of a finished copy."""
+        if self.fingerprints is not None:
+            self.fingerprints.digest(
+                job.dest_root,
+                dst,
+                os.stat(dst),
+                CHECKSUM_ALGORITHM,
+                lambda _path: checksum,
+            )
+
+    def _apply_metadata(
+        self, job: TransferJob, deferred: List[Tuple[str, str, Optional[str]]]
+    ) -> List[Tuple[str, str, str]]:
+        """
+        Copy times and permissions onto files written without them.
+
+        Runs once per folder after its data is in, instead of once per file.
+        Verified files enter the fingerprint cache only now, since the
+        cached signature includes the final modification time.
+
+        Returns:
+            (src, dst, reason) tuples for files whose metadata failed
+        """
+        errors = []
+        for src, dst, checksum in deferred:
+            try:
+                shutil.copystat(src, dst)
+            except OSError as e:
+                errors.append((src, dst, str(e)))
+                continue
+            if checksum is not None:
+                self._record_fingerprint(job, dst, checksum)
+        deferred.clear()
+        return errors
+
+    def _clean_staging(self, job: TransferJob, directory: str) -> None:
+        """
+        Clean up leftovers of interrupted transfers in a destination folder.
+
+        Skipped while another running job writes under the same folder, as
+        its in-flight copies look just like leftovers.
+        """
+        with self._lock:
+            if any(
+                other is not job and paths_overlap(other.dest_root, directory)
+                for other in self._running.values()
+            ):
+                return
+            keep = set().union(*self._kept_staging.values())
+        remove_stale_staging(directory, keep)
+
+    @staticmethod
+    def _already_copied(
+        job: TransferJob, src: str, dst: str, on_bytes: ProgressCallback
+    ) -> bool:
+        """
+        Tell if dst is a complete copy of src left by an interrupted run.
+
+        A copy counts when size and modification time match and, with
+        verify, the checksums too; it is then reported as transferred.
+        """
+        src_stat = os.stat(src)
+        if not file_is_current(src, src_stat, dst, COMPARE_SIZE_MTIME):
+            return False
+        if job.verify:
+            actual = file_checksum(dst, job.buffer_size)
+            if actual != file_checksum(src, job.buffer_size):
+                return False
+            with job.lock:
+                job.file_checksums[src] = actual
+        on_bytes(src_stat.st_size)
+        return True
+
+    def _copy_batch(
+        self,
+        job: TransferJob,
+        pairs: List[Tuple[str, str]],
+        on_bytes: ProgressCallback,
+        resume: bool = False,
+        deferred: Optional[List[Tuple[str, str, Optional[str]]]] = None,
+    ) -> None:
+        """
+        Copy a batch of small files for a job into an already staged folder.
+
+        The batch counterpart of _copy_file without staging: the data goes
+        through copy_small_files, then each file is verified and recorded
+        in the fingerprint cache, or handed to deferred, as a single copy
+        would be.
+
+        Raises:
+            shutil.Error: With (src, dst, reason) tuples for failed files
+            TransferCancelled: If the job is cancelled
+        """
+        job.checkpoint()
+        if resume:
+            pairs = [
+                (src, dst)
+                for src, dst in pairs
+                if not self._already_copied(job, src, dst, on_bytes)
+            ]
+        if self.fingerprints is not None:
+            for _, dst in pairs:
+                self.fingerprints.forget(job.dest_root, dst)
+
+        errors: List[Tuple[str, str, str]] = []
+        expected: Optional[Dict[str, str]] = {} if job.verify else None
+        try:
+            copy_small_files(
+                pairs,
+                on_bytes,
+                job.throttle,
+                expected,
+                job.checkpoint,
+                copy_metadata=deferred is None,
+                fsync=job.durability == DURABILITY_FSYNC,
+            )
+        except shutil.Error as e:
+            errors = e.args[0]
+        except BaseException as e:
+            cancelled = isinstance(e, TransferCancelled)
+            if is_device_gone(e) or (cancelled and job.keep_partial):
+                job.interrupted = True
+            raise
+
+        failed = {src for src, _, _ in errors}
+        for src, dst in pairs:
+            if src in failed:
+                continue
+            checksum = None
+            if expected is not None:
+                checksum = file_checksum(dst, job.buffer_size)
+                if checksum != expected[src]:
+                    reason = f"checksum mismatch after copy ({CHECKSUM_ALGORITHM})"
+                    errors.append((src, dst, reason))
+                    continue
+                with job.lock:
+                    job.file_checksums[src] = checksum
+            if deferred is not None:
+                deferred.append((src, dst, checksum))
+            elif checksum is not None:
+                self._record_fingerprint(job, dst, checksum)
+        if errors:
+            raise shutil.Error(errors)
+
+    @staticmethod
+    def _record_item_checksum(job: TransferJob, src: str) -> None:
+        """
+        Derive the checksum of a dropped path from its verified files.
+
+        A file gets its own checksum; a folder gets a digest over the sorted
+        relative paths and checksums of the files copied from it. Items that
+        were only renamed or skipped copied nothing and get no checksum.
+        """
+        with job.lock:
+            if src in job.file_checksums:
+                job.checksums[src] = f"{CHECKSUM_ALGORITHM}:{job.file_checksums[src]}"
+                return
+            prefix = src.rstrip(os.sep) + os.sep
+            files = sorted(
+                (path[len(prefix):], digest)
+                for path, digest in job.file_checksums.items()
+                if path.startswith(prefix)
+            )
+        if not files:
+            return
+        hasher = _new_hasher()
+        for rel, digest in files:
+            hasher.update(f"{rel}\0{digest}\n".encode("utf-8", "surrogatepass"))
+        with job.lock:
+            job.checksums[src] = (
+                f"{CHECKSUM_ALGORITHM}-tree:{hasher.hexdigest()} ({len(files)} files)"
+            )
+
+    def _dest_hasher(
+        self, job: TransferJob
+    ) -> Optional[Callable[[str, os.stat_result], str]]:
+        """Return a destination hash function backed by the fingerprint cache."""
+        if self.fingerprints is None:
+            return None
+
+        def dst_hash(path: str, st: os.stat_result) -> str:
+            return self.fingerprints.digest(
+                job.dest_root, path, st, "sample", fast_file_hash
+            )
+
+        return dst_hash
+
+    @staticmethod
+    def _source_hasher(job: TransferJob) -> Callable[[str, os.stat_result], str]:
+        """Return a source hash function remembering digests for the job."""
+
+        def src_hash(path: str, st: os.stat_result) -> str:
+            signature = (st.st_size, st.st_mtime_ns, st.st_ino)
+            with job.lock:
+                cached = job.source_hashes.get(path)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+            digest = fast_file_hash(path)
+            with job.lock:
+                job.source_hashes[path] = (signature, digest)
+            return digest
+
+        return src_hash
+
+    def _transfer_item(
+        self, job: TransferJob, src: str, on_bytes: ProgressCallback
+    ) -> Tuple[str, str]:
+        """
+        Copy or move one dropped path into the job's destination.
+
+        Returns:
+            Tuple of (target path, history result string)
+
+        Raises:
+            OSError: If the file operation fails
+        """
+        mode, dest_root = job.mode, job.dest_root
+        name = os.path.basename(src.rstrip(os.sep))
+        target = os.path.join(dest_root, name)
+        exists = os.path.exists(target)
+
+        is_move = mode in (OP_MOVE_REPLACE, OP_MOVE_NEW)
+
+        new_only = mode in (OP_COPY_NEW, OP_MOVE_NEW)
+        is_tree = os.path.isdir(src) and os.path.isdir(target)
+
+        # NEW only: a folder drop brings over just the files that are new
+        if new_only and is_tree:
+            rename = is_move and same_device(src, dest_root)
+            copied, present, _ = self._merge_tree(
+                job,
+                src,
+                target,
+                on_bytes,
+                job.compare,
+                rename,
+                move=is_move,
+                new_only=True,
+            )
+            if is_move:
+                remove_empty_dirs(src)
+            if not copied:
+                return target, f"skipped (no new files, {present} present, NEW only)"
+            return target, f"success ({copied} new, {present} already present)"
+
+        # Decide if we should skip existing targets; a file and a folder of
+        # the same name never replace each other in NEW only mode
+        if new_only and exists:
+            if kind_conflict(target, os.path.isdir(src)) or file_is_current(
+                src,
+                os.stat(src),
+                target,
+                job.compare,
+                self._dest_hasher(job),
+                self._source_hasher(job),
+            ):
+                return target, "skipped (target exists, NEW only)"
+
+        # Merge into an existing folder instead of replacing it wholesale
+        if not new_only and is_tree and job.replace_strategy == REPLACE_MERGE:
+            # Merging by name alone would never update anything
+            strength = job.compare
+            if strength == COMPARE_NAME:
+                strength = COMPARE_SIZE_MTIME
+            rename = is_move and same_device(src, dest_root)
+            copied, unchanged, pruned = self._merge_tree(
+                job, src, target, on_bytes, strength, rename, prune=job.prune_extras
+            )
+            if is_move:
+                job.journal.record("copied", item=src, target=target)
+                self._remove_sources(job, [src])
+            return target, (
+                f"success (merged: {copied} updated, {unchanged} unchanged, "
+                f"{pruned} pruned)"
+            )
+
+        # Same-filesystem moves are a metadata-only rename
+        if is_move and same_device(src, dest_root):
+            try:
+                TransferEngine._rename_into_place(src, target)
+                return target, "success"
+            except OSError as e:
+                # e.g. bind mounts sharing st_dev; fall back to copy+delete
+                if e.errno != errno.EXDEV:
+                    raise
+            exists = os.path.exists(target)
+
+        # Perform copy / replace
+        if os.path.isdir(src):
+            # Build the folder under a temporary name, then swap it in, so an
+            # existing target survives until the new copy is complete
+            staged = job.journal.staged.get(src)
+            resuming = staged is not None and os.path.isdir(staged)
+            if not resuming:
+                staged = staging_path(target)
+                job.journal.record("staged", item=src, path=staged)
+            deferred = []
+            try:
+                try:
+                    parallel_copytree(
+                        src,
+                        staged,
+                        lambda s, d: self._copy_file(
+                            job, s, d, on_bytes, False, resuming, deferred
+                        ),
+                        workers=job.concurrency,
+                        dirs_exist_ok=resuming,
+                        checkpoint=job.checkpoint,
+                        batch_function=lambda pairs: self._copy_batch(
+                            job, pairs, on_bytes, resuming, deferred
+                        ),
+                        io_priority=job.io_priority,
+                    )
+                finally:
+                    # Also on failure, so a resume finds the copies complete
+                    errors = self._apply_metadata(job, deferred)
+                if errors:
+                    raise shutil.Error(errors)
+                if job.durability == DURABILITY_FSYNC:
+                    # The files are on disk; make their names durable too
+                    for root, _dirs, _files in os.walk(staged):
+                        fsync_directory(root)
+                swap_into_place(staged, target)
+                if job.durability == DURABILITY_FSYNC:
+                    fsync_directory(dest_root)
+            except BaseException as e:
+                if isinstance(e, TransferCancelled) and job.keep_partial:
+                    job.interrupted = True
+                # Keep the partial copy if the drop can be resumed
+                if os.path.lexists(staged) and not job.interrupted:
+                    shutil.rmtree(staged, ignore_errors=True)
+                raise
+        else:
+            # File copy; overwrites an existing target
+            self._copy_file(job, src, target, on_bytes)
+
+        # Handle move (delete source)
+        if is_move:
+            job.journal.record("copied", item=src, target=target)
+            self._remove_sources(job, [src])
+
+        return target, "success"
+
+    @staticmethod
+    def _remove_sources(job: TransferJob, paths: List[str]) -> None:
+        """
+        Delete the sources of a move once their copies are complete.
+
+        With syncfs durability the destination is synced first, so a crash
+        cannot lose a file that only existed in unwritten cache.
+        """
+        if paths and job.durability == DURABILITY_SYNCFS:
+            sync_filesystem(job.dest_root)
+        for path in paths:
+            remove_path(path)
+
+    def _merge_tree(
+        self,
+        job: TransferJob,
+        src: str,
+        target: str,
+        on_bytes: ProgressCallback,
+        strength: str,
+        rename: bool = False,
+        move: bool = False,
+        prune: bool = False,
+        new_only: bool = False,
+    ) -> Tuple[int, int, int]:
+        """
+        Bring the existing folder target up to date with src.
+
+        Only files that are missing, or not current by the given comparison
+        strength, are written; with rename they are moved by rename instead
+        of copied, and with move a copied source file is deleted afterwards.
+        With prune, entries of target that are not in src are deleted. A
+        file in the way of a folder, or the other way round, is replaced,
+        except with new_only, where it counts as already present.
+
+        Returns:
+            Tuple of (files written, files unchanged, entries pruned)
+        """
+        copied = unchanged = pruned = 0
+        dir_pairs = []
+        moved = []
+        dst_hash = self._dest_hasher(job)
+        src_hash = self._source_hasher(job)
+        # Metadata in one pass at the end; moved files lose their source first
+        deferred = None if move else []
+
+        try:
+            for root, dirs, files in os.walk(src, followlinks=True):
+                rel = os.path.relpath(root, src)
+                dst_dir = target if rel == os.curdir else os.path.join(target, rel)
+                if os.path.lexists(dst_dir) and not os.path.isdir(dst_dir):
+                    if new_only:
+                        dirs[:] = []
+                        unchanged += 1
+                        continue
+                    os.remove(dst_dir)
+                os.makedirs(dst_dir, exist_ok=True)
+                self._clean_staging(job, dst_dir)
+                dir_pairs.append((root, dst_dir))
+
+                for name in files:
+                    src_file = os.path.join(root, name)
+                    dst_file = os.path.join(dst_dir, name)
+                    src_stat = os.stat(src_file)
+                    if os.path.isdir(dst_file):
+                        if new_only:
+                            unchanged += 1
+                            continue
+                        if not os.path.islink(dst_file):
+                            shutil.rmtree(dst_file)
+                    elif file_is_current(
+                        src_file, src_stat, dst_file, strength, dst_hash, src_hash
+                    ):
+                        unchanged += 1
+                        continue
+
+                    if not (rename and self._try_rename(src_file, dst_file)):
+                        self._copy_file(
+                            job, src_file, dst_file, on_bytes, deferred=deferred
+                        )
+                        if move:
+                            moved.append(src_file)
+                    copied += 1
+
+                if prune:
+                    keep = set(dirs) | set(files)
+                    for name in os.listdir(dst_dir):
+                        if name not in keep:
+                            remove_path(os.path.join(dst_dir, name))
+                            pruned += 1
+        except TransferCancelled as e:
+            e.files_written = copied
+            raise
+        finally:
+            errors = self._apply_metadata(job, deferred or [])
+            self._remove_sources(job, moved)
+        if errors:
+            raise shutil.Error(errors)
+
+        # Directory times last, deepest first, once their contents are final
+        for src_dir, dst_dir in reversed(dir_pairs):
+            shutil.copystat(src_dir, dst_dir)
+
+        return copied, unchanged, pruned
+
+    @staticmethod
+    def _try_rename(src: str, dst: str) -> bool:
+        """Rename src over dst; return False if they are on different devices."""
+        try:
+            os.replace(src, dst)
+            return True
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            return False
+
+    @staticmethod
+    def _rename_into_place(src: str, target: str) -> None:
+        """
+        Move src to target with a rename, replacing an existing target.
+
+        Raises:
+            OSError: With errno EXDEV if the rename crosses filesystems
+        """
+        swap_into_place(src, target)
+
+
+class PlanWorker(QThread):
+    """Plans a drop off the GUI thread for its dry-run preview."""
+
+    # (job, TransferPlan), or (job, None) if the job was cancelled meanwhile
+    planned = Signal(object, object)
+
+    def __init__(self, engine: TransferEngine, job: TransferJob, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.job = job
+
+    def run(self) -> None:
+        try:
+            plan = self.engine.plan(self.job)
+        except TransferCancelled:
+            plan = None
+        self.planned.emit(self.job, plan)
+
+
+# Word -> bitmask of row blocks, the vocabulary, its blob and start offsets
+WordIndex = Tuple[Dict[str, int], List[str], str, List[int]]
+
+
+class HistorySearchIndex:
+    """
+    Precomputed lowercase search index over a tab's history.
+
+    All searchable text (source, destination and result) is lowercased
+    once and joined into a single newline-separated string, with a table
+    of row start offsets. On top of it, rows are grouped into blocks of
+    BLOCK_ROWS and every word of three or more characters maps to a
+    bitmask of the blocks it occurs in. A substring query looks its words
+    up in that vocabulary and only scans the blocks holding all of them,
+    with C-level str.find() calls mapped back to rows by bisection.
+    Queries that extend the previous one only re-check the rows that
+    matched before.
+
+    The word index is built separately by build_word_index(), which takes
+    seconds on a million rows; until it is done, searches scan the whole
+    text. HistoryDialog does both on a worker thread. With the word index,
+    selective queries on a million rows take a few milliseconds; queries
+    matching a large share of the rows, or made only of common words, and
+    regular expressions still scan the text and can take several hundred.
+    """
+
+    # Past this many hits a plain scan of the remaining rows is cheaper
+    FIND_LOOP_LIMIT = 20000
+    # Rows per block of the word index
+    BLOCK_ROWS = 1024
+    # Shorter words are in nearly every block and narrow nothing down
+    MIN_WORD = 3
+    # A query word found in more vocabulary words than this is not used
+    VOCABULARY_LIMIT = 2000
+
+    WORD_PATTERN = re.compile(r"\w+")
+
+    def __init__(
+        self,
+        store: HistoryStore,
+        tab_id: str,
+        cancelled: Optional[threading.Event] = None,
+    ):
+        """
+        Args:
+            cancelled: Stops reading early when set; the index is then
+                incomplete and must be discarded
+        """
+        self.row_ids: List[int] = []
+        texts: List[str] = []
+        for row_id, text in store.search_rows(tab_id):
+            self.row_ids.append(row_id)
+            texts.append(text.lower().replace("\n", " "))
+            if cancelled is not None and not len(texts) % self.BLOCK_ROWS:
+                if cancelled.is_set():
+                    break
+        self._texts = texts
+        self._blob = "\n".join(texts)
+
+        self._starts: List[int] = []
+        pos = 0
+        for text in texts:
+            self._starts.append(pos)
+            pos += len(text) + 1
+
+        self._words: Optional[WordIndex] = None
+
+        self._last_query = ""
+        self._last_rows: List[int] = list(range(len(texts)))
+
+    def __len__(self) -> int:
+        return len(self.row_ids)
+
+    def build_word_index(self, cancelled: Optional[threading.Event] = None) -> None:
+        """
+        Build the word index; may run on another thread while searching.
+
+        Args:
+            cancelled: Abandons the build when set
+        """
+        blocks: Dict[str, int] = {}
+        pattern = re.compile(r"\w{%d,}" % self.MIN_WORD)
+        for block in range((len(self._texts) + self.BLOCK_ROWS - 1) // self.BLOCK_ROWS):
+            if cancelled is not None and cancelled.is_set():
+                return
+            start, end = self._block_span(block)
+            bit = 1 << block
+            for word in set(pattern.findall(self._blob, start, end)):
+                blocks[word] = blocks.get(word, 0) | bit
+
+        # The vocabulary as one string too, for substring lookups
+        vocabulary = list(blocks)
+        starts: List[int] = []
+        pos = 0
+        for word in vocabulary:
+            starts.append(pos)
+            pos += len(word) + 1
+        # Published in one assignment, so searches see all of it or nothing
+        self._words = (blocks, vocabulary, "\n".join(vocabulary), starts)
+
+    def search(self, query: str, regex: bool = False) -> List[int]:
+        """
+        Return the positions (in index order) of rows matching a query.
+
+        Raises:
+            re.error: If regex is True and the pattern is invalid
+        """
+        if not query:
+            return list(range(len(self._texts)))
+        if regex:
+            # MULTILINE so ^ and $ anchor at every row of the blob
+            return self._search_regex(
+                re.compile(query, re.IGNORECASE | re.MULTILINE)
+            )
+
+        query = query.lower()
+        if self._last_query and query.startswith(self._last_query):
+            # Typing narrows the previous result
+            rows = [i for i in self._last_rows if query in self._texts[i]]
+        else:
+            rows = self._search_substring(query)
+        self._last_query, self._last_rows = query, rows
+        return rows
+
+    def _block_span(self, block: int) -> Tuple[int, int]:
+        """Return the blob offsets (start, end) of a block of rows."""
+        first = block * self.BLOCK_ROWS
+        after = first + self.BLOCK_ROWS
+        end = self._starts[after] if after < len(self._starts) else len(self._blob)
+        return self._starts[first], end
+
+    @staticmethod
+    def _word_blocks(words: WordIndex, word: str) -> Optional[int]:
+        """
+        Return the bitmask of blocks with a word containing word, or None
+        if too many vocabulary words contain it to be worth looking up.
+        """
+        blocks, vocabulary, blob, starts = words
+        mask = hits = 0
+        pos = blob.find(word)
+        while pos != -1:
+            i = bisect.bisect_right(starts, pos) - 1
+            mask |= blocks[vocabulary[i]]
+            hits += 1
+            if hits > HistorySearchIndex.VOCABULARY_LIMIT:
+                return None
+            if i + 1 >= len(starts):
+                break
+            pos = blob.find(word, starts[i + 1])
+        return mask
+
+    def _candidate_spans(self, query: str) -> List[Tuple[int, int]]:
+        """Return the blob spans that can hold query, merged where adjacent."""
+        words = self._words
+        mask = None
+        for word in set(self.WORD_PATTERN.findall(query)) if words else ():
+            if len(word) < self.MIN_WORD:
+                continue
+            # Every word of a match lies within a word of its row
+            blocks = self._word_blocks(words, word)
+            if blocks is not None:
+                mask = blocks if mask is None else mask & blocks
+        if mask is None:
+            return [(0, len(self._blob))]
+
+        spans: List[Tuple[int, int]] = []
+        while mask:
+            low = mask & -mask
+            start, end = self._block_span(low.bit_length() - 1)
+            if spans and spans[-1][1] + 1 >= start:
+                spans[-1] = (spans[-1][0], end)
+            else:
+                spans.append((start, end))
+            mask ^= low
+        return spans
+
+    def _search_substring(self, query: str) -> List[int]:
+        blob, starts, texts = self._blob, self._starts, self._texts
+        rows: List[int] = []
+        for start, end in self._candidate_spans(query):
+            pos = blob.find(query, start, end)
+            while pos != -1:
+                row = bisect.bisect_right(starts, pos) - 1
+                rows.append(row)
+                if len(rows) >= self.FIND_LOOP_LIMIT:
+                    # Broad query: finish this span with a straight scan
+                    last = bisect.bisect_right(starts, end - 1)
+                    rows.extend(
+                        i for i in range(row + 1, last) if query in texts[i]
+                    )
+                    break
+                if row + 1 >= len(starts):
+                    break
+                pos = blob.find(query, starts[row + 1], end)
+        return rows
+
+    def _search_regex(self, pattern: "re.Pattern") -> List[int]:
+        self._last_query = ""
+        blob, starts, texts = self._blob, self._starts, self._texts
+        rows: List[int] = []
+        match = pattern.search(blob)
+        while match:
+            row = bisect.bisect_right(starts, match.start()) - 1
+            # A match running into the next row (e.g. via \s or [^x]) only
+            # counts if the row matches on its own
+            if match.end() <= starts[row] + len(texts[row]) or pattern.search(
+                texts[row]
+            ):
+                rows.append(row)
+            if row + 1 >= len(starts):
+                break
+            match = pattern.search(blob, starts[row + 1])
+        return rows
+
+
+class SearchIndexWorker(QThread):
+    """Builds a HistorySearchIndex, and then its word index, off the GUI thread."""
+
+    built = Signal(object)
+
+    def __init__(self, store: HistoryStore, tab_id: str, parent=None):
+        super().__init__(parent)
+        # Queued entries are not visible to the worker's own reader
+        store.flush()
+        self.store = store
+        self.tab_id = tab_id
+        self.cancelled = threading.Event()
+
+    def run(self) -> None:
+        reader = self.store.reader()
+        try:
+            index = HistorySearchIndex(reader, self.tab_id, self.cancelled)
+        finally:
+            reader.close()
+        if self.cancelled.is_set():
+            return
+        # Searching can start now; the word index speeds it up once done
+        self.built.emit(index)
+        index.build_word_index(self.cancelled)
+
+
+class HistoryTableModel(QAbstractTableModel):
+    """
+    Lazy table model over a tab's history store.
+
+    Rows are fetched from the store a page at a time when the view first
+    asks for them, and only a bounded number of pages is kept in memory,
+    so the dialog stays fast no matter how long the history is.
+    """
+
+    COLUMNS = [
+        ("timestamp", "⏰ Time"),
+        ("operation", "⚙️ Operation"),
+        ("source", "📂 Source"),
+        ("destination", "📁 Destination"),
+        ("result", "✅ Result"),
+    ]
+    PAGE_SIZE = 256
+    MAX_CACHED_PAGES = 64
+
+    def __init__(self, store: HistoryStore, tab_id: str, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.tab_id = tab_id
+        self.sort_key = "timestamp"
+        self.descending = True
+        self._pages: "OrderedDict[int, List[Dict[str, Any]]]" = OrderedDict()
+        self._row_count = store.count(tab_id)
+        # Store row ids shown while a search filter is active
+        self._filter_ids: Optional[List[int]] = None
+        self._filter_sorted: Optional[List[int]] = None
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.COLUMNS[section][1]
+        return str(section + 1)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        entry = self.entry(index.row())
+        key = self.COLUMNS[index.column()][0]
+        value = str(entry.get(key, "N/A"))
+
+        if role == Qt.ToolTipRole and key == "result" and entry.get("checksum"):
+            return f"{value}\nChecksum: {entry['checksum']}"
+        if role in (Qt.DisplayRole, Qt.ToolTipRole):
+            return value
+        if role == Qt.ForegroundRole and key == "result":
+            if value.startswith("failed"):
+                return QColor("#DC3545")
+            if value.startswith("skipped"):
+                return QColor("#6C757D")
+            return QColor("#198754")
+        return None
+
+    def entry(self, row: int) -> Dict[str, Any]:
+        """Return the entry shown in a row, fetching its page if needed."""
+        page_no, offset = divmod(row, self.PAGE_SIZE)
+        page = self._pages.get(page_no)
+        if page is None:
+            start = page_no * self.PAGE_SIZE
+            if self._filter_ids is not None:
+                ids = self._sorted_filter_ids()[start : start + self.PAGE_SIZE]
+                page = self.store.fetch_rows(self.tab_id, ids)
+            else:
+                page = self.store.fetch(
+                    self.tab_id, start, self.PAGE_SIZE, self.sort_key, self.descending
+                )
+            self._pages[page_no] = page
+            if len(self._pages) > self.MAX_CACHED_PAGES:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(page_no)
+        return page[offset] if offset < len(page) else {}
+
+    def _sorted_filter_ids(self) -> List[int]:
+        """Return the filtered row ids in the current sort order."""
+        if self._filter_sorted is None:
+            ids = list(self._filter_ids or [])
+            if self.sort_key != "timestamp":
+                # Filter ids are in time order; other keys need the rows
+                entries = self.store.fetch_rows(self.tab_id, ids)
+                keys = [str(e.get(self.sort_key, "")) for e in entries]
+                order = sorted(range(len(ids)), key=keys.__getitem__)
+                ids = [ids[i] for i in order]
+            if self.descending:
+                ids.reverse()
+            self._filter_sorted = ids
+        return self._filter_sorted
+
+    def sort(self, column: int, order=Qt.AscendingOrder) -> None:
+        self.beginResetModel()
+        self.sort_key = self.COLUMNS[column][0]
+        self.descending = order == Qt.DescendingOrder
+        self._pages.clear()
+        self._filter_sorted = None
+        self.endResetModel()
+
+    def set_filter(self, row_ids: Optional[List[int]]) -> None:
+        """Show only the given store row ids (in time order), or all rows."""
+        self.beginResetModel()
+        self._pages.clear()
+        self._filter_ids = row_ids
+        self._filter_sorted = None
+        self._row_count = (
+            self.store.count(self.tab_id) if row_ids is None else len(row_ids)
+        )
+        self.endResetModel()
+
+    def refresh(self) -> None:
+        """Reload the row count and drop cached pages."""
+        self.set_filter(self._filter_ids)
+
+
+class HistoryDialog(QDialog):
+    """Resizable dialog showing a tab's history as a sortable table."""
+
+    def __init__(
+        self, tab_name: str, store: HistoryStore, tab_id: str, parent=None
+    ):
+        super().__init__(parent)
+        self.setWindowTitle(f"History - {tab_name}")
+        self.resize(1000, 600)
+        self.setMinimumSize(600, 400)
+
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+        layout.setContentsMargins(15, 15, 15, 15)
+
+        # Title
+        title = QLabel(f"📜 History for Tab: {tab_name}")
+        title.setStyleSheet(
+            "font-size: 16px; font-weight: bold; color: #212529; padding: 5px;"
+        )
+        layout.addWidget(title)
+
+        self.store = store
+        self.tab_id = tab_id
+        self.model = HistoryTableModel(store, tab_id, self)
+        self.search_index: Optional[HistorySearchIndex] = None
+        self._index_worker: Optional[SearchIndexWorker] = None
+
+        # Search row
+        search_row = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText(
+            "🔍 Filter by source, destination or result…"
+        )
+        self.search_edit.setClearButtonEnabled(True)
+        search_row.addWidget(self.search_edit, stretch=1)
+
+        self.regex_check = QCheckBox("Regex")
+        search_row.addWidget(self.regex_check)
+        layout.addLayout(search_row)
+
+        # Filter shortly after the user pauses typing
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(120)
+        self._search_timer.timeout.connect(self.apply_filter)
+        self.search_edit.textChanged.connect(lambda _: self._search_timer.start())
+        self.regex_check.toggled.connect(lambda _: self.apply_filter())
+
+        table = QTableView()
+        table.setModel(self.model)
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.setAlternatingRowColors(True)
+        table.setWordWrap(False)
+        table.setSortingEnabled(True)
+        table.horizontalHeader().setSortIndicator(0, Qt.DescendingOrder)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        table.horizontalHeader().setStretchLastSection(True)
+        # Fixed row heights keep the view from measuring every row
+        table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        table.verticalHeader().setDefaultSectionSize(24)
+        for column, width in enumerate((150, 110, 260, 260)):
+            table.setColumnWidth(column, width)
+        table.setStyleSheet(
+            """
+            QTableView {
+                background-color: #FFFFFF;
+                alternate-background-color: #F8F9FA;
+                color: #212529;
+                border: 2px solid #DEE2E6;
+                border-radius: 6px;
+                font-family: 'Consolas', 'Monaco', monospace;
+                font-size: 12px;
+            }
+        """
+        )
+        layout.addWidget(table)
+
+        self.total = self.model.rowCount()
+        self.summary = QLabel()
+        self.summary.setStyleSheet("color: #6C757D;")
+        self._update_summary()
+
+        # Close button
+        close_btn = QPushButton("Close")
+        close_btn.setStyleSheet(
+            """
+            QPushButton {
+                background-color: #0078D7;
+                color: #FFFFFF;
+                border: none;
+                border-radius: 5px;
+                padding: 10px 20px;
+                font-weight: 600;
+                font-size: 13px;
+            }
+            QPushButton:hover {
+                background-color: #005A9E;
+            }
+        """
+        )
+        close_btn.clicked.connect(self.accept)
+
+        bottom_row = QHBoxLayout()
+        bottom_row.addWidget(self.summary)
+        bottom_row.addStretch(1)
+        bottom_row.addWidget(close_btn)
+        layout.addLayout(bottom_row)
+
+    def _update_summary(self, error: str = "") -> None:
+        """Show the entry count, the match count or a regex error."""
+        if error:
+            self.summary.setText(f"❌ Invalid regex: {error}")
+        elif self.search_index is None and self._index_worker is not None:
+            self.summary.setText(f"⏳ Indexing {self.total} entries for search…")
+        elif not self.total:
+            self.summary.setText("No history entries yet for this tab.")
+        elif self.model.rowCount() != self.total or self.search_edit.text():
+            self.summary.setText(
+                f"{self.model.rowCount()} of {self.total} entries match"
+            )
+        else:
+            self.summary.setText(
+                f"{self.total} entr{'y' if self.total == 1 else 'ies'}"
+            )
+
+    def apply_filter(self) -> None:
+        """Filter the table by the search box text."""
+        self._search_timer.stop()
+        query = self.search_edit.text()
+        if not query:
+            self.model.set_filter(None)
+            self._update_summary()
+            return
+
+        if self.search_index is None:
+            # Built once, on the first search, without blocking the dialog
+            if self._index_worker is None:
+                self._index_worker = SearchIndexWorker(self.store, self.tab_id, self)
+                self._index_worker.built.connect(self._on_index_built)
+                self._index_worker.start()
+            self._update_summary()
+            return
+
+        try:
+            rows = self.search_index.search(query, self.regex_check.isChecked())
+        except re.error as e:
+            self._update_summary(error=str(e))
+            return
+
+        row_ids = self.search_index.row_ids
+        self.model.set_filter([row_ids[i] for i in rows])
+        self._update_summary()
+
+    def _on_index_built(self, index: HistorySearchIndex) -> None:
+        """Search with the new index for whatever has been typed meanwhile."""
+        self.search_index = index
+        self.apply_filter()
+
+    def done(self, result: int) -> None:
+        """Stop a search index build still running before closing."""
+        if self._index_worker is not None:
+            self._index_worker.built.disconnect(self._on_index_built)
+            self._index_worker.cancelled.set()
+            self._index_worker.wait()
+            self._index_worker = None
+        super().done(result)
+
+
+class TransferSettingsDialog(QDialog):
+    """Dialog for the per-tab transfer tuning options."""
+
+    def __init__(self, tab: Dict[str, Any], parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Transfer Settings - {tab['name']}")
+        self.setMinimumWidth(420)
+
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+        layout.setContentsMargins(15, 15, 15, 15)
+
+        form = QFormLayout()
+        form.setSpacing(10)
+
+        self.concurrency_spin = QSpinBox()
+        self.concurrency_spin.setRange(1, MAX_CONCURRENCY)
+        self.concurrency_spin.setValue(
+            normalize_concurrency(tab.get("concurrency", DEFAULT_CONCURRENCY))
+        )
+        self.concurrency_spin.setToolTip(
+            "How many dropped items are copied at the same time.\n"
+            "Fast SSD/NVMe and network targets benefit from 8–16."
+        )
+        form.addRow("Parallel copies:", self.concurrency_spin)
+
+        self.buffer_spin = QSpinBox()
+        self.buffer_spin.setRange(1, MAX_BUFFER_MIB)
+        self.buffer_spin.setSuffix(" MiB")
+        self.buffer_spin.setValue(
+            normalize_buffer_mib(tab.get("buffer_size_mib", DEFAULT_BUFFER_MIB))
+        )
+        self.buffer_spin.setToolTip(
+            "Chunk size used when copying file data.\n"
+            "Larger buffers help spinning disks and network shares."
+        )
+        form.addRow("Copy buffer:", self.buffer_spin)
+
+        self.replace_combo = QComboBox()
+        self.replace_combo.addItem("Delete and copy again", REPLACE_WIPE)
+        self.replace_combo.addItem("Merge (copy changed files only)", REPLACE_MERGE)
+        self.replace_combo.setCurrentIndex(
+            max(0, self.replace_combo.findData(tab.get("replace_strategy")))
+        )
+        self.replace_combo.setToolTip(
+            "How 'Replace existing' updates a folder that already exists.\n"
+            "Merge compares size and modification time and only writes\n"
+            "files that are new or changed."
+        )
+        form.addRow("Replace folders:", self.replace_combo)
+
+        self.prune_check = QCheckBox("Delete files that are not in the dropped folder")
+        self.prune_check.setChecked(bool(tab.get("prune_extras", False)))
+        form.addRow("Merge:", self.prune_check)
+
+        self.compare_combo = QComboBox()
+        self.compare_combo.addItem("Name only", COMPARE_NAME)
+        self.compare_combo.addItem("Size + modification time", COMPARE_SIZE_MTIME)
+        self.compare_combo.addItem("Content hash (sampled)", COMPARE_HASH)
+        self.compare_combo.setCurrentIndex(
+            max(0, self.compare_combo.findData(tab.get("compare")))
+        )
+        self.compare_combo.setToolTip(
+            "When a file counts as already present at the destination.\n"
+            "'New only' modes skip such files; merging skips them too.\n"
+            "Content hash reads only sampled blocks of large files."
+        )
+        form.addRow("Compare files by:", self.compare_combo)
+
+        self.verify_check = QCheckBox("Verify copies with checksums")
+        self.verify_check.setChecked(bool(tab.get("verify", False)))
+        self.verify_check.setToolTip(
+            "Hash each file while it is copied and compare it with the copy\n"
+            "read back from disk. Moves delete the source only on a match.\n"
+            "Copies go through userspace, so reflink/in-kernel copies are not used."
+        )
+        form.addRow("Integrity:", self.verify_check)
+
+        self.durability_combo = QComboBox()
+        self.durability_combo.addItem("Left to the system (fastest)", DURABILITY_NONE)
+        self.durability_combo.addItem("Sync once per drop", DURABILITY_SYNCFS)
+        self.durability_combo.addItem("Sync every file (safest)", DURABILITY_FSYNC)
+        self.durability_combo.setCurrentIndex(
+            max(0, self.durability_combo.findData(tab.get("durability")))
+        )
+        self.durability_combo.setToolTip(
+            "When copied data is forced onto the destination disk.\n"
+            "Syncing once per drop flushes the whole destination filesystem\n"
+            "when the drop ends; syncing every file costs a flush per file."
+        )
+        form.addRow("Write to disk:", self.durability_combo)
+
+        self.bandwidth_spin = QSpinBox()
+        self.bandwidth_spin.setRange(0, MAX_BANDWIDTH_MBPS)
+        self.bandwidth_spin.setSuffix(" MB/s")
+        self.bandwidth_spin.setSpecialValueText("Unlimited")
+        self.bandwidth_spin.setValue(int(tab.get("bandwidth_limit_mbps", 0) or 0))
+        self.bandwidth_spin.setToolTip(
+            "Upper limit for the copy rate of a drop, shared by its parallel\n"
+            "copies. Keeps large transfers from saturating a shared link."
+        )
+        form.addRow("Bandwidth limit:", self.bandwidth_spin)
+
+        self.io_priority_combo = QComboBox()
+        self.io_priority_combo.addItem("Normal", IO_PRIORITY_NORMAL)
+        self.io_priority_combo.addItem("Low (best effort)", IO_PRIORITY_LOW)
+        self.io_priority_combo.addItem(
+            "Idle (only when the disk is free)", IO_PRIORITY_IDLE
+        )
+        self.io_priority_combo.setCurrentIndex(
+            max(0, self.io_priority_combo.findData(tab.get("io_priority")))
+        )
+        self.io_priority_combo.setToolTip(
+            "Linux I/O scheduling class of the copy threads (like ionice).\n"
+            "Has no effect on other platforms."
+        )
+        form.addRow("I/O priority:", self.io_priority_combo)
+
+        self.priority_combo = QComboBox()
+        for priority in (PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW):
+            self.priority_combo.addItem(PRIORITY_LABELS[priority], priority)
+        self.priority_combo.setCurrentIndex(
+            max(0, self.priority_combo.findData(tab.get("priority", PRIORITY_NORMAL)))
+        )
+        self.priority_combo.setToolTip(
+            "Order in the transfer queue when drops wait for the same disk."
+        )
+        form.addRow("Queue priority:", self.priority_combo)
+
+        self.preview_check = QCheckBox("Preview each drop before it starts")
+        self.preview_check.setChecked(bool(tab.get("preview", False)))
+        self.preview_check.setToolTip(
+            "Scan the dropped items first and show what would be copied,\n"
+            "replaced, merged or skipped, and how much space it takes.\n"
+            "Nothing is written until the preview is confirmed."
+        )
+        form.addRow("Dry run:", self.preview_check)
+        self.prune_check.setEnabled(self.replace_combo.currentData() == REPLACE_MERGE)
+        self.replace_combo.currentIndexChanged.connect(
+            lambda _: self.prune_check.setEnabled(
+                self.replace_combo.currentData() == REPLACE_MERGE
+            )
+        )
+
+        layout.addLayout(form)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def values(self) -> Dict[str, Any]:
+        """Return the edited settings as tab configuration keys."""
+        return {
+            "concurrency": self.concurrency_spin.value(),
+            "buffer_size_mib": self.buffer_spin.value(),
+            "replace_strategy": self.replace_combo.currentData(),
+            "prune_extras": self.prune_check.isChecked(),
+            "compare": self.compare_combo.currentData(),
+            "verify": self.verify_check.isChecked(),
+            "durability": self.durability_combo.currentData(),
+            "bandwidth_limit_mbps": self.bandwidth_spin.value(),
+            "io_priority": self.io_priority_combo.currentData(),
+            "priority": self.priority_combo.currentData(),
+            "preview": self.preview_check.isChecked(),
+        }
+
+
+class TransferQueueDialog(QDialog):
+    """Non-modal view of the transfer queue with per-drop controls."""
+
+    COLUMNS = ("Tab", "Items", "Destination", "Priority", "State", "Progress")
+
+    def __init__(self, main_window: "MainWindow"):
+        super().__init__(main_window)
+        self.main_window = main_window
+        self.engine = main_window.transfer_engine
+        self.setWindowTitle("Transfer Queue")
+        self.resize(820, 360)
+        self._jobs: List[TransferJob] = []
+
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+        layout.setContentsMargins(15, 15, 15, 15)
+
+        title = QLabel("📋 Running and waiting drops")
+        title.setStyleSheet(
+            "font-size: 16px; font-weight: bold; color: #212529; padding: 5px;"
+        )
+        layout.addWidget(title)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(
+            2, QHeaderView.Stretch
+        )
+        layout.addWidget(self.table)
+
+        button_row = QHBoxLayout()
+        for label, handler in (
+            ("⬆ Raise", lambda: self._change_priority(1)),
+            ("⬇ Lower", lambda: self._change_priority(-1)),
+            ("⏯ Pause/Resume", self._toggle_pause),
+            ("⏹ Cancel", self._cancel),
+        ):
+            button = QPushButton(label)
+            button.setObjectName("secondaryButton")
+            button.clicked.connect(handler)
+            button_row.addWidget(button)
+        button_row.addStretch(1)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.close)
+        button_row.addWidget(close_btn)
+        layout.addLayout(button_row)
+
+        self.engine.queue_changed.connect(self.refresh)
+        # Progress columns are refreshed on a timer, not per chunk
+        self._timer = QTimer(self)
+        self._timer.setInterval(500)
+        self._timer.timeout.connect(self.refresh)
+        self._timer.start()
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Rebuild the rows from the engine's current queue."""
+        selected = self._selected_job()
+        self._jobs = self.engine.jobs()
+        self.table.setRowCount(len(self._jobs))
+        for row, job in enumerate(self._jobs):
+            if job.paused:
+                state = "Paused"
+            elif job.cancelled:
+                state = "Cancelling"
+            elif job.started:
+                state = "Running"
+            else:
+                state = "Waiting"
+            with job.lock:
+                done, total = job.bytes_done, job.total_bytes
+            progress = (
+                f"{format_size(done)} of {format_size(total)}" if job.started else ""
+            )
+            values = (
+                job.tab_name,
+                str(len(job.src_paths)),
+                job.dest_root,
+                PRIORITY_LABELS.get(job.priority, str(job.priority)),
+                state,
+                progress,
+            )
+            for column, value in enumerate(values):
+                self.table.setItem(row, column, QTableWidgetItem(value))
+            if job is selected:
+                self.table.selectRow(row)
+
+    def _selected_job(self) -> Optional[TransferJob]:
+        rows = self.table.selectionModel().selectedRows()
+        if not rows or rows[0].row() >= len(self._jobs):
+            return None
+        return self._jobs[rows[0].row()]
+
+    def _change_priority(self, step: int) -> None:
+        job = self._selected_job()
+        if job is None or job.started:
+            return
+        priority = max(PRIORITY_LOW, min(PRIORITY_HIGH, job.priority + step))
+        self.engine.set_priority(job, priority)
+
+    def _toggle_pause(self) -> None:
+        job = self._selected_job()
+        if job is not None:
+            self.main_window.toggle_pause_jobs([job])
+
+    def _cancel(self) -> None:
+        job = self._selected_job()
+        if job is not None:
+            self.main_window.cancel_jobs([job])
+
+    def closeEvent(self, event) -> None:
+        self._timer.stop()
+        self.engine.queue_changed.disconnect(self.refresh)
+        super().closeEvent(event)
+
+
+class PlanPreviewDialog(QDialog):
+    """Dry-run preview of a drop, confirmed before anything is written."""
+
+    COLUMNS = ("Item", "Action", "Files", "Size", "Already present")
+
+    ACTION_LABELS = {
+        PLAN_COPY: "Copy",
+        PLAN_REPLACE: "Replace",
+        PLAN_MERGE: "Merge",
+        PLAN_SKIP: "Skip",
+        PLAN_RENAME: "Move (rename)",
+        PLAN_MISSING: "Missing",
+    }
+
+    def __init__(
+        self, job: TransferJob, plan: TransferPlan, rate: float = 0.0, parent=None
+    ):
+        """
+        Args:
+            rate: Copy rate last measured onto the destination disk in
+                bytes/s, for the time estimate; 0 if unknown
+        """
+        super().__init__(parent)
+        self.setWindowTitle(f"Preview - {job.tab_name}")
+        self.resize(780, 400)
+
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+        layout.setContentsMargins(15, 15, 15, 15)
+
+        title = QLabel(f"🔍 {len(plan.items)} item(s) to '{job.dest_root}'")
+        title.setStyleSheet(
+            "font-size: 16px; font-weight: bold; color: #212529; padding: 5px;"
+        )
+        layout.addWidget(title)
+
+        is_move = job.mode in (OP_MOVE_REPLACE, OP_MOVE_NEW)
+        table = QTableWidget(len(plan.items), len(self.COLUMNS))
+        table.setHorizontalHeaderLabels(self.COLUMNS)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        for row, item in enumerate(plan.items):
+            action = self.ACTION_LABELS.get(item["action"], item["action"])
+            if is_move and item["action"] in (PLAN_COPY, PLAN_REPLACE, PLAN_MERGE):
+                action += ", delete source"
+            values = (
+                item["src"],
+                action,
+                str(item["files"]),
+                format_size(item["bytes"]),
+                str(item["unchanged"]),
+            )
+            for column, value in enumerate(values):
+                table.setItem(row, column, QTableWidgetItem(value))
+        layout.addWidget(table)
+
+        details = plan.summary()
+        if plan.free_space is not None:
+            details += (
+                f"\n{format_size(plan.space_needed)} of disk space needed, "
+                f"{format_size(plan.free_space)} free"
+            )
+        if rate > 0 and plan.total_bytes:
+            details += (
+                f"\nAbout {format_duration(plan.total_bytes / rate)} at the last "
+                f"measured speed of {format_size(rate)}/s"
+            )
+        summary = QLabel(details)
+        summary.setWordWrap(True)
+        layout.addWidget(summary)
+
+        shortage = plan.shortage()
+        if shortage:
+            warning = QLabel(f"❌ {shortage}")
+            warning.setWordWrap(True)
+            warning.setStyleSheet("color: #DC3545; font-weight: bold;")
+            layout.addWidget(warning)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        start_btn = buttons.button(QDialogButtonBox.Ok)
+        start_btn.setText("Start")
+        start_btn.setEnabled(not shortage)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+
+class DropArea(QLabel):
+    """Central drop zone, tied to a specific tab (via tab_id)."""
+
+    def __init__(self, main_window: 'MainWindow', tab_id: str, parent=None):
+        super().__init__(parent)
+        self.main_window = main_window
+        self.tab_id = tab_id
+        self.dest_path = ""
+        self.setAcceptDrops(True)
+        self.setAlignment(Qt.AlignCenter)
+        self.setMinimumHeight(180)
+        self.setWordWrap(True)
+        self.setText("📁 Drag files or folders here")
+
+        self.base_style = (
+            "QLabel {"
+            "  border: 3px dashed #0078d7;"
+            "  border-radius: 8px;"
+            "  background-color: #f8f9fa;"
+            "  color: #212529;"
+            "  font-size: 15px;"
+            "  font-weight: 500;"
+            "  padding: 20px;"
+            "}"
+        )
+        self.highlight_style = (
+            "QLabel {"
+            "  border: 3px solid #0078d7;"
+            "  border-radius: 8px;"
+            "  background-color: #cfe2ff;"
+            "  color: #084298;"
+            "  font-size: 15px;"
+            "  font-weight: 600;"
+            "  padding: 20px;"
+            "}"
+        )
+        self.disabled_style = (
+            "QLabel {"
+            "  border: 3px dashed #dee2e6;"
+            "  border-radius: 8px;"
+            "  background-color: #f8f9fa;"
+            "  color: #6c757d;"
+            "  font-size: 14px;"
+            "  padding: 20px;"
+            "}"
+        )
+        self.update_style()
+
+    def set_destination(self, path: str) -> None:
+        """Set the destination path for this drop area."""
+        self.dest_path = path or ""
+        self.update_style()
+
+    def has_valid_destination(self) -> bool:
+        """Check if the destination path is valid."""
+        return bool(self.dest_path) and os.path.isdir(self.dest_path)
+
+    def update_style(self, highlight: bool = False) -> None:
+        """Update the visual style of the drop area."""
+        if not self.has_valid_destination():
+            self.setStyleSheet(self.disabled_style)
+            if not self.dest_path:
+                self.setText(
+                    "⚠️ No folder assigned\n\nClick 'Set Destination Folder' above to get started"
+                )
+            else:
+                self.setText(
+                    "❌ Destination folder is invalid or missing\n\n"
+                    "Please reassign a valid folder"
+                )
+        else:
+            self.setStyleSheet(self.highlight_style if highlight else self.base_style)
+            self.setText(
+                "✅ Drop files here!"
+                if highlight
+                else "📁 Drag files or folders here"
+            )
+
+    def dragEnterEvent(self, event):
+        """Handle drag enter events."""
+        if event.mimeData().hasUrls() and self.has_valid_destination():
+            event.acceptProposedAction()
+            self.update_style(highlight=True)
+        else:
+            event.ignore()
+
+    def dragLeaveEvent(self, event):
+        """Handle drag leave events."""
+        self.update_style(highlight=False)
+        event.accept()
+
+    def dropEvent(self, event):
+        """Handle drop events."""
+        self.update_style(highlight=False)
+        if not self.has_valid_destination():
+            event.ignore()
+            self.main_window.show_status(
+                "Cannot drop: no valid destination folder for this tab.", error=True
+            )
+            return
+
+        urls = event.mimeData().urls()
+        if not urls:
+            event.ignore()
+            return
+
+        paths = [url.toLocalFile() for url in urls if url.isLocalFile()]
+        if not paths:
+            event.ignore()
+            return
+
+        event.acceptProposedAction()
+        self.main_window.handle_drop(self.tab_id, paths)
+
+
+class MainWindow(QMainWindow):
+    """Main application window for File Router."""
+    
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("File Router - Professional File Management")
+
+        # Free manual resize: just give a reasonable starting size and minimum
+        self.resize(1000, 600)
+        self.setMinimumSize(800, 500)
+
+        self.config_manager = ConfigManager(CONFIG_FILENAME)
+        self.config = self.config_manager.load()
+
+        self.tab_widget = QTabWidget()
+        self.tab_widget.setTabsClosable(False)
+        self.tab_widget.setMovable(True)
+        self.setCentralWidget(self.tab_widget)
+
+        self.status_bar = QStatusBar()
+        self.setStatusBar(self.status_bar)
+
+        self.tab_ui: Dict[str, Dict] = {}
+
+        # Queued or running drops per tab, for the Pause/Cancel controls
+        self._tab_jobs: Dict[str, List[TransferJob]] = {}
+
+        self.history_store = create_history_store(
+            self.config.get("history_backend", HISTORY_BACKEND_JSONL)
+        )
+        try:
+            migrated = self.history_store.migrate(self.config)
+        except Exception as e:
+            print(f"Error migrating history: {e}")
+            migrated = True  # tabs done before the failure left the config
+        if migrated:
+            self.config_manager.save(self.config)
+
+        # History entries arrive per item; coalesce their writes
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(CONFIG_SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self._flush_pending)
+
+        self.fingerprint_cache = FingerprintCache(FINGERPRINT_DIR)
+
+        self.transfer_engine = TransferEngine(self, self.fingerprint_cache)
+        self.transfer_engine.job_started.connect(self._on_job_started)
+        self.transfer_engine.item_finished.connect(self._on_item_finished)
+        self.transfer_engine.job_progress.connect(self._on_job_progress)
+        self.transfer_engine.bytes_progress.connect(self._on_bytes_progress)
+        self.transfer_engine.job_finished.connect(self._on_job_finished)
+        self.transfer_engine.queue_changed.connect(self._update_queue_status)
+        self.transfer_engine.jobs_per_device = normalize_jobs_per_device(
+            self.config.get("jobs_per_device", DEFAULT_JOBS_PER_DEVICE)
+        )
+
+        self.queue_label = QLabel()
+        self.status_bar.addPermanentWidget(self.queue_label)
+        self._queue_dialog: Optional[TransferQueueDialog] = None
+        # Drops being planned for their preview
+        self._plan_workers: List[PlanWorker] = []
+
+        self._apply_platform_styles()
+        self._build_menu()
+        self._build_toolbar()
+        self._rebuild_tabs()
+
+        self.show_status("✔ Application ready. Configure your routing tabs to get started.")
+
+        # Ask about interrupted drops once the window is up
+        self._interrupted_jobs = self._load_interrupted_jobs()
+        if self._interrupted_jobs:
+            QTimer.singleShot(0, self._offer_resume)
+
+    # ---------- Styling ----------
+
+    def _apply_platform_styles(self) -> None:
+        """Apply platform-specific styling for Windows, macOS, and Linux."""
+        system = platform.system()
+
+        if system == "Windows":
+            self.setStyleSheet(
+                """
+                QMainWindow {
+                    background-color: #FFFFFF;
+                }
+                QMenuBar {
+                    background-color: #F3F3F3;
+                    color: #212529;
+                    border-bottom: 1px solid #E0E0E0;
+                    padding: 4px;
+                    font-size: 13px;
+                }
+                QMenuBar::item {
+                    padding: 6px 12px;
+                    background-color: transparent;
+                }
+                QMenuBar::item:selected {
+                    background-color: #E5E5E5;
+                    border-radius: 4px;
+                }
+                QToolBar {
+                    background-color: #F8F9FA;
+                    border-bottom: 2px solid #DEE2E6;
+                    spacing: 8px;
+                    padding: 8px;
+                }
+                QToolButton {
+                    background-color: #FFFFFF;
+                    border: 2px solid #0078D7;
+                    border-radius: 6px;
+                    padding: 8px 16px;
+                    color: #0078D7;
+                    font-weight: 600;
+                    font-size: 13px;
+                    min-width: 90px;
+                }
+                QToolButton:hover {
+                    background-color: #0078D7;
+                    color: #FFFFFF;
+                }
+                QToolButton:pressed {
+                    background-color: #005A9E;
+                }
+                QTabWidget::pane {
+                    border: 2px solid #DEE2E6;
+                    border-radius: 6px;
+                    background-color: #FFFFFF;
+                    top: -1px;
+                }
+                QTabBar::tab {
+                    background-color: #E9ECEF;
+                    color: #495057;
+                    border: 2px solid #DEE2E6;
+                    border-bottom: none;
+                    padding: 10px 20px;
+                    margin-right: 2px;
+                    border-top-left-radius: 6px;
+                    border-top-right-radius: 6px;
+                    font-weight: 600;
+                    font-size: 13px;
+                }
+                QTabBar::tab:selected {
+                    background-color: #FFFFFF;
+                    color: #0078D7;
+                    border-bottom: 3px solid #0078D7;
+                }
+                QTabBar::tab:hover {
+                    background-color: #F8F9FA;
+                }
+                QPushButton {
+                    background-color: #0078D7;
+                    color: #FFFFFF;
+                    border: none;
+                    border-radius: 5px;
+                    padding: 8px 16px;
+                    font-weight: 600;
+                    font-size: 13px;
+                }
+                QPushButton:hover {
+                    background-color: #005A9E;
+                }
+                QPushButton:pressed {
+                    background-color: #004578;
+                }
+                QPushButton#secondaryButton {
+                    background-color: #FFFFFF;
+                    color: #495057;
+                    border: 2px solid #ADB5BD;
+                }
+                QPushButton#secondaryButton:hover {
+                    background-color: #F8F9FA;
+                    border-color: #6C757D;
+                }
+                QRadioButton {
+                    color: #212529;
+                    font-size: 13px;
+                    font-weight: 500;
+                    spacing: 8px;
+                }
+                QRadioButton::indicator {
+                    width: 18px;
+                    height: 18px;
+                }
+                QLabel {
+                    color: #212529;
+                    font-size: 13px;
+                }
+                QStatusBar {
+                    background-color: #F8F9FA;
+                    color: #495057;
+                    border-top: 2px solid #DEE2E6;
+                    font-size: 12px;
+                }
+            """
+            )
+
+        elif system == "Darwin":  # macOS
+            self.setStyleSheet(
+                """
+                QMainWindow {
+                    background-color: #FFFFFF;
+                }
+                QMenuBar {
+                    background-color: transparent;
+                    color: #1D1D1F;
+                }
+                QToolBar {
+                    background-color: #F5F5F7;
+                    border-bottom: 1px solid #D2D2D7;
+                    spacing: 10px;
+                    padding: 10px;
+                }
+                QToolButton {
+                    background-color: #007AFF;
+                    border: none;
+                    border-radius: 8px;
+                    padding: 8px 18px;
+                    color: #FFFFFF;
+                    font-weight: 600;
+                    font-size: 13px;
+                    min-width: 90px;
+                }
+                QToolButton:hover {
+                    background-color: #0051D5;
+                }
+                QTabWidget::pane {
+                    border: 1px solid #D2D2D7;
+                    border-radius: 8px;
+                    background-color: #FFFFFF;
+                }
+                QTabBar::tab {
+                    background-color: #F5F5F7;
+                    color: #1D1D1F;
+                    border: 1px solid #D2D2D7;
+                    padding: 10px 22px;
+                    margin-right: 4px;
+                    border-top-left-radius: 8px;
+                    border-top-right-radius: 8px;
+                    font-size: 13px;
+                }
+                QTabBar::tab:selected {
+                    background-color: #FFFFFF;
+                    color: #007AFF;
+                    font-weight: 600;
+                }
+                QPushButton {
+                    background-color: #007AFF;
+                    color: #FFFFFF;
+                    border: none;
+                    border-radius: 6px;
+                    padding: 8px 16px;
+                    font-weight: 500;
+                    font-size: 13px;
+                }
+                QPushButton:hover {
+                    background-color: #0051D5;
+                }
+                QPushButton#secondaryButton {
+                    background-color: #F5F5F7;
+                    color: #1D1D1F;
+                    border: 1px solid #D2D2D7;
+                }
+                QRadioButton {
+                    color: #1D1D1F;
+                    font-size: 13px;
+                    spacing: 8px;
+                }
+                QLabel {
+                    color: #1D1D1F;
+                    font-size: 13px;
+                }
+                QStatusBar {
+                    background-color: #F5F5F7;
+                    color: #86868B;
+                    border-top: 1px solid #D2D2D7;
+                }
+            """
+            )
+
+        else:  # Linux
+            self.setStyleSheet(
+                """
+                QMainWindow {
+                    background-color: #FFFFFF;
+                }
+                QMenuBar {
+                    background-color: #F6F6F6;
+                    color: #2C2C2C;
+                    border-bottom: 1px solid #DADADA;
+                    padding: 4px;
+                }
+                QToolBar {
+                    background-color: #FAFAFA;
+                    border-bottom: 2px solid #E0E0E0;
+                    spacing: 8px;
+                    padding: 8px;
+                }
+                QToolButton {
+                    background-color: #FFFFFF;
+                    border: 2px solid #1976D2;
+                    border-radius: 4px;
+                    padding: 8px 16px;
+                    color: #1976D2;
+                    font-weight: 600;
+                    font-size: 13px;
+                    min-width: 90px;
+                }
+                QToolButton:hover {
+                    background-color: #1976D2;
+                    color: #FFFFFF;
+                }
+                QTabWidget::pane {
+                    border: 2px solid #E0E0E0;
+                    border-radius: 4px;
+                    background-color: #FFFFFF;
+                }
+                QTabBar::tab {
+                    background-color: #F0F0F0;
+                    color: #424242;
+                    border: 2px solid #E0E0E0;
+                    padding: 10px 20px;
+                    margin-right: 2px;
+                    border-top-left-radius: 4px;
+                    border-top-right-radius: 4px;
+                    font-weight: 600;
+                    font-size: 13px;
+                }
+                QTabBar::tab:selected {
+                    background-color: #FFFFFF;
+                    color: #1976D2;
+                    border-bottom: 3px solid #1976D2;
+                }
+                QPushButton {
+                    background-color: #1976D2;
+                    color: #FFFFFF;
+                    border: none;
+                    border-radius: 4px;
+                    padding: 8px 16px;
+                    font-weight: 600;
+                    font-size: 13px;
+                }
+                QPushButton:hover {
+                    background-color: #1565C0;
+                }
+                QPushButton#secondaryButton {
+                    background-color: #FFFFFF;
+                    color: #424242;
+                    border: 2px solid #BDBDBD;
+                }
+                QRadioButton {
+                    color: #2C2C2C;
+                    font-size: 13px;
+                    font-weight: 500;
+                    spacing: 8px;
+                }
+                QLabel {
+                    color: #2C2C2C;
+                    font-size: 13px;
+                }
+                QStatusBar {
+                    background-color: #FAFAFA;
+                    color: #616161;
+                    border-top: 2px solid #E0E0E0;
+                }
+            """
+            )
+
+    # ---------- Menu & Toolbar ----------
+
+    def _build_menu(self) -> None:
+        """Build the application menu bar."""
+        menu_bar = QMenuBar(self)
+        self.setMenuBar(menu_bar)
+
+        # File menu
+        file_menu = QMenu("📄 File", self)
+        menu_bar.addMenu(file_menu)
+
+        import_action = file_menu.addAction("📥 Import Configuration…")
+        import_action.triggered.connect(self.import_config)
+
+        export_action = file_menu.addAction("📤 Export Configuration…")
+        export_action.triggered.connect(self.export_config)
+
+        file_menu.addSeparator()
+        storage_menu = file_menu.addMenu("🗄️ History Storage")
+        storage_group = QActionGroup(self)
+        self._history_backend_actions: Dict[str, QAction] = {}
+        for backend, label in (
+            (HISTORY_BACKEND_JSONL, "JSON Lines Journal"),
+            (HISTORY_BACKEND_SQLITE, "SQLite Database"),
+        ):
+            action = storage_menu.addAction(label)
+            action.setCheckable(True)
+            action.setChecked(
+                self.config.get("history_backend", HISTORY_BACKEND_JSONL) == backend
+            )
+            action.setEnabled(backend != HISTORY_BACKEND_SQLITE or sqlite3 is not None)
+            action.triggered.connect(
+                lambda _, b=backend: self.set_history_backend(b)
+            )
+            storage_group.addAction(action)
+            self._history_backend_actions[backend] = action
+
+        file_menu.addSeparator()
+        exit_action = file_menu.addAction("🚪 Exit")
+        exit_action.triggered.connect(self.close)
+
+        # Tabs menu
+        tabs_menu = QMenu("📑 Tabs", self)
+        menu_bar.addMenu(tabs_menu)
+
+        add_tab_action = tabs_menu.addAction("➕ Add Tab…")
+        add_tab_action.triggered.connect(self.add_tab)
+
+        rename_tab_action = tabs_menu.addAction("✏️ Rename Current Tab…")
+        rename_tab_action.triggered.connect(self.rename_current_tab)
+
+        delete_tab_action = tabs_menu.addAction("🗑️ Delete Current Tab…")
+        delete_tab_action.triggered.connect(self.delete_current_tab)
+
+        # Transfers menu
+        transfers_menu = QMenu("🚚 Transfers", self)
+        menu_bar.addMenu(transfers_menu)
+
+        queue_action = transfers_menu.addAction("📋 Transfer Queue…")
+        queue_action.triggered.connect(self.show_queue)
+
+        per_device_menu = transfers_menu.addMenu("💽 Parallel Drops per Disk")
+        per_device_group = QActionGroup(self)
+        for count in range(1, MAX_JOBS_PER_DEVICE + 1):
+            action = per_device_menu.addAction(str(count))
+            action.setCheckable(True)
+            action.setChecked(count == self.transfer_engine.jobs_per_device)
+            action.triggered.connect(
+                lambda _, c=count: self.set_jobs_per_device(c)
+            )
+            per_device_group.addAction(action)
+
+        # Help menu
+        help_menu = QMenu("❓ Help", self)
+        menu_bar.addMenu(help_menu)
+
+        about_action = help_menu.addAction("ℹ️ About")
+        about_action.triggered.connect(self.show_about)
+
+    def _build_toolbar(self) -> None:
+        """Build the application toolbar."""
+        toolbar = QToolBar("Main Toolbar")
+        toolbar.setMovable(False)
+        toolbar.setIconSize(QSize(24, 24))
+        self.addToolBar(toolbar)
+
+        add_action = QAction("➕ Add Tab", self)
+        add_action.triggered.connect(self.add_tab)
+        toolbar.addAction(add_action)
+
+        toolbar.addSeparator()
+
+        rename_action = QAction("✏️ Rename", self)
+        rename_action.triggered.connect(self.rename_current_tab)
+        toolbar.addAction(rename_action)
+
+        delete_action = QAction("🗑️ Delete", self)
+        delete_action.triggered.connect(self.delete_current_tab)
+        toolbar.addAction(delete_action)
+
+        toolbar.addSeparator()
+
+        import_action = QAction("📥 Import", self)
+        import_action.triggered.connect(self.import_config)
+        toolbar.addAction(import_action)
+
+        export_action = QAction("📤 Export", self)
+        export_action.triggered.connect(self.export_config)
+        toolbar.addAction(export_action)
+
+        toolbar.addSeparator()
+
+        queue_action = QAction("📋 Queue", self)
+        queue_action.triggered.connect(self.show_queue)
+        toolbar.addAction(queue_action)
+
+    # ---------- Tab Management ----------
+
+    def _rebuild_tabs(self) -> None:
+        """Rebuild all tabs from configuration."""
+        self.tab_widget.clear()
+        self.tab_ui.clear()
+        for tab in self.config["tabs"]:
+            self._create_tab(tab)
+
+    def _create_tab(self, tab: Dict[str, Any]) -> int:
+        """Create a new tab widget from configuration."""
+        page = QWidget()
+        page.setProperty("tab_id", tab["id"])
+
+        vbox = QVBoxLayout(page)
+        vbox.setSpacing(15)
+        vbox.setContentsMargins(20, 20, 20, 20)
+
+        # Title
+        title_label = QLabel(f"📂 Destination for tab: {tab['name']}")
+        title_label.setStyleSheet(
+            "font-weight: bold; font-size: 15px; color: #212529;"
+        )
+        vbox.addWidget(title_label)
+
+        # Separator
+        line = QFrame()
+        line.setFrameShape(QFrame.HLine)
+        line.setFrameShadow(QFrame.Sunken)
+        vbox.addWidget(line)
+
+        # Path row
+        path_row = QHBoxLayout()
+        path_label_caption = QLabel("📁 Folder:")
+        path_label_caption.setMinimumWidth(70)
+        path_label_caption.setStyleSheet("font-weight: 600;")
+        path_row.addWidget(path_label_caption)
+
+        path_label = QLabel()
+        path_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        path_label.setStyleSheet(
+            "padding: 5px; background-color: #F8F9FA; border-radius: 4px;"
+        )
+        path_row.addWidget(path_label, stretch=1)
+
+        assign_btn = QPushButton("Set Destination Folder")
+        assign_btn.clicked.connect(lambda _, tid=tab["id"]: self.assign_folder(tid))
+        path_row.addWidget(assign_btn)
+
+        clear_btn = QPushButton("Clear")
+        clear_btn.setObjectName("secondaryButton")
+        clear_btn.clicked.connect(lambda _, tid=tab["id"]: self.clear_folder(tid))
+        path_row.addWidget(clear_btn)
+
+        history_btn = QPushButton("History")
+        history_btn.setObjectName("secondaryButton")
+        history_btn.clicked.connect(lambda _, tid=tab["id"]: self.show_history(tid))
+        path_row.addWidget(history_btn)
+
+        settings_btn = QPushButton("Transfer Settings")
+        settings_btn.setObjectName("secondaryButton")
+        settings_btn.clicked.connect(
+            lambda _, tid=tab["id"]: self.edit_transfer_settings(tid)
+        )
+        path_row.addWidget(settings_btn)
+
+        vbox.addLayout(path_row)
+
+        # Operation row: 4 modes
+        operation_row = QHBoxLayout()
+        operation_label = QLabel("⚙️ Operation:")
+        operation_label.setMinimumWidth(70)
+        operation_label.setStyleSheet("font-weight: 600;")
+        operation_row.addWidget(operation_label)
+
+        copy_replace_radio = QRadioButton("Copy (Replace existing)")
+        copy_new_radio = QRadioButton("Copy (New only)")
+        move_replace_radio = QRadioButton("Move (Replace existing)")
+        move_new_radio = QRadioButton("Move (New only)")
+
+        button_group = QButtonGroup(page)
+        button_group.addButton(copy_replace_radio)
+        button_group.addButton(copy_new_radio)
+        button_group.addButton(move_replace_radio)
+        button_group.addButton(move_new_radio)
+
+        op = tab.get("operation", OP_COPY_REPLACE)
+        if op == OP_COPY_REPLACE:
+            copy_replace_radio.setChecked(True)
+        elif op == OP_COPY_NEW:
+            copy_new_radio.setChecked(True)
+        elif op == OP_MOVE_REPLACE:
+            move_replace_radio.setChecked(True)
+        else:
+            move_new_radio.setChecked(True)
+
+        copy_replace_radio.toggled.connect(
+            lambda checked, tid=tab["id"]: self.set_operation(
+                tid, OP_COPY_REPLACE
+            )
+            if checked
+            else None
+        )
+        copy_new_radio.toggled.connect(
+            lambda checked, tid=tab["id"]: self.set_operation(
+                tid, OP_COPY_NEW
+            )
+            if checked
+            else None
+        )
+        move_replace_radio.toggled.connect(
+            lambda checked, tid=tab["id"]: self.set_operation(
+                tid, OP_MOVE_REPLACE
+            )
+            if checked
+            else None
+        )
+        move_new_radio.toggled.connect(
+            lambda checked, tid=tab["id"]: self.set_operation(
+                tid, OP_MOVE_NEW
+            )
+            if checked
+            else None
+        )
+
+        for rb in (
+            copy_replace_radio,
+            copy_new_radio,
+            move_replace_radio,
+            move_new_radio,
+        ):
+            operation_row.addWidget(rb)
+
+        operation_row.addStretch(1)
+        vbox.addLayout(operation_row)
+
+        vbox.addSpacing(10)
+
+        # Drop area
+        drop_area = DropArea(self, tab["id"])
+        vbox.addWidget(drop_area)
+
+        # Transfer progress and controls (hidden while idle)
+        progress_row = QHBoxLayout()
+        progress_bar = QProgressBar()
+        progress_bar.setRange(0, 1000)
+        progress_bar.setVisible(False)
+        progress_row.addWidget(progress_bar, 1)
+
+        pause_btn = QPushButton("⏸ Pause")
+        pause_btn.setObjectName("secondaryButton")
+        pause_btn.setVisible(False)
+        pause_btn.clicked.connect(
+            lambda _, tid=tab["id"]: self.toggle_pause_transfers(tid)
+        )
+        progress_row.addWidget(pause_btn)
+
+        cancel_btn = QPushButton("⏹ Cancel")
+        cancel_btn.setObjectName("secondaryButton")
+        cancel_btn.setVisible(False)
+        cancel_btn.clicked.connect(
+            lambda _, tid=tab["id"]: self.cancel_transfers(tid)
+        )
+        progress_row.addWidget(cancel_btn)
+        vbox.addLayout(progress_row)
+
+        progress_label = QLabel()
+        progress_label.setStyleSheet("color: #6C757D; font-size: 12px;")
+        progress_label.setVisible(False)
+        vbox.addWidget(progress_label)
+
+        vbox.addStretch(1)
+
+        index = self.tab_widget.addTab(page, tab["name"])
+
+        self.tab_ui[tab["id"]] = {
+            "page": page,
+            "title_label": title_label,
+            "path_label": path_label,
+            "drop_area": drop_area,
+            "progress_bar": progress_bar,
+            "progress_label": progress_label,
+            "pause_btn": pause_btn,
+            "cancel_btn": cancel_btn,
+        }
+
+        self._update_tab_path_ui(tab["id"], tab.get("path", ""))
+
+        return index
+
+    def _get_tab_config_by_id(self, tab_id: str) -> Optional[Dict[str, Any]]:
+        """Get tab configuration by ID."""
+        for t in self.config["tabs"]:
+            if t["id"] == tab_id:
+                return t
+        return None
+
+    def _update_tab_path_ui(self, tab_id: str, path: str) -> None:
+        """Update the UI elements for a tab's path."""
+        ui = self.tab_ui.get(tab_id)
+        if not ui:
+            return
+
+        path_label = ui["path_label"]
+        drop_area = ui["drop_area"]
+
+        path = path or ""
+        if not path:
+            path_label.setText("⚠️ No folder assigned")
+            path_label.setStyleSheet(
+                "color: #6C757D; padding: 5px; background-color: #F8F9FA; border-radius: 4px;"
+            )
+        elif not os.path.isdir(path):
+            path_label.setText(f"❌ {path}  (invalid)")
+            path_label.setStyleSheet(
+                "color: #DC3545; padding: 5px; background-color: #F8D7DA; border-radius: 4px;"
+            )
+        else:
+            path_label.setText(f"✅ {path}")
+            path_label.setStyleSheet(
+                "color: #198754; padding: 5px; background-color: #D1E7DD; border-radius: 4px;"
+            )
+
+        drop_area.set_destination(path)
+
+    # ---------- History ----------
+
+    def _add_history_entry(
+        self,
+        tab_id: str,
+        operation: str,
+        src: str,
+        dest: str,
+        result: str,
+        checksum: Optional[str] = None,
+    ) -> None:
+        """Add a history entry to a tab (with timestamp)."""
+        entry = {
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "operation": operation,
+            "source": src,
+            "destination": dest,
+            "result": result,
+        }
+        if checksum:
+            entry["checksum"] = checksum
+        self.history_store.append(tab_id, entry)
+        self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        """Write pending history entries once the timer fires."""
+        # Not restarted on purpose: a long drop still saves every few seconds
+        if not self._save_timer.isActive():
+            self._save_timer.start()
+
+    def _flush_pending(self) -> None:
+        """Write pending history entries now."""
+        self._save_timer.stop()
+        self.history_store.flush()
+        self.fingerprint_cache.flush()
+
+    def set_history_backend(self, backend: str) -> None:
+        """Switch the history store, copying existing entries across."""
+        current = self.config.get("history_backend", HISTORY_BACKEND_JSONL)
+        if backend == current:
+            return
+
+        try:
+            new_store = open_history_store(backend)
+        except Exception as e:
+            self._history_backend_actions[current].setChecked(True)
+            self.show_status(f"❌ Could not open {backend} history: {e}", error=True)
+            return
+
+        old_store = self.history_store
+        old_store.flush()
+        for tab in self.config["tabs"]:
+            # Replace what an earlier switch left there instead of adding to it
+            new_store.delete(tab["id"])
+            for entry in old_store.entries(tab["id"]):
+                new_store.append(tab["id"], entry)
+        new_store.flush()
+        # The old store is left on disk untouched as a backup
+        old_store.close()
+
+        self.history_store = new_store
+        self.config["history_backend"] = backend
+        self.config_manager.save(self.config)
+        self.show_status(f"✔ History is now stored in: {backend}")
+
+    def show_history(self, tab_id: str) -> None:
+        """Show history for a tab using custom dialog."""
+        tab = self._get_tab_config_by_id(tab_id)
+        if not tab:
+            return
+
+        dialog = HistoryDialog(tab["name"], self.history_store, tab_id, self)
+        dialog.exec()
+
+    # ---------- Folder & Operation Settings ----------
+
+    def assign_folder(self, tab_id: str) -> None:
+        """Assign a destination folder to a tab."""
+        folder = QFileDialog.getExistingDirectory(
+            self, "Select Destination Folder", os.path.expanduser("~")
+        )
+        if not folder:
+            return
+
+        tab = self._get_tab_config_by_id(tab_id)
+        if not tab:
+            return
+
+        tab["path"] = folder
+        self._update_tab_path_ui(tab_id, folder)
+        self.config_manager.save(self.config)
+        self.show_status(f"✔ Assigned folder for tab '{tab['name']}': {folder}")
+
+    def clear_folder(self, tab_id: str) -> None:
+        """Clear the destination folder for a tab."""
+        tab = self._get_tab_config_by_id(tab_id)
+        if not tab:
+            return
+        tab["path"] = ""
+        self._update_tab_path_ui(tab_id, "")
+        self.config_manager.save(self.config)
+        self.show_status(f"✔ Cleared folder for tab '{tab['name']}'")
+
+    def set_operation(self, tab_id: str, operation: str) -> None:
+        """Set the operation mode for a tab."""
+        tab = self._get_tab_config_by_id(tab_id)
+        if not tab:
+            return
+        tab["operation"] = operation
+        self.config_manager.save(self.config)
+        self.show_status(
+            f"✔ Set operation for tab '{tab['name']}' to '{operation.upper()}'"
+        )
+
+    def edit_transfer_settings(self, tab_id: str) -> None:
+        """Edit the transfer tuning options of a tab."""
+        tab = self._get_tab_config_by_id(tab_id)
+        if not tab:
+            return
+
+        dialog = TransferSettingsDialog(tab, self)
+        if dialog.exec() != QDialog.Accepted:
+            return
+
+        tab.update(dialog.values())
+        self.config_manager.save(self.config)
+        self.show_status(f"✔ Updated transfer settings for tab '{tab['name']}'")
+
+    # ---------- Tab Actions ----------
+
+    def add_tab(self) -> None:
+        """Add a new tab."""
+        default_name = f"L{len(self.config['tabs']) + 1}"
+        name, ok = QInputDialog.getText(
+            self, "Add Tab", "Enter tab name:", text=default_name
+        )
+        if not ok or not name.strip():
+            return
+
+        name = name.strip()
+        new_tab = {
+            "id": str(uuid.uuid4()),
+            "name": name,
+            "path": "",
+            "operation": OP_COPY_REPLACE,
+            **default_transfer_settings(),
+        }
+        self.config["tabs"].append(new_tab)
+        self._create_tab(new_tab)
+        self.config_manager.save(self.config)
+        self.show_status(f"✔ Added tab '{name}'")
+
+    def rename_current_tab(self) -> None:
+        """Rename the currently selected tab."""
+        index = self.tab_widget.currentIndex()
+        if index < 0:
+            return
+
+        page = self.tab_widget.widget(index)
+        tab_id = page.property("tab_id")
+        tab = self._get_tab_config_by_id(tab_id)
+        if not tab:
+            return
+
+        current_name = tab["name"]
+        new_name, ok = QInputDialog.getText(
+            self, "Rename Tab", "Enter new tab name:", text=current_name
+        )
+        if not ok or not new_name.strip():
+            return
+
+        new_name = new_name.strip()
+        tab["name"] = new_name
+
+        self.tab_widget.setTabText(index, new_name)
+        ui = self.tab_ui.get(tab_id)
+        if ui:
+            ui["title_label"].setText(f"📂 Destination for tab: {new_name}")
+
+        self.config_manager.save(self.config)
+        self.show_status(f"✔ Renamed tab to '{new_name}'")
+
+    def delete_current_tab(self) -> None:
+        """Delete the currently selected tab."""
+        index = self.tab_widget.currentIndex()
+        if index < 0:
+            return
+
+        page = self.tab_widget.widget(index)
+        tab_id = page.property("tab_id")
+        tab = self._get_tab_config_by_id(tab_id)
+        if not tab:
+            return
+
+        reply = QMessageBox.question(
+            self,
+            "Delete Tab",
+            f"Are you sure you want to delete tab '{tab['name']}'?",
+            QMessageBox.Yes | QMessageBox.No,
+        )
+        if reply != QMessageBox.Yes:
+            return
+
+        self.config["tabs"] = [t for t in self.config["tabs"] if t["id"] != tab_id]
+        self.tab_widget.removeTab(index)
+        self.tab_ui.pop(tab_id, None)
+        self.history_store.delete(tab_id)
+
+        self.config_manager.save(self.config)
+        self.show_status(f"✔ Deleted tab '{tab['name']}'")
+
+    # ---------- Drag & Drop / File Operations ----------
+
+    def handle_drop(self, tab_id: str, src_paths: List[str]) -> None:
+        """Queue dropped files/folders on the background transfer engine."""
+        tab = self._get_tab_config_by_id(tab_id)
+        if not tab:
+            self.show_status("❌ Internal error: tab not found.", error=True)
+            return
+
+        dest_root = tab.get("path") or ""
+        if not dest_root or not os.path.isdir(dest_root):
+            self.show_status(
+                f"❌ No valid destination folder for tab '{tab['name']}'", error=True
+            )
+            return
+
+        mode = tab.get("operation", OP_COPY_REPLACE)
+        job = TransferJob(
+            tab_id,
+            tab["name"],
+            mode,
+            src_paths,
+            dest_root,
+            settings=tab,
+        )
+        if job.settings["preview"]:
+            self._preview_drop(job)
+            return
+        self._start_drop(job)
+
+    def _preview_drop(self, job: TransferJob) -> None:
+        """Plan a drop in the background and show it before it starts."""
+        worker = PlanWorker(self.transfer_engine, job, self)
+        worker.planned.connect(self._on_drop_planned)
+        self._plan_workers.append(worker)
+        worker.start()
+        self.show_status(
+            f"🔍 Planning {len(job.src_paths)} item(s) for tab '{job.tab_name}'…"
+        )
+
+    def _on_drop_planned(self, job: TransferJob, plan: Optional[TransferPlan]) -> None:
+        """Show the dry-run preview and start the drop if it is confirmed."""
+        for worker in list(self._plan_workers):
+            if worker.job is job:
+                worker.wait()
+                self._plan_workers.remove(worker)
+        if plan is None:
+            return
+
+        dialog = PlanPreviewDialog(
+            job, plan, self.transfer_engine.measured_rate(job.dest_root), self
+        )
+        if dialog.exec() == QDialog.Accepted:
+            job.plan = plan
+            self._start_drop(job)
+        else:
+            self.show_status(
+                f"🔍 Dry run for tab '{job.tab_name}': {plan.summary()}; "
+                "nothing was transferred"
+            )
+
+    def _start_drop(self, job: TransferJob) -> None:
+        """Queue a drop on the transfer engine and report it."""
+        self._submit_job(job)
+
+        pending = self.transfer_engine.pending_count()
+        if pending > 1:
+            self.show_status(
+                f"⏳ Queued {len(job.src_paths)} item(s) for tab '{job.tab_name}' "
+                f"({pending - 1} other drop(s) queued or running)"
+            )
+        else:
+            self.show_status(
+                f"⏳ Teleporting {len(job.src_paths)} item(s) for tab "
+                f"'{job.tab_name}'…"
+            )
+
+    @staticmethod
+    def _load_interrupted_jobs() -> List[TransferJob]:
+        """Recreate the drops whose transfer journals were left behind."""
+        try:
+            names = sorted(
+                n for n in os.listdir(TRANSFER_JOURNAL_DIR) if n.endswith(".jsonl")
+            )
+        except OSError:
+            return []
+
+        jobs = []
+        for name in names:
+            path = os.path.join(TRANSFER_JOURNAL_DIR, name)
+            try:
+                jobs.append(TransferJob.from_journal(path))
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Error reading transfer journal {name}: {e}")
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    print(f"Error removing transfer journal {name}: {e}")
+        return jobs
+
+    def _offer_resume(self) -> None:
+        """Offer to resume drops that a crash or shutdown interrupted."""
+        jobs, self._interrupted_jobs = self._interrupted_jobs, []
+        if not jobs:
+            return
+
+        summary = "\n".join(
+            f"• {len(job.src_paths) - len(job.journal.done)} item(s) to "
+            f"'{job.dest_root}' (tab '{job.tab_name}')"
+            for job in jobs
+        )
+        reply = QMessageBox.question(
+            self,
+            "Resume Transfers",
+            f"{len(jobs)} drop(s) did not finish last time:\n\n{summary}\n\n"
+            "Resume them? Finished files are skipped and partly copied files "
+            "continue where they stopped.",
+            QMessageBox.Yes | QMessageBox.No,
+        )
+        if reply != QMessageBox.Yes:
+            for job in jobs:
+                job.journal.close(remove=True)
+            self.show_status("🗑️ Interrupted transfers discarded")
+            return
+
+        for job in jobs:
+            self._submit_job(job)
+        self.show_status(f"⏳ Resuming {len(jobs)} interrupted drop(s)…")
+
+    def show_queue(self) -> None:
+        """Show the transfer queue window."""
+        if self._queue_dialog is None or not self._queue_dialog.isVisible():
+            self._queue_dialog = TransferQueueDialog(self)
+        self._queue_dialog.show()
+        self._queue_dialog.raise_()
+
+    def set_jobs_per_device(self, count: int) -> None:
+        """Set how many drops may run at once on the same destination disk."""
+        count = normalize_jobs_per_device(count)
+        self.config["jobs_per_device"] = count
+        self.transfer_engine.jobs_per_device = count
+        self.transfer_engine.reschedule()
+        self.config_manager.save(self.config)
+        self.show_status(f"✔ Up to {count} drop(s) per disk at a time")
+
+    def _update_queue_status(self) -> None:
+        """Summarize the transfer queue in the status bar."""
+        jobs = self.transfer_engine.jobs()
+        running = sum(1 for job in jobs if job.started)
+        waiting = len(jobs) - running
+        self.queue_label.setText(
+            f"📋 {running} running • {waiting} waiting" if jobs else ""
+        )
+
+    def _submit_job(self, job: TransferJob) -> None:
+        """Queue a job on the engine and track it for its tab's controls."""
+        self._tab_jobs.setdefault(job.tab_id, []).append(job)
+        self.transfer_engine.submit(job)
+
+    def toggle_pause_transfers(self, tab_id: str) -> None:
+        """Pause all drops of a tab, or resume them if they are paused."""
+        self.toggle_pause_jobs(self._tab_jobs.get(tab_id, []))
+
+    def toggle_pause_jobs(self, jobs: List[TransferJob]) -> None:
+        """Pause the given drops, or resume them if they are all paused."""
+        if not jobs:
+            return
+        pause = not all(job.paused for job in jobs)
+        for job in jobs:
+            if pause:
+                job.pause()
+            else:
+                job.resume()
+        # A paused waiting drop gives its disk slot to the next one
+        self.transfer_engine.reschedule()
+
+        for tab_id in {job.tab_id for job in jobs}:
+            ui = self.tab_ui.get(tab_id)
+            if not ui:
+                continue
+            tab_paused = all(job.paused for job in self._tab_jobs.get(tab_id, []))
+            ui["pause_btn"].setText("▶ Resume" if tab_paused else "⏸ Pause")
+            if pause:
+                ui["progress_bar"].setFormat("Paused  —  %p%")
+        self.show_status("⏸ Transfers paused" if pause else "▶ Transfers resumed")
+
+    def cancel_transfers(self, tab_id: str) -> None:
+        """Cancel all drops of a tab, rolling back or keeping the current item."""
+        self.cancel_jobs(self._tab_jobs.get(tab_id, []))
+
+    def cancel_jobs(self, jobs: List[TransferJob]) -> None:
+        """Cancel drops after asking whether to keep partial items."""
+        if not jobs:
+            return
+
+        reply = QMessageBox.question(
+            self,
+            "Cancel Transfers",
+            "Keep the partly copied item so the drop can be resumed the next "
+            "time you start the app?\n\n"
+            "Yes: keep it and resume later\n"
+            "No: roll it back and discard the rest of the drop",
+            QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel,
+        )
+        if reply == QMessageBox.Cancel:
+            return
+        for job in jobs:
+            job.cancel(keep_partial=reply == QMessageBox.Yes)
+        self.transfer_engine.reschedule()
+        self.show_status("⏹ Cancelling transfers…")
+
+    def _on_job_started(self, job: TransferJob) -> None:
+        """Show the progress bar of the tab whose drop is now running."""
+        ui = self.tab_ui.get(job.tab_id)
+        if not ui:
+            return
+        ui["progress_bar"].setValue(0)
+        ui["progress_bar"].setFormat("Preparing…")
+        ui["progress_bar"].setVisible(True)
+        ui["progress_label"].setText(f"0 / {len(job.src_paths)} item(s)")
+        ui["progress_label"].setVisible(True)
+        ui["pause_btn"].setText("▶ Resume" if job.paused else "⏸ Pause")
+        ui["pause_btn"].setVisible(True)
+        ui["cancel_btn"].setVisible(True)
+
+    def _on_item_finished(
+        self, job: TransferJob, src: str, target: str, result: str
+    ) -> None:
+        """Record the outcome of a single dropped item."""
+        with job.lock:
+            checksum = job.checksums.get(src)
+        self._add_history_entry(job.tab_id, job.mode, src, target, result, checksum)
+
+    def _on_job_progress(self, job: TransferJob, done: int, total: int) -> None:
+        """Show how many dropped items are finished."""
+        self._on_bytes_progress(job)
+
+    def _on_bytes_progress(self, job: TransferJob) -> None:
+        """Show aggregate and current-file byte progress of a running drop."""
+        ui = self.tab_ui.get(job.tab_id)
+        if not ui:
+            return
+
+        with job.lock:
+            total, done = job.total_bytes, job.bytes_done
+            current, file_size = job.current_file, job.current_file_size
+            file_done = job.current_file_done
+
+        progress_bar = ui["progress_bar"]
+        progress_bar.setValue(min(1000, int(done * 1000 / total)) if total else 0)
+        text = f"%p%  —  {format_size(done)} of {format_size(total)}"
+        if job.paused:
+            text = "Paused  —  " + text
+        else:
+            eta = job.eta()
+            if eta is not None and done < total:
+                text += f"  —  {format_duration(eta)} left"
+        progress_bar.setFormat(text)
+
+        text = f"{job.items_done} / {len(job.src_paths)} item(s)"
+        if current and file_size:
+            percent = min(100, int(file_done * 100 / file_size))
+            text += f"  •  {os.path.basename(current)} ({percent}%)"
+        ui["progress_label"].setText(text)
+
+    def _on_job_finished(self, job: TransferJob) -> None:
+        """Summarize a completed drop in the status bar."""
+        # One write for the whole drop's history
+        self._flush_pending()
+
+        jobs = self._tab_jobs.get(job.tab_id, [])
+        if job in jobs:
+            jobs.remove(job)
+        ui = self.tab_ui.get(job.tab_id)
+        if ui and not jobs:
+            for key in ("progress_bar", "progress_label", "pause_btn", "cancel_btn"):
+                ui[key].setVisible(False)
+
+        op_label = {
+            OP_COPY_REPLACE: "Copy & Replace",
+            OP_COPY_NEW: "Copy New Only",
+            OP_MOVE_REPLACE: "Move & Replace",
+            OP_MOVE_NEW: "Move New Only",
+        }.get(job.mode, job.mode)
+
+        if job.cancelled and not self.transfer_engine.is_stopping():
+            kept = "kept for resume" if job.keep_partial else "rolled back"
+            if job.merged_on_cancel:
+                kept = f"left with {job.merged_on_cancel} file(s) already merged"
+            self.show_status(
+                f"⏹ {op_label} cancelled after {job.successes} item(s) for tab "
+                f"'{job.tab_name}'; the unfinished item was {kept}"
+            )
+        elif job.failures == 0:
+            self.show_status(
+                f"✔ {op_label}: {job.successes} item(s) to '{job.dest_root}' "
+                f"for tab '{job.tab_name}'"
+            )
+        else:
+            self.show_status(
+                f"⚠️ {op_label}: {job.successes} item(s) OK, {job.failures} "
+                "failure(s). See details.",
+                error=True,
+            )
+            message = "Some items failed:\n\n" + "\n".join(job.failure_messages)
+            if job.interrupted:
+                message += (
+                    "\n\nA disk went away during the transfer. Partly copied "
+                    "files were kept; the drop can be resumed on the next start."
+                )
+            QMessageBox.warning(self, f"{op_label} - Errors", message)
+
+    # ---------- Import / Export ----------
+
+    def export_config(self) -> None:
+        """Export configuration to a JSON file."""
+        filename, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export Configuration",
+            "tabs_config.json",
+            "JSON Files (*.json);;All Files (*)",
+        )
+        if not filename:
+            return
+
+        try:
+            with open(filename, "w", encoding="utf-8") as f:
+                json.dump(self.config, f, indent=2)
+            self.show_status(f"✔ Exported configuration to '{filename}'")
+        except Exception as e:
+            QMessageBox.critical(
+                self, "Export Error", f"Failed to export configuration:\n{e}"
+            )
+
+    def import_config(self) -> None:
+        """Import configuration from a JSON file."""
+        filename, _ = QFileDialog.getOpenFileName(
+            self,
+            "Import Configuration",
+            "",
+            "JSON Files (*.json);;All Files (*)",
+        )
+        if not filename:
+            return
+
+        try:
+            with open(filename, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            QMessageBox.critical(
+                self, "Import Error", f"Failed to read configuration file:\n{e}"
+            )
+            return
+
+        if "tabs" not in data or not isinstance(data["tabs"], list):
+            QMessageBox.critical(
+                self,
+                "Import Error",
+                "Invalid configuration format (no 'tabs' array).",
+            )
+            return
+
+        for t in data["tabs"]:
+            t.setdefault("id", str(uuid.uuid4()))
+            t.setdefault("name", "Unnamed")
+            t.setdefault("path", "")
+            # Normalize operations
+            op = t.get("operation", OP_COPY_REPLACE)
+            if op == "copy":
+                op = OP_COPY_REPLACE
+            elif op == "move":
+                op = OP_MOVE_REPLACE
+            elif op not in {
+                OP_COPY_REPLACE,
+                OP_COPY_NEW,
+                OP_MOVE_REPLACE,
+                OP_MOVE_NEW,
+            }:
+                op = OP_COPY_REPLACE
+            t["operation"] = op
+            normalize_transfer_settings(t)
+
+        msg_box = QMessageBox(self)
+        msg_box.setWindowTitle("Import Configuration")
+        msg_box.setText(
+            "How would you like to apply the imported configuration?\n\n"
+            "Yes: Replace existing tabs\n"
+            "No: Merge with existing tabs\n"
+            "Cancel: Abort"
+        )
+        msg_box.setStandardButtons(
+            QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel
+        )
+        choice = msg_box.exec()
+
+        if choice == QMessageBox.Cancel:
+            return
+        elif choice == QMessageBox.Yes:
+            self.config = {
+                "history_backend": self.config.get(
+                    "history_backend", HISTORY_BACKEND_JSONL
+                ),
+                "jobs_per_device": self.config.get(
+                    "jobs_per_device", DEFAULT_JOBS_PER_DEVICE
+                ),
+                "tabs": data["tabs"],
+            }
+        elif choice == QMessageBox.No:
+            self.config["tabs"].extend(data["tabs"])
+
+        # Older exports carry history inside the tabs; if it cannot be
+        # written it stays there and is migrated on the next start
+        try:
+            self.history_store.migrate(self.config)
+        except Exception as e:
+            print(f"Error migrating history: {e}")
+
+        self.config_manager.save(self.config)
+        self._rebuild_tabs()
+        self.show_status("✔ Imported configuration successfully")
+
+    # ---------- Misc ----------
+
+    def closeEvent(self, event) -> None:
+        """Confirm quitting while drops are still being teleported."""
+        pending = self.transfer_engine.pending_count()
+        if pending:
+            reply = QMessageBox.question(
+                self,
+                "Transfers in Progress",
+                f"{pending} drop(s) are still queued or running.\n\n"
+                "Quit anyway? The transfer stops after the current chunk and "
+                "can be resumed the next time you start the app.",
+                QMessageBox.Yes | QMessageBox.No,
+            )
+            if reply != QMessageBox.Yes:
+                event.ignore()
+                return
+
+        for worker in self._plan_workers:
+            # No preview dialogs or new drops while shutting down
+            worker.planned.disconnect(self._on_drop_planned)
+            worker.job.cancel()
+            worker.wait()
+        self.transfer_engine.stop()
+        # Deliver results the worker emitted before it stopped
+        QApplication.processEvents()
+        self._flush_pending()
+        self.history_store.close()
+        event.accept()
+
+    def show_status(self, message: str, error: bool = False) -> None:
+        """Show a status message."""
+        self.status_bar.showMessage(message, 8000)
+        if error:
+            print("ERROR:", message)
+
+    def show_about(self) -> None:
+        """Show the About dialog."""
+        QMessageBox.information(
+            self,
+            "About File Router",
+            (
+                "📁 File Router - Professional File Management\n\n"
+                "A utility to route files and folders into\n"
+                "predefined destinations using configurable tabs.\n\n"
+                "Features:\n"
+                "• 4 operation modes per tab:\n"
+                "  - Copy & Replace\n"
+                "  - Copy New Only\n"
+                "  - Move & Replace\n"
+                "  - Move New Only\n"
+                "• Per-tab history with date & time\n"
+                "• Persistent configuration\n"
+                "• Import/Export settings\n"
+                "• Drag & drop support\n"
+                "• Platform-specific styling (Windows, macOS, Linux)\n\n"
+                f"Running on: {platform.system()}\n"
+                f"Config location: {CONFIG_FILENAME}"
+            ),
+        )
+
+
+def main():
+    """Main entry point for the application."""
+    app = QApplication(sys.argv)
+    window = MainWindow()
+    window.show()
+    sys.exit(app.exec())
+
+
+if __name__ == "__main__":
+    main()
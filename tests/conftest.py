@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+# The module creates its config folder under HOME at import time; keep the
+# test run away from the real one and from any display.
+os.environ["HOME"] = tempfile.mkdtemp(prefix="teleporter-home-")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
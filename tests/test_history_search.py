@@ -0,0 +1,56 @@
+from file_teleporter_improved import HistorySearchIndex
+
+
+class FakeStore:
+    ROWS = [
+        ("/home/a", "/dest", "success"),
+        ("/home/b", "/dest", "failed"),
+        ("/tmp/c", "/dest", "success"),
+    ]
+
+    def search_rows(self, tab_id):
+        for row, fields in enumerate(self.ROWS):
+            yield row, "\t".join(fields)
+
+
+def test_substring_search():
+    index = HistorySearchIndex(FakeStore(), "tab")
+    assert index.search("HOME") == [0, 1]
+    assert index.search("home/b") == [1]
+
+
+def test_regex_anchors_apply_per_row():
+    index = HistorySearchIndex(FakeStore(), "tab")
+    assert index.search("^/home", regex=True) == [0, 1]
+    assert index.search("success$", regex=True) == [0, 2]
+
+
+def test_regex_matches_do_not_span_rows():
+    index = HistorySearchIndex(FakeStore(), "tab")
+    assert index.search(r"failed\s+/tmp", regex=True) == []
+    assert index.search("[^x]*/tmp", regex=True) == [2]
+
+
+class ManyRowsStore:
+    def search_rows(self, tab_id):
+        for row in range(300):
+            result = "failed: disk full" if row % 97 == 0 else "success"
+            yield row, f"/home/user/p{row % 7}/file_{row}.txt\t/backup\t{result}"
+
+
+def naive(store, query):
+    return [
+        row
+        for row, text in store.search_rows("tab")
+        if query.lower() in text.lower()
+    ]
+
+
+def test_word_index_finds_the_same_rows_as_a_scan(monkeypatch):
+    monkeypatch.setattr(HistorySearchIndex, "BLOCK_ROWS", 16)
+    store = ManyRowsStore()
+    index = HistorySearchIndex(store, "tab")
+    index.build_word_index()
+
+    for query in ("file_123.", "ILE_12", "disk full", "p3/file_1", "zzz", "/", "e_2"):
+        assert index.search(query) == naive(store, query), query
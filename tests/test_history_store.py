@@ -0,0 +1,39 @@
+import pytest
+
+from file_teleporter_improved import HistoryJournal
+
+
+def legacy_config():
+    entry = {"timestamp": "2026-01-01 00:00:00", "source": "/a", "result": "success"}
+    return {
+        "tabs": [
+            {"id": "one", "history": [entry, entry]},
+            {"id": "two", "history": [entry]},
+            {"id": "three"},
+        ]
+    }
+
+
+def test_migrate_moves_legacy_history_into_the_store(tmp_path):
+    store = HistoryJournal(str(tmp_path / "history"))
+    config = legacy_config()
+
+    assert store.migrate(config)
+
+    assert all("history" not in tab for tab in config["tabs"])
+    assert len(store.entries("one")) == 2
+    assert len(store.entries("two")) == 1
+    assert not store.migrate(config)
+
+
+def test_migrate_keeps_legacy_history_when_the_write_fails(tmp_path):
+    blocker = tmp_path / "history"
+    blocker.write_text("not a folder")
+    store = HistoryJournal(str(blocker))
+    config = legacy_config()
+
+    with pytest.raises(OSError):
+        store.migrate(config)
+
+    assert len(config["tabs"][0]["history"]) == 2
+    assert len(config["tabs"][1]["history"]) == 1
@@ -0,0 +1,105 @@
+import os
+
+from file_teleporter_improved import (
+    REPLACED_SUFFIX,
+    paths_overlap,
+    remove_stale_staging,
+    staged_target_name,
+    staging_path,
+    swap_into_place,
+)
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+
+def test_staged_target_name():
+    assert staged_target_name(os.path.basename(staging_path("/d/photos"))) == "photos"
+    parked = os.path.basename(staging_path("/d/a.b.txt", REPLACED_SUFFIX))
+    assert staged_target_name(parked) == "a.b.txt"
+    assert staged_target_name("photos") is None
+    assert staged_target_name(".photos.teleporting") is None
+    assert staged_target_name(".photos.xyz12345.teleporting") is None
+
+
+def test_swap_into_place_replaces_target(tmp_path):
+    target = str(tmp_path / "report.txt")
+    staged = staging_path(target)
+    write(target, "old")
+    write(staged, "new")
+
+    swap_into_place(staged, target)
+
+    assert read(target) == "new"
+    assert os.listdir(tmp_path) == ["report.txt"]
+
+
+def test_crash_between_renames_restores_parked_target(tmp_path):
+    # swap_into_place parked the target, then died before renaming in the copy
+    target = str(tmp_path / "photos")
+    staged = staging_path(target)
+    parked = staging_path(target, REPLACED_SUFFIX)
+    write(os.path.join(staged, "a.jpg"), "new")
+    write(os.path.join(parked, "a.jpg"), "old")
+
+    remove_stale_staging(str(tmp_path))
+
+    assert os.listdir(tmp_path) == ["photos"]
+    assert read(os.path.join(target, "a.jpg")) == "old"
+
+
+def test_parked_copy_dropped_once_swap_finished(tmp_path):
+    target = str(tmp_path / "report.txt")
+    write(target, "new")
+    write(staging_path(target, REPLACED_SUFFIX), "old")
+
+    remove_stale_staging(str(tmp_path))
+
+    assert os.listdir(tmp_path) == ["report.txt"]
+    assert read(target) == "new"
+
+
+def test_kept_staging_copies_survive(tmp_path):
+    kept = staging_path(str(tmp_path / "big.iso"))
+    stale = staging_path(str(tmp_path / "other.iso"))
+    write(kept, "partial")
+    write(stale, "partial")
+
+    remove_stale_staging(str(tmp_path), keep={kept})
+
+    assert sorted(os.listdir(tmp_path)) == [os.path.basename(kept)]
+
+
+def test_missing_directory_is_ignored(tmp_path):
+    remove_stale_staging(str(tmp_path / "gone"))
+
+
+def test_paths_overlap(tmp_path):
+    root = str(tmp_path / "dest")
+    assert paths_overlap(root, root)
+    assert paths_overlap(root, os.path.join(root, "sub"))
+    assert paths_overlap(os.path.join(root, "sub"), root)
+    assert not paths_overlap(root, str(tmp_path / "dest2"))
+
+
+def test_staging_copies_of_kept_targets_survive(tmp_path):
+    # A move whose rename into place was lost: the journal still needs them
+    target = str(tmp_path / "photos")
+    staged = staging_path(target)
+    parked = staging_path(target, REPLACED_SUFFIX)
+    write(os.path.join(staged, "a.jpg"), "new")
+    write(os.path.join(parked, "a.jpg"), "old")
+
+    remove_stale_staging(str(tmp_path), keep={target})
+
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        [os.path.basename(staged), os.path.basename(parked)]
+    )
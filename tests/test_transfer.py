@@ -0,0 +1,231 @@
+import os
+from collections import namedtuple
+
+import file_teleporter_improved
+from file_teleporter_improved import (
+    COMPARE_HASH,
+    COMPARE_SIZE_MTIME,
+    DURABILITY_FSYNC,
+    OP_COPY_NEW,
+    OP_COPY_REPLACE,
+    OP_MOVE_NEW,
+    OP_MOVE_REPLACE,
+    REPLACE_MERGE,
+    TransferCancelled,
+    TransferEngine,
+    TransferJob,
+)
+
+DiskUsage = namedtuple("DiskUsage", "total used free")
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+
+def run(mode, src_paths, dest_root, engine=None, **settings):
+    """Run a drop on the calling thread and return its item results."""
+    engine = engine or TransferEngine()
+    job = TransferJob("tab", "Tab", mode, src_paths, dest_root, settings=settings)
+    job.journal.open(job.header())
+    results = []
+    engine.item_finished.connect(lambda _job, _src, _dst, res: results.append(res))
+    engine._run_job(job)
+    job.journal.close(remove=True)
+    return results
+
+
+def test_new_only_keeps_file_in_the_way_of_a_folder(tmp_path):
+    write(str(tmp_path / "src/proj/sub/x.txt"), "x")
+    write(str(tmp_path / "src/proj/new.txt"), "n")
+    write(str(tmp_path / "dst/proj/sub"), "existing file")
+
+    results = run(OP_COPY_NEW, [str(tmp_path / "src/proj")], str(tmp_path / "dst"))
+
+    assert results == ["success (1 new, 1 already present)"]
+    assert read(str(tmp_path / "dst/proj/sub")) == "existing file"
+    assert read(str(tmp_path / "dst/proj/new.txt")) == "n"
+
+
+def test_new_only_keeps_folder_in_the_way_of_a_file(tmp_path):
+    write(str(tmp_path / "src/proj/a.txt"), "a")
+    write(str(tmp_path / "dst/proj/a.txt/keep.txt"), "keep")
+
+    results = run(
+        OP_COPY_NEW,
+        [str(tmp_path / "src/proj")],
+        str(tmp_path / "dst"),
+        compare=COMPARE_SIZE_MTIME,
+    )
+
+    assert results[0].startswith("skipped")
+    assert read(str(tmp_path / "dst/proj/a.txt/keep.txt")) == "keep"
+
+
+def test_new_only_dropped_file_never_replaces_a_folder(tmp_path):
+    write(str(tmp_path / "src/a.txt"), "a")
+    write(str(tmp_path / "dst/a.txt/keep.txt"), "keep")
+
+    results = run(
+        OP_COPY_NEW,
+        [str(tmp_path / "src/a.txt")],
+        str(tmp_path / "dst"),
+        compare=COMPARE_SIZE_MTIME,
+    )
+
+    assert results == ["skipped (target exists, NEW only)"]
+    assert read(str(tmp_path / "dst/a.txt/keep.txt")) == "keep"
+
+
+def test_move_new_only_moves_just_the_new_files(tmp_path):
+    write(str(tmp_path / "src/proj/old.txt"), "source")
+    write(str(tmp_path / "src/proj/new.txt"), "n")
+    write(str(tmp_path / "dst/proj/old.txt"), "existing")
+
+    results = run(OP_MOVE_NEW, [str(tmp_path / "src/proj")], str(tmp_path / "dst"))
+
+    assert results == ["success (1 new, 1 already present)"]
+    assert read(str(tmp_path / "dst/proj/old.txt")) == "existing"
+    assert read(str(tmp_path / "dst/proj/new.txt")) == "n"
+    assert os.listdir(str(tmp_path / "src/proj")) == ["old.txt"]
+
+
+def test_merge_replace_updates_changed_files(tmp_path):
+    write(str(tmp_path / "src/proj/a.txt"), "new a")
+    write(str(tmp_path / "src/proj/sub/b.txt"), "b")
+    write(str(tmp_path / "dst/proj/a.txt"), "old")
+    write(str(tmp_path / "dst/proj/extra.txt"), "extra")
+
+    results = run(
+        OP_COPY_REPLACE,
+        [str(tmp_path / "src/proj")],
+        str(tmp_path / "dst"),
+        replace_strategy=REPLACE_MERGE,
+    )
+
+    assert results == ["success (merged: 2 updated, 0 unchanged, 0 pruned)"]
+    assert read(str(tmp_path / "dst/proj/a.txt")) == "new a"
+    assert read(str(tmp_path / "dst/proj/sub/b.txt")) == "b"
+    assert read(str(tmp_path / "dst/proj/extra.txt")) == "extra"
+
+
+def test_cancelled_merge_reports_files_already_written(tmp_path):
+    for i in range(5):
+        write(str(tmp_path / f"src/proj/f{i}.txt"), "new")
+        write(str(tmp_path / f"dst/proj/f{i}.txt"), "old!")
+    engine = TransferEngine()
+    copy_file = engine._copy_file
+    calls = []
+
+    def copy_then_cancel(job, *args, **kwargs):
+        calls.append(args[0])
+        if len(calls) > 2:
+            job.cancel()
+            raise TransferCancelled()
+        return copy_file(job, *args, **kwargs)
+
+    engine._copy_file = copy_then_cancel
+    results = run(
+        OP_COPY_REPLACE,
+        [str(tmp_path / "src/proj")],
+        str(tmp_path / "dst"),
+        engine=engine,
+        replace_strategy=REPLACE_MERGE,
+    )
+
+    assert results == ["cancelled (2 file(s) already merged)"]
+    contents = [read(str(tmp_path / f"dst/proj/f{i}.txt")) for i in range(5)]
+    assert sorted(contents) == ["new", "new", "old!", "old!", "old!"]
+
+
+def test_fsync_durability_syncs_renames_before_deleting_sources(
+    tmp_path, monkeypatch
+):
+    write(str(tmp_path / "src/proj/a.txt"), "a")
+    write(str(tmp_path / "src/b.txt"), "b")
+    write(str(tmp_path / "dst/proj/old.txt"), "old")
+    events = []
+    remove_path = file_teleporter_improved.remove_path
+    monkeypatch.setattr(
+        file_teleporter_improved,
+        "fsync_directory",
+        lambda path: events.append(("fsync", os.path.basename(path))),
+    )
+    monkeypatch.setattr(
+        file_teleporter_improved,
+        "remove_path",
+        lambda path: events.append(("remove", os.path.basename(path)))
+        or remove_path(path),
+    )
+    monkeypatch.setattr(file_teleporter_improved, "same_device", lambda a, b: False)
+
+    results = run(
+        OP_MOVE_REPLACE,
+        [str(tmp_path / "src/proj"), str(tmp_path / "src/b.txt")],
+        str(tmp_path / "dst"),
+        durability=DURABILITY_FSYNC,
+    )
+
+    assert results == ["success", "success"]
+    assert read(str(tmp_path / "dst/proj/a.txt")) == "a"
+    assert os.listdir(str(tmp_path / "src")) == []
+    for name in ("proj", "b.txt"):
+        removed = events.index(("remove", name))
+        assert ("fsync", "dst") in events[:removed]
+
+
+def test_free_space_check_leaves_out_reflink_clones(tmp_path, monkeypatch):
+    write(str(tmp_path / "src/proj/a.txt"), "a" * 4096)
+    write(str(tmp_path / "src/b.txt"), "b" * 4096)
+    monkeypatch.setattr(
+        file_teleporter_improved.shutil,
+        "disk_usage",
+        lambda path: DiskUsage(total=1 << 30, used=1 << 30, free=1024),
+    )
+    src_paths = [str(tmp_path / "src/proj"), str(tmp_path / "src/b.txt")]
+    os.makedirs(str(tmp_path / "dst"))
+
+    monkeypatch.setattr(file_teleporter_improved, "supports_reflink", lambda p: False)
+    results = run(OP_COPY_REPLACE, src_paths, str(tmp_path / "dst"))
+    assert [res.split(":")[0] for res in results] == ["failed", "failed"]
+
+    monkeypatch.setattr(file_teleporter_improved, "supports_reflink", lambda p: True)
+    results = run(OP_COPY_REPLACE, src_paths, str(tmp_path / "dst"))
+    assert results == ["success", "success"]
+    assert read(str(tmp_path / "dst/proj/a.txt")) == "a" * 4096
+
+
+def test_hash_merge_hashes_each_source_file_once(tmp_path, monkeypatch):
+    write(str(tmp_path / "src/proj/a.txt"), "same")
+    write(str(tmp_path / "src/proj/sub/b.txt"), "new!")
+    write(str(tmp_path / "dst/proj/a.txt"), "same")
+    write(str(tmp_path / "dst/proj/sub/b.txt"), "old!")
+    hashed = []
+    fast_file_hash = file_teleporter_improved.fast_file_hash
+    monkeypatch.setattr(
+        file_teleporter_improved,
+        "fast_file_hash",
+        lambda path: hashed.append(path) or fast_file_hash(path),
+    )
+
+    results = run(
+        OP_COPY_REPLACE,
+        [str(tmp_path / "src/proj")],
+        str(tmp_path / "dst"),
+        replace_strategy=REPLACE_MERGE,
+        compare=COMPARE_HASH,
+    )
+
+    assert results == ["success (merged: 1 updated, 1 unchanged, 0 pruned)"]
+    assert read(str(tmp_path / "dst/proj/sub/b.txt")) == "new!"
+    sources = [path for path in hashed if os.sep + "src" + os.sep in path]
+    assert sorted(sources) == sorted(
+        [str(tmp_path / "src/proj/a.txt"), str(tmp_path / "src/proj/sub/b.txt")]
+    )